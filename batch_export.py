@@ -0,0 +1,136 @@
+"""
+Export hàng loạt bảng xếp hạng ScoShow ra ảnh (cho mạng xã hội)
+Render song song bằng ProcessPoolExecutor, mỗi worker load ảnh nền / font một lần, ghi file theo đúng thứ tự
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# Kích thước output có sẵn (None = giữ nguyên kích thước ảnh nền)
+OUTPUT_SIZES = {
+    'source': None,
+    '1080p': (1920, 1080),
+    'square': (1080, 1080),
+    'story': (1080, 1920),
+}
+
+# Renderer riêng của từng process worker
+_renderer = None
+
+def _init_worker(folder):
+    """Khởi tạo worker: load thư mục ảnh nền và giải mã trước tất cả ảnh nền"""
+    global _renderer
+    from scoshow import SceneRenderer, load_background
+    _renderer = SceneRenderer()
+    if not _renderer.load_background_folder(folder):
+        raise RuntimeError(f"Không tìm thấy đủ ảnh nền trong {folder}")
+    for path in _renderer.background_paths.values():
+        load_background(path)
+
+def fit_geometry(source_size, size, fit='contain'):
+    """Tỷ lệ, kích thước sau scale và vị trí (scale, (w, h), (x, y)) để đặt ảnh source_size vào khung size"""
+    width, height = size
+    if fit == 'cover':
+        scale = max(width / source_size[0], height / source_size[1])
+    else:
+        scale = min(width / source_size[0], height / source_size[1])
+    scaled = (max(1, round(source_size[0] * scale)), max(1, round(source_size[1] * scale)))
+    return scale, scaled, ((width - scaled[0]) // 2, (height - scaled[1]) // 2)
+
+def fit_to_size(image, size, fit='contain', resample=None):
+    """Đưa ảnh về kích thước output: contain = giữ toàn bộ ảnh + viền đen, cover = cắt giữa"""
+    from PIL import Image
+    if size is None or image.size == size:
+        return image
+    scale, scaled_size, offset = fit_geometry(image.size, size, fit)
+    canvas = Image.new('RGB', size, 'black')
+    canvas.paste(image.resize(scaled_size, resample or Image.Resampling.LANCZOS), offset)
+    return canvas
+
+def _render_job(job):
+    """(Worker) render một payload và trả về ảnh đã encode"""
+    bg_id, overlay_data, size, fit, image_format = job
+    image = _renderer.render(bg_id, overlay_data)
+    image = fit_to_size(image.convert('RGB'), size, fit)
+    output = io.BytesIO()
+    image.save(output, format=image_format.upper())
+    return output.getvalue()
+
+def export_filename(index, bg_id, overlay_data, image_format):
+    """Tên file output, đánh số theo thứ tự payload"""
+    if bg_id == "01" and overlay_data.get('round'):
+        label = f"round_{overlay_data['round']}"
+    elif bg_id == "02":
+        label = "final"
+    else:
+        label = f"scene_{bg_id}"
+    safe_label = "".join(c if c.isalnum() or c in "-_" else "_" for c in label)
+    return f"{index:03d}_{safe_label}.{image_format.lower()}"
+
+def export_batch(payloads, folder, out_dir, size=None, fit='contain', image_format='png', workers=None):
+    """Render danh sách (bg_id, overlay_data) song song và ghi ra out_dir theo thứ tự. Trả về list path"""
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(bg_id, overlay_data, size, fit, image_format) for bg_id, overlay_data in payloads]
+    written = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(folder,)) as executor:
+        # map trả kết quả đúng thứ tự payload ngay khi từng ảnh xong
+        for index, (job, data) in enumerate(zip(jobs, executor.map(_render_job, jobs)), 1):
+            path = os.path.join(out_dir, export_filename(index, job[0], job[1], image_format))
+            with open(path, 'wb') as f:
+                f.write(data)
+            written.append(path)
+    return written
+
+def load_payloads(history_path=None, payloads_path=None):
+    """Đọc payload từ lịch sử round (SQLite) và/hoặc file JSON lines {"scene": ..., "overlay_data": ...}"""
+    payloads = []
+    if history_path:
+        from round_history import RoundHistory
+        history = RoundHistory(history_path)
+        try:
+            payloads += [("01", data) for round_value, applied_at, data in history.all_snapshots()]
+        finally:
+            history.close()
+    if payloads_path:
+        with open(payloads_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    payloads.append((record['scene'], record['overlay_data']))
+    return payloads
+
+def main():
+    parser = argparse.ArgumentParser(description="Export hàng loạt bảng xếp hạng ScoShow ra ảnh")
+    parser.add_argument("--folder", default="background", help="thư mục ảnh nền (00.jpg, 01.png, 02.png)")
+    parser.add_argument("--history", help="file lịch sử round (scoshow_history.db)")
+    parser.add_argument("--payloads", help="file JSON lines: {\"scene\": \"01\", \"overlay_data\": {...}}")
+    parser.add_argument("--out", default="exports", help="thư mục output")
+    parser.add_argument("--size", choices=sorted(OUTPUT_SIZES), default='source')
+    parser.add_argument("--fit", choices=['contain', 'cover'], default='contain')
+    parser.add_argument("--format", choices=['png', 'jpeg'], default='png')
+    parser.add_argument("--workers", type=int, default=None, help="số process (mặc định = số core)")
+    args = parser.parse_args()
+
+    if not args.history and not args.payloads:
+        parser.error("cần --history hoặc --payloads")
+
+    payloads = load_payloads(args.history, args.payloads)
+    if not payloads:
+        print("Không có payload nào để export")
+        return 0
+
+    t0 = time.perf_counter()
+    written = export_batch(payloads, args.folder, args.out, OUTPUT_SIZES[args.size],
+                           args.fit, args.format, args.workers)
+    elapsed = time.perf_counter() - t0
+    print(f"Đã export {len(written)} ảnh vào '{args.out}' trong {elapsed:.1f}s "
+          f"({len(written) / elapsed:.1f} ảnh/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Benchmark compositing: đường PIL (render 4K rồi thu nhỏ) so với đường NumPy (ghép ở độ phân giải màn hình)
+"""
+
+import sys
+import time
+import argparse
+import statistics
+
+import scoshow
+
+def sample_payload(font_name):
+    """overlay_data cố định cho background 01"""
+    data = {'round': '7'}
+    positions = {'round': (1286, 917)}
+    for index, rank in enumerate(['1st', '2nd', '3rd', '4th', '5th', '6th', '7th', '8th', '9th', '10th']):
+        data[rank] = f"Player {index + 1} Nguyễn Văn"
+        positions[rank] = (2930, 140 + index * 90)
+    data['positions'] = positions
+    data['boxes'] = {}
+    data['font_settings'] = {'font_name': font_name, 'rank_font_size': 60,
+                             'round_font_size': 100, 'color': 'orange'}
+    return data
+
+def bench(label, func, runs):
+    """Chạy func nhiều lần (sau 1 lần warm-up) và in median (ms)"""
+    func()
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - t0) * 1000)
+    median = statistics.median(times)
+    print(f"{label:8s} median {median:7.2f} ms  (min {min(times):.2f} ms)")
+    return median
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compositing PIL vs NumPy")
+    parser.add_argument("--folder", default="background", help="thư mục ảnh nền")
+    parser.add_argument("--font", default="arial.ttf", help="font dùng để vẽ")
+    parser.add_argument("--size", default="1920x1080", help="kích thước cửa sổ hiển thị")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    window_size = tuple(int(v) for v in args.size.split('x'))
+    renderer = scoshow.SceneRenderer()
+    if not renderer.load_background_folder(args.folder):
+        print(f"Không tìm thấy ảnh nền trong {args.folder}")
+        return 1
+    data = sample_payload(args.font)
+
+    pil_ms = bench("PIL", lambda: scoshow.render_window_frame(renderer, "01", data, window_size), args.runs)
+    if not scoshow.HAS_NUMPY:
+        print("NumPy chưa được cài - bỏ qua đường NumPy")
+        return 0
+
+    compositor = scoshow.NumpyCompositor(renderer)
+    numpy_ms = bench("NumPy", lambda: scoshow.render_window_frame(renderer, "01", data, window_size, compositor),
+                     args.runs)
+    print(f"NumPy nhanh hơn {pil_ms / numpy_ms:.1f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
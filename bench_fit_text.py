@@ -0,0 +1,60 @@
+"""
+Benchmark tự co tên cho vừa ô (scoshow.fit_text): lần đầu (chưa cache font / phép đo) và lần gọi lại
+Lần đầu là chi phí thật khi nhập một danh sách tên mới - mỗi cỡ chữ thử là một lần load font + đo
+"""
+
+import sys
+import time
+import argparse
+
+import scoshow
+
+# Họ / tên đệm / tên để sinh danh sách tên dài ngắn khác nhau
+FAMILY = ["Nguyễn", "Trần", "Lê", "Phạm", "Hoàng", "Võ", "Đặng", "Bùi", "Đỗ", "Huỳnh"]
+MIDDLE = ["Văn", "Thị", "Quốc", "Ngọc", "Minh", "Thành", "Phương", "Quang", "Thu", "Đức"]
+GIVEN = ["An", "Thảo", "Việt", "Ánh", "Khải", "Hiếu", "Hằng", "Ý", "Long", "Trung"]
+TEAMS = ["", " (Saigon Phantom)", " - Đội Tuyển Quốc Gia Việt Nam", " [HN]", " | Team Flash Esports Academy"]
+
+def sample_names(count):
+    """count tên khác nhau, dài ngắn xen kẽ (có tên phải cắt bớt bằng "…")"""
+    return [f"{FAMILY[i % 10]} {MIDDLE[i // 10 % 10]} {GIVEN[i * 7 % 10]}{TEAMS[i % len(TEAMS)]}"
+            for i in range(count)]
+
+def clear_caches():
+    """Về trạng thái chưa đo gì: font, phép đo và kết quả fit"""
+    for cache in (scoshow.load_font, scoshow.measure_text, scoshow.fit_text):
+        cache.cache_clear()
+
+def fit_all(names, font, size, box):
+    t0 = time.perf_counter()
+    for name in names:
+        scoshow.fit_text(name, font, size, box)
+    return (time.perf_counter() - t0) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fit_text lần đầu / có cache")
+    parser.add_argument("--font", default="DejaVuSans.ttf")
+    parser.add_argument("--size", type=int, default=60)
+    parser.add_argument("--box", default="640,80", help="ô giới hạn w,h")
+    parser.add_argument("--names", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    box = tuple(int(v) for v in args.box.split(','))
+    names = sample_names(args.names)
+    scoshow.load_font(args.font, args.size)  # import PIL / font index ngoài phần đo
+
+    cold = []
+    for _ in range(args.runs):
+        clear_caches()
+        cold.append(fit_all(names, args.font, args.size, box))
+    info = scoshow.load_font.cache_info(), scoshow.measure_text.cache_info()
+    warm = fit_all(names, args.font, args.size, box)
+    print(f"{args.names} tên, cỡ {args.size}, ô {box[0]}x{box[1]}")
+    print(f"lần đầu   {min(cold):8.1f} ms  ({min(cold) / args.names:.2f} ms / tên; "
+          f"{info[0].misses} lần load font, {info[1].misses} lần đo)")
+    print(f"có cache  {warm:8.2f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Benchmark thời gian khởi động ScoShow
+Đo thời gian import scoshow và time-to-first-frame của cửa sổ điều khiển
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+IMPORT_SNIPPET = (
+    "import time; t0 = time.perf_counter(); import scoshow; "
+    "print('IMPORT', (time.perf_counter() - t0) * 1000)"
+)
+
+def measure_import():
+    """Đo thời gian import scoshow trong một process mới (ms)"""
+    output = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], cwd=HERE,
+                            capture_output=True, text=True, check=True).stdout
+    for line in output.splitlines():
+        if line.startswith("IMPORT "):
+            return float(line.split()[1])
+    raise RuntimeError(f"Không đọc được thời gian import: {output!r}")
+
+def measure_first_frame():
+    """Chạy launcher ở chế độ --startup-benchmark và trả về timings (dict)"""
+    result = subprocess.run([sys.executable, "launcher.py", "--startup-benchmark"], cwd=HERE,
+                            capture_output=True, text=True, timeout=60)
+    for line in result.stdout.splitlines():
+        if line.startswith("STARTUP "):
+            return json.loads(line[len("STARTUP "):])
+    raise RuntimeError(f"Launcher không in timings: {result.stdout}{result.stderr}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark thời gian khởi động ScoShow")
+    parser.add_argument("--runs", type=int, default=5, help="số lần đo (lấy median)")
+    args = parser.parse_args()
+
+    from scoshow import IMPORT_TIME_BUDGET_MS
+
+    import_times = [measure_import() for _ in range(args.runs)]
+    import_ms = statistics.median(import_times)
+    print(f"Import scoshow: {import_ms:.1f} ms (budget {IMPORT_TIME_BUDGET_MS} ms)")
+
+    # Time-to-first-frame cần màn hình (DISPLAY trên Linux)
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        print("Bỏ qua time-to-first-frame: không có DISPLAY")
+    else:
+        frames = [measure_first_frame() for _ in range(args.runs)]
+        first_frame_ms = statistics.median(t['first_frame_ms'] for t in frames)
+        print(f"Time-to-first-frame: {first_frame_ms:.1f} ms")
+
+    if import_ms > IMPORT_TIME_BUDGET_MS:
+        print("❌ Vượt ngân sách thời gian import")
+        return 1
+    print("✓ Trong ngân sách thời gian import")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
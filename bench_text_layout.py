@@ -0,0 +1,77 @@
+"""
+Benchmark layout text của ScoShow: BASIC vs RAQM (shaping) và đoạn text đã shape có cache
+Đo chi phí shape + rasterize một tên mới so với lần gọi lại (trúng cache shaped_run)
+"""
+
+import sys
+import time
+import argparse
+import statistics
+import unicodedata
+
+import scoshow
+from font_index import resolve_font
+
+# Tên mẫu theo nhóm chữ viết
+SAMPLES = {
+    'vietnamese': ["Nguyễn Thị Phương Thảo", "Trần Quốc Việt", "Đặng Ngọc Ánh", "Bùi Quang Khải"],
+    'vietnamese_nfd': [unicodedata.normalize('NFD', name) for name in
+                       ["Nguyễn Thị Phương Thảo", "Trần Quốc Việt", "Đặng Ngọc Ánh", "Bùi Quang Khải"]],
+    'cjk': ["山田太郎", "李小龍", "김민준", "王芳"],
+    'thai': ["สมชาย ใจดี", "ณัฐวุฒิ ศรีสุข", "พิมพ์ชนก", "กิตติศักดิ์"],
+}
+
+def rasterize(font, text):
+    """Shape + rasterize một lần (như shaped_run nhưng không cache)"""
+    left, top, right, bottom = font.getbbox(text)
+    mask = scoshow.Image.new('L', (max(1, right - left), max(1, bottom - top)), 0)
+    scoshow.ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font)
+    return mask
+
+def median_us(func, names, runs):
+    """Median thời gian (µs) cho mỗi tên"""
+    times = []
+    for _ in range(runs):
+        for name in names:
+            t0 = time.perf_counter()
+            func(name)
+            times.append((time.perf_counter() - t0) * 1e6)
+    return statistics.median(times)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark layout text BASIC / RAQM / cache")
+    parser.add_argument("--font", default="arial.ttf", help="font (tên file / family, tra qua font index)")
+    parser.add_argument("--size", type=int, default=60)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    from PIL import ImageFont, features
+    path = resolve_font(args.font)
+    engines = {'basic': ImageFont.Layout.BASIC}
+    if features.check('raqm'):
+        engines['raqm'] = ImageFont.Layout.RAQM
+    fonts = {name: ImageFont.truetype(path, args.size, layout_engine=engine) for name, engine in engines.items()}
+    print(f"Font {path}, cỡ {args.size}, layout mặc định: "
+          f"{'RAQM' if scoshow.text_layout() == ImageFont.Layout.RAQM else 'BASIC (không có raqm)'}")
+
+    header = f"{'nhóm':16s}" + "".join(f"{name:>12s}" for name in engines) + f"{'cache hit':>12s}"
+    print(header + "   (µs / tên)")
+    for group, names in SAMPLES.items():
+        line = f"{group:16s}"
+        for name, font in fonts.items():
+            line += f"{median_us(lambda text: rasterize(font, text), names, args.runs):12.1f}"
+        # Lần đầu shape vào cache, các lần sau chỉ là tra cache
+        for text in names:
+            scoshow.shaped_run(text, args.font, args.size)
+        hit = median_us(lambda text: scoshow.shaped_run(text, args.font, args.size), names, args.runs)
+        print(line + f"{hit:12.2f}")
+
+    # Dấu rời (NFD) dưới layout BASIC: khác dạng dựng sẵn nếu không chuẩn hóa NFC trước
+    basic = fonts['basic']
+    nfc, nfd = SAMPLES['vietnamese'][0], SAMPLES['vietnamese_nfd'][0]
+    same = rasterize(basic, nfc).tobytes() == rasterize(basic, nfd).tobytes()
+    print(f"BASIC vẽ NFD {'giống' if same else 'khác'} NFC - overlay chuẩn hóa NFC trước khi shape")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
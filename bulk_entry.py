@@ -0,0 +1,117 @@
+"""
+Nhập hàng loạt cho ScoShow: đọc một khối text dán vào (từng dòng / tab / copy từ bảng tính)
+thành round, 10 rank và 5 kết quả cuối - không đụng Tk
+"""
+
+import re
+
+RANKS = ['1st', '2nd', '3rd', '4th', '5th', '6th', '7th', '8th', '9th', '10th']
+FINALS = ['winner', 'second', 'third', 'fourth', 'fifth']
+
+# Tên gọi khác của các ô kết quả cuối
+FINAL_ALIASES = {'1st': 'winner', 'champion': 'winner', '2nd': 'second', '3rd': 'third',
+                 '4th': 'fourth', '5th': 'fifth'}
+
+# Dòng tiêu đề chuyển sang phần kết quả cuối
+FINAL_HEADERS = ('final', 'finals', 'final results', 'chung kết', 'kết quả')
+
+# Dòng tiêu đề cột khi copy cả bảng (bỏ qua nếu là dòng đầu)
+HEADER_WORDS = ('rank', 'name', 'score', 'scores', 'points', 'player', 'team', 'total', '#',
+                'hạng', 'tên', 'điểm', 'đội', 'tổng')
+
+_RANK_LABEL = re.compile(r'^(?:#|top\s*|hạng\s*)?(\d{1,2})(?:st|nd|rd|th)?\.?$', re.IGNORECASE)
+# "Round: Semi" / "Round<tab>7" / "Round 7" (không có dấu ":" thì giá trị phải là số, tránh nhầm tên "Round Robin")
+_ROUND_LINE = re.compile(r'^(?:round|vòng)\s*(?:[:#\t]\s*(\S.*)|\s(\d\S*))$', re.IGNORECASE)
+
+def _is_label(cell):
+    """Ô là nhãn (số hạng, winner..., round) chứ không phải tên"""
+    cell = cell.strip().lower()
+    return bool(_RANK_LABEL.match(cell)) or cell in FINALS or cell in FINAL_ALIASES or cell in ('round', 'vòng')
+
+def is_header(line):
+    """Dòng tiêu đề cột ("Rank<tab>Name<tab>Score", "Hạng Tên Điểm")"""
+    words = [word for word in re.split(r'[\t;|,\s]+', line.strip().lower()) if word]
+    return bool(words) and all(word in HEADER_WORDS for word in words)
+
+def split_cells(line):
+    """Tách một dòng thành các ô: tab (bảng tính), dấu ";" hoặc "|"; nếu không có thì "1. Tên" / "1) Tên".
+
+    Số đứng đầu cách tên bằng dấu cách chỉ là nhãn khi có dạng hạng rõ ràng ("1st", "#1", "top 1"),
+    để tên như "10 Downing" không bị tách thành hạng 10.
+    """
+    for separator in ('\t', ';', '|'):
+        if separator in line:
+            return [cell.strip() for cell in line.split(separator)]
+    match = (re.match(r'^(\S+?)[.):]\s+(.+)$', line)
+             or re.match(r'^((?:#|top\s*|hạng\s*)\d{1,2}(?:st|nd|rd|th)?|\d{1,2}(?:st|nd|rd|th))\s+(.+)$',
+                         line, re.IGNORECASE))
+    if match and _is_label(match.group(1)):
+        return [match.group(1), match.group(2).strip()]
+    return [line.strip()]
+
+def parse_bulk_entry(text):
+    """Đọc khối text nhập hàng loạt.
+
+    Mỗi dòng là "nhãn<tab>tên[<tab>điểm...]" hoặc chỉ "tên" (điền lần lượt). Nhãn: "Round", số
+    hạng ("1", "1st", "#1"), hoặc winner / second / ... ; dòng "Final" chuyển sang phần kết quả cuối.
+    Một dòng duy nhất nhiều ô (copy ngang từ bảng tính) được coi là danh sách tên; dòng đầu
+    toàn tiêu đề cột (Rank / Name / Score, Hạng / Tên / Điểm) được bỏ qua.
+
+    Trả về {'round': str hoặc None, 'ranking': {rank: tên} hoặc None, 'final': {key: tên} hoặc None}.
+    Phần có mặt thì thay toàn bộ (ô không nhắc tới thành rỗng). Raise ValueError nếu sai.
+    """
+    lines = [line for line in text.replace('\r\n', '\n').replace('\r', '\n').split('\n') if line.strip()]
+    first_line = 1
+    if lines and is_header(lines[0]):
+        lines, first_line = lines[1:], 2
+    if len(lines) == 1 and '\t' in lines[0] and not _is_label(lines[0].split('\t')[0]):
+        lines = [cell for cell in lines[0].split('\t') if cell.strip()]
+
+    round_value = None
+    sections = {'ranking': {}, 'final': {}}
+    section = 'ranking'
+    next_index = {'ranking': 0, 'final': 0}
+
+    for line_no, line in enumerate(lines, first_line):
+        stripped = line.strip()
+        if stripped.lower().rstrip(':') in FINAL_HEADERS:
+            section = 'final'
+            continue
+        match = _ROUND_LINE.match(stripped)
+        if match:
+            round_value = (match.group(1) or match.group(2)).split('\t')[0].strip()
+            continue
+
+        cells = split_cells(stripped)
+        label = cells[0].lower() if len(cells) > 1 else None
+        name = cells[1] if label is not None else cells[0]
+        target = section
+        if label in FINALS or (label in FINAL_ALIASES and section == 'final'):
+            target, key = 'final', FINAL_ALIASES.get(label, label)
+        elif label is not None and _RANK_LABEL.match(label):
+            position = int(_RANK_LABEL.match(label).group(1))
+            keys = RANKS if section == 'ranking' else FINALS
+            if not 1 <= position <= len(keys):
+                raise ValueError(f"Dòng {line_no}: hạng {position} ngoài phạm vi 1-{len(keys)}")
+            key = keys[position - 1]
+        else:
+            # Không có nhãn (hoặc ô đầu là tên, các ô sau là điểm): điền vào ô trống kế tiếp
+            name = cells[0]
+            keys = RANKS if section == 'ranking' else FINALS
+            while next_index[section] < len(keys) and keys[next_index[section]] in sections[section]:
+                next_index[section] += 1
+            if next_index[section] >= len(keys):
+                raise ValueError(f"Dòng {line_no}: quá {len(keys)} tên cho phần {section}")
+            key = keys[next_index[section]]
+
+        if key in sections[target]:
+            raise ValueError(f"Dòng {line_no}: {key} bị nhập hai lần")
+        sections[target][key] = name
+
+    if round_value is None and not sections['ranking'] and not sections['final']:
+        raise ValueError("Không có dữ liệu nào để nhập")
+    return {
+        'round': round_value,
+        'ranking': {rank: sections['ranking'].get(rank, '') for rank in RANKS} if sections['ranking'] else None,
+        'final': {key: sections['final'].get(key, '') for key in FINALS} if sections['final'] else None,
+    }
@@ -0,0 +1,106 @@
+"""
+Lưu / đọc file cấu hình ScoShow
+Ghi atomic (file tạm + rename), schema có version để phát hiện file hỏng
+"""
+
+import os
+import json
+import time
+import tempfile
+
+# Version hiện tại của schema config. File cũ không có 'version' được coi là version 0
+CONFIG_VERSION = 1
+
+# Kiểu dữ liệu của các key đã biết; key lạ được giữ nguyên để tương thích về sau
+CONFIG_SCHEMA = {
+    'version': int,
+    'round_position': str,
+    'round_font_size': str,
+    'rank_positions': dict,
+    'final_positions': dict,
+    'font_name': str,
+    'font_color': str,
+    'rank_font_size': str,
+    'final_font_size': str,
+    'ticker_enabled': bool,
+    'publish_enabled': bool,
+    'publish_port': str,
+    'publish_host': str,
+    'playlist_enabled': bool,
+    'playlist_folder': str,
+    'playlist_seconds': str,
+    'countdown_position': str,
+    'countdown_font_size': str,
+    'memory_gauge': bool,
+    'reuse_buffers': bool,
+    'background_folder': str,
+    'selected_monitor': int,
+}
+
+# Các key là dict {tên: "x,y"}
+POSITION_MAP_KEYS = ('rank_positions', 'final_positions')
+
+class ConfigError(ValueError):
+    """File config hỏng hoặc không đúng schema"""
+
+def atomic_write_text(path, text):
+    """Ghi text vào file theo kiểu atomic: ghi file tạm cùng thư mục, fsync rồi rename"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def serialize_config(config):
+    """Chuyển config thành text JSON ổn định (dùng để so sánh thay đổi)"""
+    return json.dumps(config, indent=2, ensure_ascii=False)
+
+def validate_config(config):
+    """Kiểm tra schema và nâng cấp config lên CONFIG_VERSION. Raise ConfigError nếu sai"""
+    if not isinstance(config, dict):
+        raise ConfigError("Config phải là một JSON object")
+
+    version = config.get('version', 0)
+    if not isinstance(version, int) or version < 0:
+        raise ConfigError(f"Version không hợp lệ: {version!r}")
+    if version > CONFIG_VERSION:
+        raise ConfigError(f"Config version {version} mới hơn version được hỗ trợ ({CONFIG_VERSION})")
+
+    for key, expected in CONFIG_SCHEMA.items():
+        if key in config and not isinstance(config[key], expected):
+            raise ConfigError(f"'{key}' phải có kiểu {expected.__name__}")
+
+    for key in POSITION_MAP_KEYS:
+        for name, pos in config.get(key, {}).items():
+            if not isinstance(pos, str):
+                raise ConfigError(f"'{key}.{name}' phải là chuỗi \"x,y\"")
+
+    # Version 0 -> 1: cùng các key, chỉ thêm trường version
+    config['version'] = CONFIG_VERSION
+    return config
+
+def read_config(path):
+    """Đọc và kiểm tra file config. Trả về None nếu file không tồn tại"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ConfigError(f"Không đọc được JSON: {e}") from e
+    return validate_config(config)
+
+def quarantine(path):
+    """Đổi tên file config hỏng để không bị autosave ghi đè. Trả về đường dẫn mới"""
+    backup_path = f"{path}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}"
+    os.replace(path, backup_path)
+    return backup_path
@@ -0,0 +1,381 @@
+"""
+Đồng bộ display từ xa cho ScoShow
+Panel điều khiển phát scene + delta overlay_data qua TCP (JSON lines, có số thứ tự);
+display node tự giữ ảnh nền / font, khi kết nối lại hoặc lệch seq thì nhận lại toàn bộ state
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import queue
+import socket
+import argparse
+import threading
+
+DEFAULT_PORT = 5757
+
+# Mặc định nghe trên mọi interface để node trong LAN kết nối được.
+# Cổng không có xác thực: ai vào được mạng cũng đọc được scene / tên đang phát.
+# Đặt "127.0.0.1" hoặc IP của card mạng nội bộ để giới hạn.
+DEFAULT_HOST = '0.0.0.0'
+
+# Chu kỳ ping (giây): node không nhận gì sau 3 chu kỳ thì coi như mất kết nối
+HEARTBEAT_SECONDS = 2.0
+
+# Node đọc chậm hơn số message này: bỏ hàng đợi và gửi lại full state
+MAX_PENDING_MESSAGES = 256
+
+def encode_message(message):
+    """Một message = một dòng JSON UTF-8"""
+    return (json.dumps(message, ensure_ascii=False, separators=(',', ':')) + "\n").encode('utf-8')
+
+def normalize_overlay(overlay_data):
+    """Đưa overlay_data về dạng JSON thuần (tuple -> list) để so sánh delta ổn định"""
+    return json.loads(json.dumps(overlay_data or {}))
+
+def overlay_delta(old, new):
+    """Các key top-level thay đổi: (set {key: giá trị mới}, unset [key bị xóa])"""
+    changed = {key: value for key, value in new.items() if old.get(key, object()) != value}
+    removed = [key for key in old if key not in new]
+    return changed, removed
+
+def apply_delta(overlay, changed, removed):
+    """overlay mới sau khi áp delta (không sửa dict cũ)"""
+    result = dict(overlay)
+    result.update(changed)
+    for key in removed:
+        result.pop(key, None)
+    return result
+
+class _Subscriber:
+    """Một display node đã kết nối: hàng đợi message riêng + thread ghi"""
+
+    def __init__(self, publisher, sock, address):
+        self.publisher = publisher
+        self.sock = sock
+        self.address = address
+        self.queue = queue.Queue(MAX_PENDING_MESSAGES)
+        self.overflow = False
+
+    def send(self, data):
+        """(Gọi khi đang giữ lock của publisher) xếp message, tràn thì đánh dấu cần full resync"""
+        try:
+            self.queue.put_nowait(data)
+        except queue.Full:
+            self.overflow = True
+
+    def serve(self):
+        """Đọc hello, gửi full state nếu node chưa khớp, rồi chuyển tiếp message / ping"""
+        try:
+            self.sock.settimeout(HEARTBEAT_SECONDS * 3)
+            hello = json.loads(self.sock.makefile('rb').readline() or b'{}')
+            if not isinstance(hello, dict):
+                return  # không phải hello của display node: ngắt kết nối
+            self.sock.settimeout(None)
+            with self.publisher.lock:
+                self.publisher.subscribers.add(self)
+                if (hello.get('session'), hello.get('seq')) != (self.publisher.session, self.publisher.seq):
+                    self.queue.put_nowait(self.publisher.full_message())
+            while not self.publisher.closed:
+                try:
+                    data = self.queue.get(timeout=HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    # Ping mang seq hiện tại - chỉ gửi khi node đã nhận hết message trước đó
+                    with self.publisher.lock:
+                        if not self.queue.empty():
+                            continue
+                        data = encode_message({'type': 'ping', 'seq': self.publisher.seq})
+                if data is None:
+                    break
+                if self.overflow:
+                    with self.publisher.lock:
+                        while not self.queue.empty():
+                            self.queue.get_nowait()
+                        data = self.publisher.full_message()
+                        self.overflow = False
+                self.sock.sendall(data)
+        except (OSError, ValueError):
+            pass
+        finally:
+            with self.publisher.lock:
+                self.publisher.subscribers.discard(self)
+            self.sock.close()
+
+class DisplayPublisher:
+    """Server phát state display cho nhiều node (mỗi node một thread)"""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self.session = uuid.uuid4().hex
+        self.seq = 0
+        self.scene = None
+        self.overlay = {}
+        self.lock = threading.Lock()
+        self.subscribers = set()
+        self.closed = False
+        self.server = None
+
+    def start(self):
+        """Mở cổng lắng nghe (port 0 = tự chọn) và chạy thread accept"""
+        self.server = socket.create_server((self.host, self.port), reuse_port=False)
+        self.port = self.server.getsockname()[1]
+        threading.Thread(target=self.accept_loop, name="scoshow-publish", daemon=True).start()
+        return self
+
+    def accept_loop(self):
+        """Nhận kết nối mới, mỗi node một thread"""
+        while not self.closed:
+            try:
+                sock, address = self.server.accept()
+            except OSError:
+                break
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            subscriber = _Subscriber(self, sock, address)
+            threading.Thread(target=subscriber.serve, name="scoshow-subscriber", daemon=True).start()
+
+    def full_message(self):
+        """(Giữ lock) message full state hiện tại"""
+        return encode_message({'type': 'full', 'session': self.session, 'seq': self.seq,
+                               'scene': self.scene, 'overlay': self.overlay})
+
+    def publish(self, scene, overlay_data=None):
+        """Phát scene + overlay_data mới dưới dạng delta. Trả về seq (không đổi nếu state y như cũ)"""
+        overlay = normalize_overlay(overlay_data)
+        with self.lock:
+            if scene == self.scene and overlay == self.overlay:
+                return self.seq
+            changed, removed = overlay_delta(self.overlay, overlay)
+            self.seq += 1
+            self.scene = scene
+            self.overlay = overlay
+            data = encode_message({'type': 'delta', 'seq': self.seq, 'scene': scene,
+                                   'set': changed, 'unset': removed})
+            for subscriber in self.subscribers:
+                subscriber.send(data)
+            return self.seq
+
+    def node_count(self):
+        """Số node đang kết nối"""
+        with self.lock:
+            return len(self.subscribers)
+
+    def close(self):
+        """Đóng server và ngắt mọi node"""
+        self.closed = True
+        if self.server:
+            self.server.close()
+        with self.lock:
+            for subscriber in self.subscribers:
+                subscriber.send(None)
+                try:
+                    subscriber.sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+class ResyncNeeded(Exception):
+    """State của node lệch với server - kết nối lại để nhận full state"""
+
+class DisplayNodeClient:
+    """Client của display node: giữ state theo seq, tự kết nối lại và resync.
+
+    on_state(scene, overlay_data, seq) được gọi từ thread mạng sau mỗi thay đổi.
+    """
+
+    def __init__(self, host, port, on_state, reconnect_delay=1.0):
+        self.host = host
+        self.port = port
+        self.on_state = on_state
+        self.reconnect_delay = reconnect_delay
+        self.session = None
+        self.seq = 0
+        self.scene = None
+        self.overlay = {}
+        self.connected = False
+        self.resyncs = 0
+        self.stopped = False
+        self.sock = None
+
+    def start(self):
+        """Chạy vòng kết nối trong thread nền"""
+        threading.Thread(target=self.run, name="scoshow-node", daemon=True).start()
+        return self
+
+    def run(self):
+        """Vòng kết nối: hello -> nhận message; lỗi / lệch seq thì thử lại"""
+        while not self.stopped:
+            try:
+                with socket.create_connection((self.host, self.port), timeout=HEARTBEAT_SECONDS * 3) as sock:
+                    self.sock = sock
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    sock.sendall(encode_message({'type': 'hello', 'session': self.session, 'seq': self.seq}))
+                    self.connected = True
+                    reader = sock.makefile('rb')
+                    for line in reader:
+                        self.handle(json.loads(line))
+            except ResyncNeeded:
+                self.resyncs += 1
+                continue  # kết nối lại ngay, hello mang seq hiện tại -> server gửi full state
+            except (OSError, ValueError):
+                pass
+            finally:
+                self.connected = False
+                self.sock = None
+            if not self.stopped:
+                time.sleep(self.reconnect_delay)
+
+    def handle(self, message):
+        """Áp một message vào state; raise ResyncNeeded nếu thiếu message, ValueError nếu sai dạng"""
+        if not isinstance(message, dict):
+            raise ValueError(f"Message không hợp lệ: {message!r}")
+        kind = message.get('type')
+        if kind == 'full':
+            self.session = message['session']
+            self.seq = message['seq']
+            self.scene = message['scene']
+            self.overlay = message['overlay']
+        elif kind == 'delta':
+            if message['seq'] != self.seq + 1:
+                raise ResyncNeeded()
+            self.seq = message['seq']
+            self.scene = message['scene']
+            self.overlay = apply_delta(self.overlay, message['set'], message['unset'])
+        elif kind == 'ping':
+            if message['seq'] != self.seq:
+                raise ResyncNeeded()
+            return
+        else:
+            return
+        self.on_state(self.scene, self.overlay, self.seq)
+
+    def stop(self):
+        """Dừng và ngắt kết nối"""
+        self.stopped = True
+        sock = self.sock
+        if sock:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+class LatestState:
+    """Hộp chứa state mới nhất từ thread mạng; màn hình chỉ vẽ bản mới nhất (gộp cập nhật dồn)"""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.state = None
+
+    def put(self, scene, overlay_data, seq):
+        with self.condition:
+            self.state = (scene, overlay_data, seq)
+            self.condition.notify()
+
+    def take(self, timeout=None):
+        """State mới (hoặc None nếu hết timeout)"""
+        with self.condition:
+            if self.state is None:
+                self.condition.wait(timeout)
+            state, self.state = self.state, None
+            return state
+
+class HeadlessDisplay:
+    """Display node không cần màn hình: render frame bằng SceneRenderer ở kích thước cố định"""
+
+    def __init__(self, folder, size=(1920, 1080)):
+        import scoshow
+        self.scoshow = scoshow
+        self.renderer = scoshow.SceneRenderer()
+        if not self.renderer.load_background_folder(folder):
+            raise RuntimeError(f"Không tìm thấy ảnh nền trong {folder}")
+        self.compositor = scoshow.NumpyCompositor(self.renderer) if scoshow.HAS_NUMPY else None
+        self.size = size
+        self.frame = None
+
+    def show(self, scene, overlay_data):
+        """Render frame của scene (ảnh PIL vừa size)"""
+        if scene not in self.renderer.background_paths:
+            return None
+        self.frame = self.scoshow.render_window_frame(self.renderer, scene, overlay_data, self.size,
+                                                      self.compositor).copy()
+        return self.frame
+
+def parse_address(text, default_host='127.0.0.1'):
+    """"host:port" hoặc "port" -> (host, port)"""
+    host, _, port = text.rpartition(':')
+    return host or default_host, int(port)
+
+def run_headless_node(host, port, folder, size, state_file=None, snapshot=None):
+    """Node headless: render mọi state mới, ghi state / frame ra file (cho test và màn hình ngoài)"""
+    from config_store import atomic_write_text
+    display = HeadlessDisplay(folder, size)
+    latest = LatestState()
+    client = DisplayNodeClient(host, port, latest.put).start()
+    print(f"Display node (headless) -> {host}:{port}")
+    try:
+        while True:
+            state = latest.take(timeout=1.0)
+            if state is None:
+                continue
+            scene, overlay_data, seq = state
+            t0 = time.perf_counter()
+            frame = display.show(scene, overlay_data)
+            render_ms = (time.perf_counter() - t0) * 1000
+            if snapshot and frame is not None:
+                frame.save(snapshot)
+            if state_file:
+                atomic_write_text(state_file, json.dumps(
+                    {'session': client.session, 'seq': seq, 'scene': scene, 'overlay': overlay_data,
+                     'resyncs': client.resyncs, 'render_ms': round(render_ms, 1)}, ensure_ascii=False))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.stop()
+
+def run_tk_node(host, port, folder, monitor_index=1):
+    """Node có màn hình: TournamentDisplayWindow fullscreen, vẽ state mới nhất trên Tk main thread"""
+    import tkinter as tk
+    from scoshow import TournamentDisplayWindow
+    root = tk.Tk()
+    root.withdraw()
+    window = TournamentDisplayWindow(monitor_index)
+    if not window.load_background_folder(folder):
+        raise RuntimeError(f"Không tìm thấy ảnh nền trong {folder}")
+    window.root.protocol("WM_DELETE_WINDOW", root.destroy)
+    latest = LatestState()
+    client = DisplayNodeClient(host, port, latest.put).start()
+
+    def poll():
+        state = latest.take(timeout=0)
+        if state is not None:
+            scene, overlay_data, seq = state
+            window.show_background(scene, overlay_data)
+        root.after(15, poll)
+
+    poll()
+    root.mainloop()
+    client.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="ScoShow display node - nhận scene / overlay từ panel điều khiển")
+    parser.add_argument("--connect", default=f"127.0.0.1:{DEFAULT_PORT}", help="host:port của panel")
+    parser.add_argument("--folder", default="background", help="thư mục ảnh nền của node")
+    parser.add_argument("--monitor", type=int, default=1, help="màn hình hiển thị (chế độ có màn hình)")
+    parser.add_argument("--headless", action="store_true", help="không mở cửa sổ, chỉ render")
+    parser.add_argument("--size", default="1920x1080", help="kích thước render khi headless")
+    parser.add_argument("--state-file", help="(headless) ghi state đã áp dụng ra file JSON")
+    parser.add_argument("--snapshot", help="(headless) ghi frame mới nhất ra file ảnh")
+    args = parser.parse_args()
+
+    host, port = parse_address(args.connect)
+    if args.headless:
+        size = tuple(int(v) for v in args.size.split('x'))
+        run_headless_node(host, port, args.folder, size, args.state_file, args.snapshot)
+    else:
+        run_tk_node(host, port, args.folder, args.monitor)
+    return 0
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    sys.exit(main())
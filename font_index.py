@@ -0,0 +1,196 @@
+"""
+Font index cho ScoShow: quét thư mục font của hệ điều hành một lần, cache ra đĩa
+Tra font theo tên file ("arial.ttf") hoặc family ("Arial"), thay bằng font tương đương
+khi máy không có (Linux / macOS) và luôn có font đi kèm trong fonts/ (đủ dấu tiếng Việt)
+"""
+
+import os
+import sys
+import json
+import threading
+from functools import lru_cache
+
+from config_store import atomic_write_text
+
+FONT_EXTENSIONS = ('.ttf', '.otf', '.ttc')
+
+# File cache index (cùng thư mục với scoshow_config.json)
+INDEX_FILE = "scoshow_font_index.json"
+INDEX_VERSION = 1
+
+# Font đi kèm repo - fallback cuối cùng, hỗ trợ đủ tiếng Việt
+BUNDLED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
+FALLBACK_FONT = os.path.join(BUNDLED_DIR, "DejaVuSans.ttf")
+
+# Mẫu ký tự để kiểm tra font có đủ dấu tiếng Việt (thiếu glyph thì vẽ ra ô .notdef)
+VIETNAMESE_SAMPLE = "ĂÂĐÊÔƠƯăđơưạấẫặệịộợữựỹ"
+MISSING_PROBE = "\U0010FFFD"  # ký tự private-use, không font nào có
+
+# Font Windows trong font_options -> family tương đương (cùng metric nếu có) trên máy khác
+SUBSTITUTES = {
+    'arial': ['liberation sans', 'arimo', 'helvetica', 'dejavu sans'],
+    'times': ['liberation serif', 'tinos', 'times new roman', 'dejavu serif'],
+    'times new roman': ['liberation serif', 'tinos', 'dejavu serif'],
+    'calibri': ['carlito', 'dejavu sans'],
+    'cambria': ['caladea', 'dejavu serif'],
+    'verdana': ['dejavu sans'],
+    'tahoma': ['dejavu sans'],
+    'segoe ui': ['noto sans', 'dejavu sans'],
+    'georgia': ['gelasio', 'dejavu serif'],
+    'trebuc': ['dejavu sans'],
+    'trebuchet ms': ['dejavu sans'],
+    'comic': ['comic neue', 'dejavu sans'],
+    'comic sans ms': ['comic neue', 'dejavu sans'],
+    'cour': ['liberation mono', 'cousine', 'dejavu sans mono'],
+    'courier new': ['liberation mono', 'cousine', 'dejavu sans mono'],
+}
+
+REGULAR_STYLES = ('regular', 'book', 'normal', 'roman', 'medium')
+
+def font_dirs():
+    """Thư mục font của hệ điều hành hiện tại (có thể chưa tồn tại)"""
+    home = os.path.expanduser("~")
+    if sys.platform == 'win32':
+        windir = os.environ.get('WINDIR', 'C:/Windows')
+        local = os.environ.get('LOCALAPPDATA', os.path.join(home, 'AppData', 'Local'))
+        return [os.path.join(windir, 'Fonts'), os.path.join(local, 'Microsoft', 'Windows', 'Fonts')]
+    if sys.platform == 'darwin':
+        return ['/System/Library/Fonts', '/Library/Fonts', os.path.join(home, 'Library', 'Fonts')]
+    data_home = os.environ.get('XDG_DATA_HOME', os.path.join(home, '.local', 'share'))
+    return ['/usr/share/fonts', '/usr/local/share/fonts',
+            os.path.join(data_home, 'fonts'), os.path.join(home, '.fonts')]
+
+def _glyph(font, char):
+    """bbox + bitmap của một ký tự (để so với glyph .notdef)"""
+    from PIL import Image, ImageDraw
+    left, top, right, bottom = font.getbbox(char)
+    image = Image.new('L', (max(1, right - left), max(1, bottom - top)), 0)
+    ImageDraw.Draw(image).text((-left, -top), char, fill=255, font=font)
+    return (left, top, right, bottom), image.tobytes()
+
+def describe_font(path):
+    """Đọc family / style và kiểm tra dấu tiếng Việt. None nếu không đọc được"""
+    from PIL import ImageFont
+    try:
+        font = ImageFont.truetype(path, 16)
+        family, style = font.getname()
+        missing = _glyph(font, MISSING_PROBE)
+        vietnamese = all(_glyph(font, char) != missing for char in VIETNAMESE_SAMPLE)
+    except (OSError, ValueError):
+        return None
+    return {'path': path, 'family': family or "", 'style': style or "", 'vietnamese': vietnamese}
+
+def scan_dirs(roots):
+    """Duyệt các thư mục font. Trả về ({thư mục: mtime}, [đường dẫn font])"""
+    dirs = {}
+    paths = []
+    for root in roots:
+        if not os.path.isdir(root):
+            dirs[root] = None
+            continue
+        for directory, _, files in os.walk(root):
+            dirs[directory] = os.stat(directory).st_mtime_ns
+            paths.extend(os.path.join(directory, name) for name in sorted(files)
+                         if name.lower().endswith(FONT_EXTENSIONS))
+    return dirs, paths
+
+def index_is_current(dirs):
+    """Thư mục font chưa thay đổi kể từ khi lưu index (thêm / xóa font đều đổi mtime thư mục)"""
+    for directory, mtime in dirs.items():
+        try:
+            current = os.stat(directory).st_mtime_ns if os.path.isdir(directory) else None
+        except OSError:
+            current = None
+        if current != mtime:
+            return False
+    return True
+
+class FontIndex:
+    """Bảng tra font: tên file và family (chữ thường) -> thông tin font"""
+
+    def __init__(self, fonts):
+        self.fonts = fonts
+        self.by_file = {}
+        self.by_family = {}
+        for entry in fonts:
+            self.by_file.setdefault(os.path.basename(entry['path']).lower(), entry)
+            self.by_family.setdefault(entry['family'].lower(), []).append(entry)
+
+    def family_font(self, family, vietnamese=False):
+        """Font của family (ưu tiên style thường); vietnamese=True thì chỉ nhận font đủ dấu"""
+        entries = [entry for entry in self.by_family.get(family, [])
+                   if entry['vietnamese'] or not vietnamese]
+        if not entries:
+            return None
+        for entry in entries:
+            if entry['style'].lower() in REGULAR_STYLES:
+                return entry
+        return entries[0]
+
+    def resolve(self, font_name):
+        """Đường dẫn font cho font_name: file có sẵn, tên file, family, font tương đương, font đi kèm"""
+        if os.path.isfile(font_name):
+            return font_name
+        filename = os.path.basename(font_name).lower()
+        if filename in self.by_file:
+            return self.by_file[filename]['path']
+        stem = os.path.splitext(filename)[0] if filename.endswith(FONT_EXTENSIONS) else filename
+        entry = self.family_font(stem)
+        if entry:
+            return entry['path']
+        # Font tương đương: chỉ nhận font đủ dấu tiếng Việt
+        for family in SUBSTITUTES.get(stem, []):
+            entry = self.family_font(family, vietnamese=True)
+            if entry:
+                return entry['path']
+        return FALLBACK_FONT
+
+    def vietnamese_families(self):
+        """Các family có đủ dấu tiếng Việt (sắp xếp theo tên)"""
+        return sorted({entry['family'] for entry in self.fonts if entry['vietnamese']})
+
+def build_index(index_file=INDEX_FILE):
+    """Dùng index đã cache nếu thư mục font chưa đổi, nếu không thì quét lại và ghi ra đĩa.
+
+    Font đã có trong cache cũ (cùng path) không phải mở lại khi quét lại.
+    """
+    cached = {}
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == INDEX_VERSION:
+            if index_is_current(data['dirs']):
+                return FontIndex(data['fonts'])
+            cached = {entry['path']: entry for entry in data['fonts']}
+    except (OSError, ValueError, KeyError):
+        pass
+
+    # Thư mục đi kèm đứng cuối: font cùng tên trên máy được ưu tiên
+    dirs, paths = scan_dirs(font_dirs() + [BUNDLED_DIR])
+    fonts = []
+    for path in paths:
+        entry = cached.get(path) or describe_font(path)
+        if entry:
+            fonts.append(entry)
+    try:
+        atomic_write_text(index_file, json.dumps({'version': INDEX_VERSION, 'dirs': dirs, 'fonts': fonts},
+                                                 ensure_ascii=False))
+    except OSError as e:
+        print(f"Không ghi được font index: {e}")
+    return FontIndex(fonts)
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_index():
+    """Font index của process (load / quét lần đầu, an toàn khi gọi từ nhiều thread)"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = build_index()
+        return _index
+
+@lru_cache(maxsize=64)
+def resolve_font(font_name):
+    """Đường dẫn font cho font_name (có cache - không đụng tới filesystem sau lần đầu)"""
+    return get_index().resolve(font_name)
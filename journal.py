@@ -0,0 +1,149 @@
+"""
+Journal trạng thái sự kiện của ScoShow
+Ghi append-only mọi lần apply ranking / final / chuyển scene để khôi phục sau crash và undo
+"""
+
+import os
+import json
+import time
+
+from config_store import atomic_write_text
+
+# Các loại bản ghi trong journal
+RECORD_KINDS = ('ranking', 'final', 'scene', 'undo')
+
+def empty_state():
+    """Trạng thái ban đầu: chưa có dữ liệu nào được hiển thị"""
+    return {'mode': None, 'ranking': {}, 'final': {}}
+
+def apply_record(state, kind, payload):
+    """Trả về state mới sau khi áp dụng một bản ghi (không sửa state cũ)"""
+    new_state = {'mode': state['mode'], 'ranking': dict(state['ranking']), 'final': dict(state['final'])}
+    if kind == 'ranking':
+        new_state['ranking'] = dict(payload)
+        new_state['mode'] = "01"
+    elif kind == 'final':
+        new_state['final'] = dict(payload)
+        new_state['mode'] = "02"
+    elif kind == 'scene':
+        new_state['mode'] = payload.get('mode')
+    return new_state
+
+class EventJournal:
+    """Journal append-only (JSON lines) + snapshot định kỳ"""
+
+    def __init__(self, path, sync_interval=0.5, compact_every=500, undo_depth=50):
+        self.path = path
+        self.snapshot_path = os.path.splitext(path)[0] + ".snapshot.json"
+        # fsync tối đa mỗi sync_interval giây thay vì mỗi bản ghi
+        self.sync_interval = sync_interval
+        self.compact_every = compact_every
+        self.undo_depth = undo_depth
+
+        self.state = empty_state()
+        self.undo_stack = []
+        self.seq = 0
+        self._records_since_compact = 0
+        self._file = None
+        self._dirty = False
+        self._last_sync = time.monotonic()
+
+    def load(self):
+        """Đọc snapshot rồi replay journal. Trả về state cuối cùng"""
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+                self.state = snapshot['state']
+                self.undo_stack = snapshot.get('undo_stack', [])
+                snapshot_seq = self.seq = snapshot.get('seq', 0)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Lỗi khi đọc snapshot journal: {e}")
+
+        if os.path.exists(self.path):
+            good_offset = 0
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line.decode('utf-8'))
+                    except ValueError:
+                        # Dòng cuối bị ghi dở khi crash - bỏ qua phần còn lại
+                        break
+                    good_offset += len(line)
+                    if record.get('seq', 0) <= snapshot_seq:
+                        continue
+                    self._apply(record['kind'], record.get('payload', {}))
+                    self.seq = record['seq']
+                    self._records_since_compact += 1
+            # Cắt phần ghi dở để các bản ghi mới bắt đầu trên dòng sạch
+            if good_offset < os.path.getsize(self.path):
+                os.truncate(self.path, good_offset)
+        return self.state
+
+    def _apply(self, kind, payload):
+        if kind == 'undo':
+            if self.undo_stack:
+                self.state = self.undo_stack.pop()
+            return
+        self.undo_stack.append(self.state)
+        del self.undo_stack[:-self.undo_depth]
+        self.state = apply_record(self.state, kind, payload)
+
+    def record(self, kind, payload=None):
+        """Ghi một bản ghi. Bỏ qua nếu không làm thay đổi state. Trả về True nếu đã ghi"""
+        if kind not in RECORD_KINDS:
+            raise ValueError(f"Loại bản ghi không hợp lệ: {kind}")
+        payload = payload or {}
+        if kind != 'undo' and apply_record(self.state, kind, payload) == self.state:
+            return False
+
+        self._apply(kind, payload)
+        self.seq += 1
+        record = {'seq': self.seq, 't': round(time.time(), 3), 'kind': kind, 'payload': payload}
+
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._dirty = True
+        self._records_since_compact += 1
+
+        if self._records_since_compact >= self.compact_every:
+            self.compact()
+        elif time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+        return True
+
+    def undo(self):
+        """Quay về state trước lần cập nhật cuối. Trả về state mới hoặc None nếu không còn gì để undo"""
+        if not self.undo_stack:
+            return None
+        self.record('undo')
+        return self.state
+
+    def sync(self):
+        """fsync các bản ghi đang chờ (gọi định kỳ từ vòng lặp Tk)"""
+        if self._file is not None and self._dirty:
+            os.fsync(self._file.fileno())
+            self._dirty = False
+        self._last_sync = time.monotonic()
+
+    def compact(self):
+        """Ghi snapshot (atomic) rồi làm rỗng journal"""
+        snapshot = {'seq': self.seq, 'state': self.state, 'undo_stack': self.undo_stack}
+        atomic_write_text(self.snapshot_path, json.dumps(snapshot, ensure_ascii=False))
+        if self._file is not None:
+            self._file.close()
+        # Snapshot đã có seq nên crash giữa hai bước vẫn replay đúng
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._dirty = False
+        self._records_since_compact = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        """fsync và đóng file journal"""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
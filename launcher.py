@@ -7,32 +7,63 @@ Simple launcher for ScoShow Tournament Ranking Display
 
 import sys
 import os
+import argparse
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 def main():
     """Main launcher function"""
+    parser = argparse.ArgumentParser(description="ScoShow Tournament Display")
+    parser.add_argument("--startup-benchmark", action="store_true",
+                        help="print startup timings after the first frame and exit")
+    parser.add_argument("--session", action="append", metavar="NAME",
+                        help="run a named tournament session; repeat to run several in one process")
+    parser.add_argument("--display-node", metavar="HOST:PORT",
+                        help="run as a remote display node fed by a control panel")
+    parser.add_argument("--folder", default="background",
+                        help="background folder used by the display node")
+    parser.add_argument("--monitor", type=int, default=1,
+                        help="monitor index used by the display node")
+    parser.add_argument("--headless", action="store_true",
+                        help="display node renders without opening a window")
+    parser.add_argument("--profile", type=float, metavar="SECONDS",
+                        help="sample-profile the app for SECONDS and write the profile next to scoshow_config.json")
+    args = parser.parse_args()
+    
+    if args.display_node:
+        from display_sync import parse_address, run_headless_node, run_tk_node
+        host, port = parse_address(args.display_node)
+        print(f"Starting ScoShow display node ({host}:{port})...")
+        if args.headless:
+            run_headless_node(host, port, args.folder, (1920, 1080))
+        else:
+            run_tk_node(host, port, args.folder, args.monitor)
+        return
+    
     try:
         print("Starting ScoShow Tournament Display...")
         
-        # Import the main application
-        import tkinter as tk
-        from tkinter import ttk, filedialog, messagebox
-        import json
-        from PIL import Image, ImageTk, ImageDraw, ImageFont
-        import threading
-        import time
-        from screeninfo import get_monitors
+        # Import tournament classes (PIL / screeninfo are loaded lazily by scoshow)
+        from scoshow import TournamentControlPanel, TournamentSessions
         
         print("All modules imported successfully")
         
-        # Import tournament classes
-        from scoshow import TournamentControlPanel
+        if args.session:
+            # Several brackets in one process, sharing caches and the render pool
+            sessions = TournamentSessions(args.session)
+            print(f"Tournament sessions created: {', '.join(args.session)}")
+            if args.profile:
+                # The profiler samples every thread, so one session covers the whole process
+                sessions.panels[0].start_profile(args.profile)
+            sessions.run()
+            return
         
         # Create and run the application
-        app = TournamentControlPanel()
+        app = TournamentControlPanel(startup_benchmark=args.startup_benchmark)
         print("Tournament Control Panel created")
+        if args.profile:
+            app.start_profile(args.profile)
         
         app.run()
         
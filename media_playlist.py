@@ -0,0 +1,95 @@
+"""
+Playlist slide / clip tài trợ cho màn hình chờ (background 00) của ScoShow
+Đọc danh sách media, giải mã và scale sẵn từng item (chạy trong worker, không đụng Tk)
+"""
+
+import os
+
+# Định dạng hỗ trợ: ảnh tĩnh và ảnh động (GIF / WebP / APNG được phát như clip)
+MEDIA_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp')
+
+# File tùy chọn trong thư mục playlist: mỗi dòng "tên file[,số giây]" (thứ tự phát)
+PLAYLIST_FILE = "playlist.txt"
+
+DEFAULT_SLIDE_SECONDS = 8
+
+# Giới hạn bộ nhớ frame của một clip đã scale (byte); clip dài hơn sẽ bị bỏ bớt frame
+CLIP_FRAME_BUDGET = 192 * 1024 * 1024
+
+class PlaylistItem:
+    """Một item trong playlist: đường dẫn và thời lượng (None = mặc định / hết clip)"""
+
+    __slots__ = ('path', 'seconds')
+
+    def __init__(self, path, seconds=None):
+        self.path = path
+        self.seconds = seconds
+
+    def __repr__(self):
+        return f"PlaylistItem({self.path!r}, {self.seconds!r})"
+
+class PreparedMedia:
+    """Item đã giải mã và scale sẵn: các frame RGB và thời lượng từng frame (ms)"""
+
+    __slots__ = ('item', 'frames', 'durations')
+
+    def __init__(self, item, frames, durations):
+        self.item = item
+        self.frames = frames
+        self.durations = durations
+
+    @property
+    def is_clip(self):
+        return len(self.frames) > 1
+
+def load_playlist(folder):
+    """Danh sách PlaylistItem của thư mục: theo playlist.txt nếu có, nếu không thì theo tên file"""
+    playlist_path = os.path.join(folder, PLAYLIST_FILE)
+    if not os.path.exists(playlist_path):
+        names = sorted(name for name in os.listdir(folder) if name.lower().endswith(MEDIA_EXTENSIONS))
+        return [PlaylistItem(os.path.join(folder, name)) for name in names]
+
+    items = []
+    with open(playlist_path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            name, _, seconds = (part.strip() for part in line.partition(','))
+            path = os.path.join(folder, name)
+            if not os.path.exists(path):
+                raise ValueError(f"{PLAYLIST_FILE} dòng {line_no}: không tìm thấy {name}")
+            try:
+                items.append(PlaylistItem(path, float(seconds) if seconds else None))
+            except ValueError:
+                raise ValueError(f"{PLAYLIST_FILE} dòng {line_no}: số giây không hợp lệ {seconds!r}")
+    return items
+
+def prepare_media(item, size):
+    """(Worker) giải mã item và scale vừa size (giữ tỷ lệ, viền đen).
+
+    Clip được giữ trong CLIP_FRAME_BUDGET bằng cách bỏ bớt frame (cộng dồn thời lượng
+    vào frame giữ lại), nên tổng thời lượng clip không đổi.
+    """
+    from PIL import Image, ImageSequence
+    from batch_export import fit_to_size
+
+    with Image.open(item.path) as image:
+        frame_count = getattr(image, 'n_frames', 1)
+        if frame_count == 1:
+            image.load()
+            frame = fit_to_size(image.convert('RGB'), size)
+            return PreparedMedia(item, [frame], [0])
+
+        step = max(1, -(-frame_count * size[0] * size[1] * 3 // CLIP_FRAME_BUDGET))
+        frames = []
+        durations = []
+        for index, frame in enumerate(ImageSequence.Iterator(image)):
+            duration = frame.info.get('duration') or 100
+            if index % step:
+                durations[-1] += duration
+                continue
+            # Clip nhiều frame: resize nhanh hơn LANCZOS, khác biệt không thấy khi đang chạy
+            frames.append(fit_to_size(frame.convert('RGB'), size, resample=Image.Resampling.BILINEAR))
+            durations.append(duration)
+        return PreparedMedia(item, frames, durations)
@@ -0,0 +1,56 @@
+"""
+Đo bộ nhớ cho ScoShow: RSS của process và số ảnh Tk đang tồn tại
+Không bắt buộc psutil - dùng /proc trên Linux, Win32 API trên Windows
+"""
+
+import os
+import sys
+
+def rss_bytes():
+    """Resident set size hiện tại của process (byte), hoặc None nếu không đo được"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+
+    if sys.platform.startswith('linux'):
+        try:
+            with open('/proc/self/statm', 'r') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError):
+            return None
+
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return None
+
+    try:
+        import resource
+        # Không có số hiện tại: dùng peak (macOS trả byte, nơi khác trả KB)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+def tk_image_count(widget):
+    """Số ảnh Tk (PhotoImage, ...) đang tồn tại trong interpreter của widget"""
+    return len(widget.tk.call('image', 'names'))
+
+def format_mb(value):
+    """Byte -> "123.4 MB" ("n/a" nếu None)"""
+    return "n/a" if value is None else f"{value / (1024 * 1024):.1f} MB"
@@ -0,0 +1,126 @@
+"""
+Sampling profiler nhẹ cho ScoShow - chẩn đoán máy chậm tại địa điểm mà không cần công cụ dev
+Một thread lấy mẫu stack của mọi thread (Tk, worker render, đồng bộ display) theo chu kỳ,
+ghi ra file folded stack (flamegraph.pl / speedscope đọc được) + file JSON mô tả máy / cài đặt
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import threading
+from collections import Counter
+
+# Chu kỳ lấy mẫu mặc định (giây) - 200 mẫu / giây, overhead vài %
+DEFAULT_INTERVAL = 0.005
+
+# Số hàm hiện trong bảng tóm tắt của file JSON
+TOP_FUNCTIONS = 40
+
+def frame_label(frame):
+    """Nhãn một frame: hàm (file:dòng bắt đầu hàm)"""
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class SamplingProfiler:
+    """Lấy mẫu sys._current_frames() trong thread nền; mỗi mẫu là một stack folded theo thread"""
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.sample_count = 0
+        self.started_at = None
+        self.stopped_at = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="scoshow-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.stopped_at = time.time()
+        return self
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.sample_count += 1
+
+    def folded(self):
+        """Nội dung file folded stack: "thread;hàm;hàm số_mẫu" mỗi dòng"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def top_functions(self, limit=TOP_FUNCTIONS):
+        """[(hàm, self, total)] - self: hàm đang chạy, total: hàm có trên stack (số mẫu)"""
+        own = Counter()
+        total = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')[1:]
+            if not frames:
+                continue
+            own[frames[-1]] += count
+            for label in set(frames):
+                total[label] += count
+        return [(label, own[label], count) for label, count in total.most_common(limit)]
+
+def machine_info():
+    """Thông tin máy / thư viện ảnh hưởng tới tốc độ render"""
+    info = {
+        'platform': platform.platform(),
+        'python': sys.version.split()[0],
+        'cpu_count': os.cpu_count(),
+    }
+    try:
+        import PIL
+        from PIL import features
+        info['pillow'] = PIL.__version__
+        info['raqm'] = bool(features.check('raqm'))
+    except ImportError:
+        info['pillow'] = None
+    try:
+        import numpy
+        info['numpy'] = numpy.__version__
+    except ImportError:
+        info['numpy'] = None
+    return info
+
+def write_profile(profiler, folder, metadata, session=None):
+    """Ghi <prefix>.folded và <prefix>.json vào folder. Trả về đường dẫn file folded"""
+    stamp = time.strftime('%Y%m%d_%H%M%S', time.localtime(profiler.started_at))
+    prefix = os.path.join(folder, f"scoshow_profile_{stamp}" + (f".{session}" if session else ""))
+    with open(prefix + ".folded", 'w', encoding='utf-8') as f:
+        f.write(profiler.folded())
+    report = dict(metadata)
+    report.update({
+        'machine': machine_info(),
+        'started_at': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(profiler.started_at)),
+        'seconds': round(profiler.stopped_at - profiler.started_at, 1),
+        'interval_ms': profiler.interval * 1000,
+        'samples': profiler.sample_count,
+        'top_functions': [{'function': label, 'self': own, 'total': total}
+                          for label, own, total in profiler.top_functions()],
+    })
+    with open(prefix + ".json", 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return prefix + ".folded"
@@ -0,0 +1,187 @@
+"""
+Export clip công bố kết quả cuối của ScoShow (fifth -> winner) cho stream highlight
+Tạo frame không cần màn hình từ ảnh nền và sprite text đã cache, ghi thẳng ra ffmpeg / GIF / thư mục PNG
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import subprocess
+
+import scoshow
+from batch_export import OUTPUT_SIZES, fit_geometry, fit_to_size
+
+# Ảnh động (GIF / WebP) giữ mọi frame trong bộ nhớ nên fade được giới hạn fps
+ANIMATED_MAX_FPS = 10
+
+class RevealSequence:
+    """Dựng frame cho hiệu ứng công bố lần lượt từng hạng trên background 02"""
+
+    def __init__(self, renderer, overlay_data, size=None, fit='contain'):
+        self.renderer = renderer
+        background = renderer.render("02")
+        source_size = background.size
+        self.size = size or source_size
+        scale, scaled_size, self.offset = fit_geometry(source_size, self.size, fit)
+
+        # Ảnh nền ở kích thước output - chỉ render một lần
+        self.base = fit_to_size(background.convert('RGB'), self.size, fit)
+
+        # Sprite (mask alpha + màu) của từng hạng, vẽ trực tiếp ở kích thước output
+        self.sprites = {}
+        for key, xy, text, font_name, font_size, color in renderer.text_items("02", overlay_data, scale):
+            self.sprites[key] = self.make_sprite(xy, text, font_name, font_size, color)
+        self.steps = [key for key in scoshow.REVEAL_ORDER if key in self.sprites]
+
+    def make_sprite(self, xy, text, font_name, font_size, color):
+        """(vị trí, mask, màu) từ đoạn text đã shape (cache chung với display) để paste nhiều lần"""
+        left, top, mask = scoshow.shaped_run(text, font_name, font_size)
+        position = (xy[0] + left + self.offset[0], xy[1] + top + self.offset[1])
+        return position, mask, color
+
+    def paste_sprite(self, frame, key, opacity=1.0):
+        """Vẽ sprite lên frame với độ mờ opacity (0..1)"""
+        position, mask, color = self.sprites[key]
+        if opacity < 1.0:
+            mask = mask.point(lambda v: round(v * opacity))
+        frame.paste(color, position + (position[0] + mask.width, position[1] + mask.height), mask)
+
+    def frames(self, fps=30, intro=1.0, holds=2.0, fade=0.5):
+        """Generator (frame, số lần lặp). Chỉ giữ frame đã công bố hiện tại trong bộ nhớ.
+
+        holds có thể là một số (giây mỗi bước) hoặc list theo từng bước fifth -> winner.
+        """
+        if not isinstance(holds, (list, tuple)):
+            holds = [holds] * len(self.steps)
+        fade_frames = max(0, round(fade * fps))
+
+        revealed = self.base.copy()
+        yield revealed, max(1, round(intro * fps))
+        for index, key in enumerate(self.steps):
+            for i in range(1, fade_frames):
+                frame = revealed.copy()
+                self.paste_sprite(frame, key, i / fade_frames)
+                yield frame, 1
+            self.paste_sprite(revealed, key)
+            hold = holds[index] if index < len(holds) else holds[-1]
+            yield revealed, max(1, round(hold * fps))
+
+def write_ffmpeg(sequence, path, fps, **timing):
+    """Stream frame RGB thô vào ffmpeg (mp4 / webm ...). RuntimeError nếu máy không có ffmpeg"""
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError("Không tìm thấy ffmpeg trong PATH - cài ffmpeg, hoặc export ra .gif / .webp "
+                           "hay một thư mục frame PNG (output không có đuôi file)")
+    width, height = sequence.size
+    command = ["ffmpeg", "-y", "-loglevel", "error",
+               "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+               "-pix_fmt", "yuv420p", path]
+    process = subprocess.Popen(command, stdin=subprocess.PIPE)
+    try:
+        for frame, repeat in sequence.frames(fps, **timing):
+            data = frame.tobytes()
+            for _ in range(repeat):
+                process.stdin.write(data)
+    finally:
+        process.stdin.close()
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg lỗi (exit code {process.returncode})")
+
+def write_animated(sequence, path, fps, **timing):
+    """Ảnh động (GIF / WebP / APNG).
+
+    Encoder ảnh động của Pillow cần toàn bộ frame, nên chỉ giữ các frame khác nhau:
+    frame lặp lại được gộp thành một frame có duration dài, fade chạy ở tối đa
+    ANIMATED_MAX_FPS và GIF được lưu ở dạng palette.
+    """
+    fps = min(fps, ANIMATED_MAX_FPS)
+    is_gif = path.lower().endswith('.gif')
+    frames = []
+    durations = []
+    for frame, repeat in sequence.frames(fps, **timing):
+        frames.append(frame.convert('P', palette=scoshow.Image.Palette.ADAPTIVE) if is_gif else frame.copy())
+        durations.append(round(1000 * repeat / fps))
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=durations, loop=0)
+
+def write_frames(sequence, folder, fps, **timing):
+    """Ghi từng frame ra thư mục PNG (frame lặp lại được ghi một lần rồi copy)"""
+    os.makedirs(folder, exist_ok=True)
+    number = 0
+    for frame, repeat in sequence.frames(fps, **timing):
+        first = os.path.join(folder, f"frame_{number:05d}.png")
+        frame.save(first)
+        for i in range(1, repeat):
+            shutil.copyfile(first, os.path.join(folder, f"frame_{number + i:05d}.png"))
+        number += repeat
+    return number
+
+def overlay_from_config(config_path, names, font_name=None):
+    """Tạo overlay_data cho background 02 từ scoshow_config.json + danh sách tên winner..fifth"""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    overlay_data = {'positions': {}, 'boxes': {}}
+    for key, name in zip(['winner', 'second', 'third', 'fourth', 'fifth'], names):
+        overlay_data[key] = name
+        x, y, box = scoshow.parse_position(config.get('final_positions', {}).get(key, "0,0"))
+        overlay_data['positions'][key] = (x, y)
+        if box:
+            overlay_data['boxes'][key] = box
+    size = config.get('final_font_size', "60")
+    overlay_data['font_settings'] = {
+        'font_name': font_name or config.get('font_name', 'arial.ttf'),
+        'font_size': int(size) if str(size).isdigit() else 60,
+        'color': config.get('font_color', 'white'),
+    }
+    return overlay_data
+
+def main():
+    parser = argparse.ArgumentParser(description="Export clip công bố kết quả cuối (fifth -> winner)")
+    parser.add_argument("output", help="file .mp4/.webm (cần ffmpeg), .gif/.webp/.png (ảnh động) hoặc thư mục frame")
+    parser.add_argument("--folder", default="background", help="thư mục ảnh nền")
+    parser.add_argument("--payload", help="file JSON overlay_data của background 02")
+    parser.add_argument("--config", default="scoshow_config.json", help="config lấy vị trí / font khi dùng --names")
+    parser.add_argument("--names", help="tên winner,second,third,fourth,fifth (phân tách bằng dấu phẩy)")
+    parser.add_argument("--font", help="ghi đè font trong config")
+    parser.add_argument("--size", choices=sorted(OUTPUT_SIZES), default='1080p')
+    parser.add_argument("--fit", choices=['contain', 'cover'], default='contain')
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--intro", type=float, default=1.0, help="giây giữ ảnh nền trước lần công bố đầu")
+    parser.add_argument("--hold", default="2", help="giây giữ mỗi bước, hoặc list theo bước: 2,2,2,3,5")
+    parser.add_argument("--fade", type=float, default=0.5, help="giây fade-in mỗi tên")
+    args = parser.parse_args()
+
+    if args.payload:
+        with open(args.payload, 'r', encoding='utf-8') as f:
+            overlay_data = json.load(f)
+    elif args.names:
+        overlay_data = overlay_from_config(args.config, [n.strip() for n in args.names.split(',')], args.font)
+    else:
+        parser.error("cần --payload hoặc --names")
+
+    renderer = scoshow.SceneRenderer()
+    if not renderer.load_background_folder(args.folder):
+        print(f"Không tìm thấy ảnh nền trong {args.folder}")
+        return 1
+
+    holds = [float(v) for v in args.hold.split(',')]
+    timing = {'intro': args.intro, 'holds': holds if len(holds) > 1 else holds[0], 'fade': args.fade}
+    sequence = RevealSequence(renderer, overlay_data, OUTPUT_SIZES[args.size], args.fit)
+
+    extension = os.path.splitext(args.output)[1].lower()
+    if extension in ('.gif', '.webp', '.png'):
+        write_animated(sequence, args.output, args.fps, **timing)
+    elif extension:
+        try:
+            write_ffmpeg(sequence, args.output, args.fps, **timing)
+        except RuntimeError as e:
+            print(e)
+            return 1
+    else:
+        count = write_frames(sequence, args.output, args.fps, **timing)
+        print(f"Đã ghi {count} frame")
+    print(f"Đã export: {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
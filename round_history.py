@@ -0,0 +1,69 @@
+"""
+Lịch sử các round đã hiển thị của ScoShow
+Lưu mọi overlay_data ranking đã apply vào SQLite, đánh index theo số round để gọi lại nhanh
+"""
+
+import json
+import time
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    round TEXT NOT NULL,
+    applied_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_rounds_round ON rounds(round, id);
+"""
+
+def _round_sort_key(round_value):
+    """Sắp xếp round theo số nếu có thể ("2" < "10"), còn lại theo chữ"""
+    return (0, int(round_value), "") if round_value.isdecimal() else (1, 0, round_value)
+
+class RoundHistory:
+    """Kho lịch sử round (SQLite, mỗi lần apply một dòng)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def add(self, overlay_data):
+        """Lưu snapshot overlay_data của một round. Bỏ qua nếu trùng bản mới nhất của round đó"""
+        round_value = str(overlay_data.get('round', '')).strip()
+        if not round_value:
+            return False
+        data = json.dumps(overlay_data, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+        row = self.conn.execute(
+            "SELECT data FROM rounds WHERE round = ? ORDER BY id DESC LIMIT 1", (round_value,)).fetchone()
+        if row and row[0] == data:
+            return False
+        with self.conn:
+            self.conn.execute("INSERT INTO rounds (round, applied_at, data) VALUES (?, ?, ?)",
+                              (round_value, time.time(), data))
+        return True
+
+    def get(self, round_value):
+        """overlay_data mới nhất của round, hoặc None"""
+        row = self.conn.execute(
+            "SELECT data FROM rounds WHERE round = ? ORDER BY id DESC LIMIT 1", (str(round_value),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def rounds(self):
+        """Danh sách (round, applied_at, overlay_data) - bản mới nhất của mỗi round, theo thứ tự round"""
+        rows = self.conn.execute(
+            "SELECT r.round, r.applied_at, r.data FROM rounds r "
+            "JOIN (SELECT MAX(id) AS id FROM rounds GROUP BY round) latest ON r.id = latest.id").fetchall()
+        entries = [(round_value, applied_at, json.loads(data)) for round_value, applied_at, data in rows]
+        entries.sort(key=lambda entry: _round_sort_key(entry[0]))
+        return entries
+
+    def all_snapshots(self):
+        """Mọi snapshot theo thứ tự đã apply: [(round, applied_at, overlay_data)]"""
+        rows = self.conn.execute("SELECT round, applied_at, data FROM rounds ORDER BY id").fetchall()
+        return [(round_value, applied_at, json.loads(data)) for round_value, applied_at, data in rows]
+
+    def close(self):
+        """Đóng kết nối database"""
+        self.conn.close()
@@ -0,0 +1,136 @@
+"""
+Tính bảng xếp hạng ScoShow từ điểm thô
+Cộng dồn điểm theo round, áp dụng luật tie-break và cập nhật thứ hạng tăng dần khi có điểm mới
+"""
+
+import csv
+from bisect import bisect_left, insort
+
+RANK_KEYS = ['1st', '2nd', '3rd', '4th', '5th', '6th', '7th', '8th', '9th', '10th']
+FINAL_KEYS = ['winner', 'second', 'third', 'fourth', 'fifth']
+
+# Luật tie-break có sẵn, theo thứ tự ưu tiên khi được liệt kê
+TIE_BREAK_RULES = ('total', 'best_round', 'latest_score', 'rounds_played', 'name')
+DEFAULT_TIE_BREAKS = ('total', 'best_round', 'latest_score', 'name')
+
+class PlayerScore:
+    """Điểm của một player: điểm từng round và tổng cộng dồn"""
+
+    __slots__ = ('name', 'rounds', 'total', 'best', 'latest_round', 'latest')
+
+    def __init__(self, name):
+        self.name = name
+        self.rounds = {}
+        self.total = 0
+        self.best = None
+        self.latest_round = None
+        self.latest = 0
+
+    def set_score(self, round_no, points):
+        """Gán điểm cho một round (ghi đè nếu đã có - dùng để sửa điểm nhập sai)"""
+        previous = self.rounds.get(round_no)
+        self.total += points - (previous or 0)
+        self.rounds[round_no] = points
+        if self.best is None or points >= self.best:
+            self.best = points
+        elif previous == self.best:
+            # Điểm cao nhất vừa bị sửa thấp xuống - tính lại
+            self.best = max(self.rounds.values())
+        if self.latest_round is None or round_no >= self.latest_round:
+            self.latest_round = round_no
+            self.latest = points
+
+class ScoreBoard:
+    """Bảng điểm với thứ hạng được duy trì trong một list đã sắp xếp (bisect)"""
+
+    def __init__(self, tie_breaks=DEFAULT_TIE_BREAKS):
+        unknown = [rule for rule in tie_breaks if rule not in TIE_BREAK_RULES]
+        if unknown:
+            raise ValueError(f"Luật tie-break không hợp lệ: {', '.join(unknown)}")
+        # Luôn kết thúc bằng tên để thứ tự ổn định
+        self.tie_breaks = tuple(tie_breaks) if 'name' in tie_breaks else tuple(tie_breaks) + ('name',)
+        self.players = {}
+        self.current_round = None
+        self._order = []  # [(sort_key, name)] tăng dần = hạng cao trước
+
+    def _sort_key(self, player):
+        key = []
+        for rule in self.tie_breaks:
+            if rule == 'total':
+                key.append(-player.total)
+            elif rule == 'best_round':
+                key.append(-(player.best or 0))
+            elif rule == 'latest_score':
+                key.append(-player.latest)
+            elif rule == 'rounds_played':
+                key.append(-len(player.rounds))
+            elif rule == 'name':
+                key.append(player.name.casefold())
+        return tuple(key)
+
+    def add_score(self, name, round_no, points):
+        """Thêm điểm của player trong một round và cập nhật thứ hạng"""
+        name = name.strip()
+        if not name:
+            raise ValueError("Tên player không được để trống")
+        player = self.players.get(name)
+        if player is None:
+            player = self.players[name] = PlayerScore(name)
+        else:
+            # Gỡ vị trí cũ khỏi list đã sắp xếp
+            entry = (self._sort_key(player), name)
+            index = bisect_left(self._order, entry)
+            del self._order[index]
+
+        player.set_score(round_no, points)
+        insort(self._order, (self._sort_key(player), name))
+
+        if self.current_round is None or round_no > self.current_round:
+            self.current_round = round_no
+
+    def load_csv(self, path):
+        """Đọc file CSV các dòng player,round,score. Trả về số dòng đã nhập.
+
+        Chỉ dòng đầu tiên của file được bỏ qua khi không đọc được (dòng tiêu đề); dòng trống
+        bị bỏ qua, mọi dòng sai khác raise ValueError và không nhập dòng nào.
+        """
+        rows = []
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            for row in reader:
+                if not any(cell.strip() for cell in row):
+                    continue
+                try:
+                    if len(row) < 3 or not row[0].strip():
+                        raise ValueError
+                    round_no = int(row[1])
+                    points = float(row[2])
+                except ValueError:
+                    if reader.line_num == 1:
+                        continue  # Dòng tiêu đề
+                    raise ValueError(f"Dòng {reader.line_num} không hợp lệ: {','.join(row)}")
+                rows.append((row[0], round_no, int(points) if points.is_integer() else points))
+        for name, round_no, points in rows:
+            self.add_score(name, round_no, points)
+        return len(rows)
+
+    def standings(self, limit=None):
+        """Danh sách (hạng, tên, tổng điểm) theo thứ tự"""
+        order = self._order if limit is None else self._order[:limit]
+        return [(index + 1, name, self.players[name].total) for index, (key, name) in enumerate(order)]
+
+    def ranking_payload(self, with_totals=False):
+        """Dữ liệu cho ranking overlay: round hiện tại và top 10"""
+        payload = {'round': '' if self.current_round is None else str(self.current_round)}
+        for rank in RANK_KEYS:
+            payload[rank] = ''
+        for (position, name, total), rank in zip(self.standings(len(RANK_KEYS)), RANK_KEYS):
+            payload[rank] = f"{name} ({total})" if with_totals else name
+        return payload
+
+    def final_payload(self):
+        """Dữ liệu cho final results: top 5"""
+        payload = {key: '' for key in FINAL_KEYS}
+        for (position, name, total), key in zip(self.standings(len(FINAL_KEYS)), FINAL_KEYS):
+            payload[key] = name
+        return payload
@@ -3,19 +3,545 @@ ScoShow - Tournament Ranking Display
 Ứng dụng hiển thị bảng xếp hạng tournament trên màn hình mở rộng với điều khiển từ màn hình chính
 """
 
+import time
+_IMPORT_T0 = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
+import sys
 import json
-from PIL import Image, ImageTk, ImageDraw, ImageFont
+import math
+import unicodedata
+import importlib
+import importlib.util
 import threading
-import time
-from screeninfo import get_monitors
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from journal import EventJournal
+from round_history import RoundHistory
+from scoring import ScoreBoard
+from media_playlist import DEFAULT_SLIDE_SECONDS, load_playlist, prepare_media
+from memory_stats import format_mb, rss_bytes, tk_image_count
+from font_index import resolve_font
+from bulk_entry import parse_bulk_entry
+from config_store import (CONFIG_VERSION, ConfigError, atomic_write_text,
+                          serialize_config, read_config, quarantine)
+
+class _LazyModule:
+    """Module được import trễ - chỉ thực sự import khi truy cập thuộc tính lần đầu.
+
+    Không dùng importlib.util.LazyLoader: trên Python 3.11 hai thread cùng chạm vào
+    module lazy lần đầu (worker render + thread warm-up) có thể thấy module chưa load
+    xong (AttributeError). Ở đây import đi qua importlib.import_module, vốn đã có
+    lock import riêng cho từng module, nên mọi thread đều nhận module đầy đủ.
+    """
+    
+    def __init__(self, name):
+        self._name = name
+        
+    def __getattr__(self, attr):
+        module = importlib.import_module(self._name)
+        # Lần sau tra thẳng trong module thật, không qua __getattr__
+        self.__dict__.update((key, value) for key, value in vars(module).items() if key != '_name')
+        return getattr(module, attr)
+        
+    def __repr__(self):
+        return f"<lazy module {self._name!r}>"
+
+def _lazy_module(name):
+    """Module name nếu đã import, nếu không thì proxy import trễ (an toàn khi dùng từ nhiều thread)"""
+    return sys.modules.get(name) or _LazyModule(name)
+
+# PIL được load trễ để cửa sổ điều khiển hiện lên nhanh hơn
+Image = _lazy_module("PIL.Image")
+ImageTk = _lazy_module("PIL.ImageTk")
+ImageDraw = _lazy_module("PIL.ImageDraw")
+ImageFont = _lazy_module("PIL.ImageFont")
+ImageColor = _lazy_module("PIL.ImageColor")
+
+# NumPy (tùy chọn) cho đường compositing nhanh - cũng được load trễ
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+np = _lazy_module("numpy") if HAS_NUMPY else None
+
+_monitors_cache = None
+
+def get_monitors(refresh=False):
+    """Liệt kê màn hình (screeninfo load trễ), cache kết quả cho tới khi refresh=True"""
+    global _monitors_cache
+    if _monitors_cache is None or refresh:
+        from screeninfo import get_monitors as _get_monitors
+        _monitors_cache = _get_monitors()
+    return _monitors_cache
+
+# Thời gian chờ sau thay đổi cuối cùng trước khi autosave config (ms)
+AUTOSAVE_DELAY_MS = 1000
+
+# Kích thước display khi cửa sổ chưa map / khi chỉ có display node từ xa
+DEFAULT_WINDOW_SIZE = (1920, 1080)
+
+# Số frame đã render (PhotoImage) được giữ lại để chuyển qua lại tức thì
+RENDER_CACHE_SIZE = 8
+
+# Chu kỳ cập nhật đồng hồ bộ nhớ trên display (ms)
+MEMORY_GAUGE_MS = 1000
+
+# Live preview trong panel điều khiển: chiều rộng, debounce và chu kỳ kiểm tra worker (ms)
+PREVIEW_WIDTH = 760
+PREVIEW_DELAY_MS = 150
+PREVIEW_POLL_MS = 15
+
+# Layout editor: chiều rộng canvas, lưới snap mặc định (pixel ảnh gốc)
+# và khoảng cách hút vào đường gióng của vị trí khác (pixel màn hình)
+LAYOUT_EDITOR_WIDTH = 1280
+LAYOUT_GRID_SIZE = 10
+GUIDE_SNAP_PX = 6
+
+# Chu kỳ fsync journal sự kiện (ms)
+JOURNAL_SYNC_MS = 500
+
+# Ticker bảng xếp hạng trên background 00
+TICKER_FPS = 60
+TICKER_SPEED = 120  # pixel / giây
+TICKER_HEIGHT_RATIO = 0.07  # chiều cao dải ticker so với ảnh hiển thị
+TICKER_BACKGROUND = '#101820'
+TICKER_SEPARATOR = "     •     "
+# Giới hạn nội dung ticker: số người đầu bảng và chiều rộng dải đã render (pixel).
+# PhotoImage trên X11 không được rộng quá 32767 px; dải gồm tối đa 2 chu kỳ + chiều rộng màn hình
+TICKER_MAX_ENTRIES = 50
+TICKER_MAX_STRIP_WIDTH = 16384
+
+# Đồng hồ đếm ngược: các ký tự có sprite dựng sẵn
+COUNTDOWN_CHARS = "0123456789:"
+
+# Nhiều tournament trong một process: số worker render dùng chung cho mọi session
+SESSION_RENDER_WORKERS = 2
+
+# Ngân sách thời gian import scoshow (ms) - được kiểm tra bởi bench_startup.py
+IMPORT_TIME_BUDGET_MS = 150
+
+# Cỡ chữ nhỏ nhất khi tự co tên cho vừa ô
+MIN_FIT_FONT_SIZE = 12
+ELLIPSIS = "…"
+
+def session_file(filename, session=None):
+    """Tên file riêng của session: scoshow_config.json -> scoshow_config.<session>.json"""
+    if not session:
+        return filename
+    base, ext = os.path.splitext(filename)
+    return f"{base}.{session}{ext}"
+
+def valid_session_name(name):
+    """Tên session dùng được trong tên file (chữ, số, - và _)"""
+    return bool(name) and all(c.isalnum() or c in "-_" for c in name)
+
+def parse_position(text):
+    """Parse chuỗi "x,y" hoặc "x,y,w,h" thành (x, y, box); box = None nếu không giới hạn"""
+    parts = [p.strip() for p in text.split(',')]
+    if len(parts) not in (2, 3, 4):
+        raise ValueError(f"Vị trí không hợp lệ: {text!r}")
+    x, y = int(parts[0]), int(parts[1])
+    # w hoặc h bằng 0 (hoặc bỏ trống) nghĩa là không giới hạn chiều đó
+    max_w = int(parts[2]) if len(parts) > 2 and parts[2] else 0
+    max_h = int(parts[3]) if len(parts) > 3 and parts[3] else 0
+    box = (max_w, max_h) if (max_w or max_h) else None
+    return x, y, box
+
+@lru_cache(maxsize=256)
+def load_font(font_name, size):
+    """Tải font theo tên file / family (có cache), tra qua font index - fallback sang font đi kèm"""
+    try:
+        return ImageFont.truetype(resolve_font(font_name), size, layout_engine=text_layout())
+    except OSError:
+        return ImageFont.load_default()
+
+BACKGROUND_FILES = ["00.jpg", "01.png", "02.png"]
+
+# Thứ tự công bố kết quả cuối: từ hạng 5 lên hạng 1
+REVEAL_ORDER = ['fifth', 'fourth', 'third', 'second', 'winner']
+
+def reveal_stages(overlay_data):
+    """Các overlay_data tích lũy khi công bố lần lượt fifth -> winner (stage 0 = chưa công bố ai)"""
+    keys = [key for key in REVEAL_ORDER if overlay_data.get(key)]
+    stages = []
+    for count in range(len(keys) + 1):
+        stage = dict(overlay_data)
+        for key in keys[count:]:
+            stage[key] = ''
+        stages.append(stage)
+    return stages
+
+@lru_cache(maxsize=8)
+def _load_background_cached(path, mtime):
+    image = Image.open(path)
+    image.load()
+    return image
+
+def load_background(path):
+    """Giải mã ảnh nền (có cache theo path + mtime). Không sửa trực tiếp ảnh trả về"""
+    return _load_background_cached(path, os.path.getmtime(path))
+
+@lru_cache(maxsize=8)
+def _load_scaled_background_cached(path, mtime, scale):
+    image = _load_background_cached(path, mtime)
+    size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    return image.resize(size, Image.Resampling.LANCZOS)
+
+def load_scaled_background(path, scale):
+    """Ảnh nền đã thu nhỏ theo scale (có cache) - dùng cho preview / render độ phân giải thấp"""
+    if scale == 1:
+        return load_background(path)
+    return _load_scaled_background_cached(path, os.path.getmtime(path), scale)
+
+@lru_cache(maxsize=6)
+def _display_background_cached(path, mtime, size):
+    """Ảnh nền đã thu nhỏ về kích thước hiển thị, dạng mảng uint8 HxWx3 (chỉ đọc)"""
+    image = load_background(path).convert('RGB').resize(size, Image.Resampling.LANCZOS)
+    return np.asarray(image)
+
+@lru_cache(maxsize=1)
+def text_layout():
+    """Layout engine cho text: RAQM (shaping đầy đủ: dấu kết hợp, Thai, RTL...) nếu Pillow có, nếu không BASIC"""
+    from PIL import features
+    return ImageFont.Layout.RAQM if features.check('raqm') else ImageFont.Layout.BASIC
+
+@lru_cache(maxsize=512)
+def shaped_run(text, font_name, size):
+    """Shape + rasterize một đoạn text một lần (cache theo text, font, size).
+
+    Trả về (left, top, mask 'L') - vẽ bằng cách paste màu qua mask tại (x + left, y + top).
+    Không sửa trực tiếp mask trả về.
+    """
+    font = load_font(font_name, size)
+    left, top, right, bottom = font.getbbox(text)
+    mask = Image.new('L', (max(1, right - left), max(1, bottom - top)), 0)
+    ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font)
+    return left, top, mask
+
+@lru_cache(maxsize=512)
+def text_sprite(text, font_name, size):
+    """Mask alpha (NumPy uint8) của đoạn text đã shape. Trả về (left, top, alpha)"""
+    left, top, mask = shaped_run(text, font_name, size)
+    return left, top, np.asarray(mask)
+
+def ticker_text(standings):
+    """Text ticker từ danh sách (hạng, tên, điểm) hoặc (hạng, tên, None)"""
+    parts = []
+    for position, name, total in standings:
+        parts.append(f"{position}. {name}" if total is None else f"{position}. {name} ({total})")
+    return TICKER_SEPARATOR.join(parts)
+
+def fit_ticker_unit(text, font, budget):
+    """text + separator, bỏ bớt các mục cuối (cắt bằng "…" nếu chỉ còn một mục) để dài không quá budget px"""
+    unit = text + TICKER_SEPARATOR
+    if font.getlength(unit) <= budget:
+        return unit
+    parts = text.split(TICKER_SEPARATOR)
+    width = font.getlength(TICKER_SEPARATOR)
+    kept = []
+    for part in parts:
+        part_width = font.getlength(part + TICKER_SEPARATOR)
+        if kept and width + part_width > budget:
+            break
+        kept.append(part)
+        width += part_width
+    unit = TICKER_SEPARATOR.join(kept) + TICKER_SEPARATOR
+    while font.getlength(unit) > budget and len(unit) > len(TICKER_SEPARATOR) + 1:
+        # Một mục quá dài: cắt theo tỉ lệ chiều rộng rồi thêm dấu "…"
+        text = unit[:-len(TICKER_SEPARATOR)]
+        keep = max(0, int(len(text) * budget / font.getlength(unit)) - 2)
+        unit = text[:keep].rstrip() + ELLIPSIS + TICKER_SEPARATOR
+    return unit
+
+def render_ticker_strip(text, font_name, height, color, min_width):
+    """Render dải ticker một lần: text + separator lặp lại đủ dài để cuộn vòng liền mạch.
+
+    Chu kỳ được giới hạn để dải không rộng quá TICKER_MAX_STRIP_WIDTH (bảng điểm lớn
+    chỉ hiện các mục đầu vừa ngân sách). Trả về (ảnh RGB, chu kỳ) - dịch dải đi đúng
+    một chu kỳ thì trông y như cũ.
+    """
+    font = load_font(font_name, max(1, round(height * 0.6)))
+    unit = fit_ticker_unit(text, font, max(1, (TICKER_MAX_STRIP_WIDTH - min_width) // 2))
+    period = max(1, round(font.getlength(unit)))
+    copies = min_width // period + 2
+    strip = Image.new('RGB', (period * copies, height), TICKER_BACKGROUND)
+    draw = ImageDraw.Draw(strip)
+    for index in range(copies):
+        draw.text((index * period, height // 2), unit, fill=color, font=font, anchor='lm')
+    return strip, period
+
+def parse_duration(text):
+    """Đọc thời lượng "SS", "M:SS" hoặc "H:MM:SS" thành số giây. Raise ValueError nếu sai"""
+    parts = text.strip().split(':')
+    if not 1 <= len(parts) <= 3 or not all(part.strip().isdecimal() for part in parts):
+        raise ValueError(f"Thời lượng không hợp lệ: {text!r}")
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+def countdown_pattern(seconds):
+    """Định dạng cố định cho cả lượt đếm (số ô không đổi khi đếm từ 10:00 xuống 9:59)"""
+    if seconds >= 3600:
+        return "0" * len(str(seconds // 3600)) + ":00:00"
+    return "0" * len(str(seconds // 60)) + ":00"
+
+def format_clock(seconds, pattern):
+    """Định dạng số giây theo pattern của countdown_pattern"""
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if pattern.count(':') == 2:
+        return f"{hours:0{pattern.index(':')}d}:{minutes:02d}:{secs:02d}"
+    return f"{minutes + hours * 60:0{pattern.index(':')}d}:{secs:02d}"
+
+@lru_cache(maxsize=16)
+def digit_glyphs(font_name, size, color):
+    """Sprite RGBA cho các ký tự COUNTDOWN_CHARS; mọi chữ số cùng độ rộng để số không nhảy"""
+    font = load_font(font_name, size)
+    ascent, descent = font.getmetrics()
+    height = ascent + descent
+    digit_width = max(round(font.getlength(char)) for char in "0123456789")
+    glyphs = {}
+    for char in COUNTDOWN_CHARS:
+        width = digit_width if char.isdigit() else max(1, round(font.getlength(char)))
+        glyph = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+        ImageDraw.Draw(glyph).text((width / 2, 0), char, fill=color, font=font, anchor='ma')
+        glyphs[char] = glyph
+    return glyphs
+
+@lru_cache(maxsize=8192)
+def measure_text(text, font_name, size):
+    """Đo phần text vẽ ra tính từ điểm gốc (right, bottom) - có cache"""
+    left, top, right, bottom = load_font(font_name, size).getbbox(text)
+    return right, bottom
+
+def _text_fits(text, font_name, size, box):
+    width, height = measure_text(text, font_name, size)
+    max_w, max_h = box
+    return (not max_w or width <= max_w) and (not max_h or height <= max_h)
+
+@lru_cache(maxsize=2048)
+def fit_text(text, font_name, size, box):
+    """Chọn cỡ chữ lớn nhất (<= size) để text vừa box (max_w, max_h).
+
+    Kích thước text gần như tỉ lệ thuận với cỡ chữ: đo một lần ở cỡ gốc, ước lượng
+    cỡ vừa ô rồi chỉnh từng bước (thường 1-2 lần đo, mỗi cỡ thử là một lần load font).
+    Nếu đến MIN_FIT_FONT_SIZE vẫn không vừa thì cắt bớt text và thêm dấu "…".
+    Trả về (text, size).
+    """
+    if not box or _text_fits(text, font_name, size, box):
+        return text, size
+
+    min_size = min(MIN_FIT_FONT_SIZE, size)
+    width, height = measure_text(text, font_name, size)
+    max_w, max_h = box
+    scale = min(max_w / width if max_w and width else 1, max_h / height if max_h and height else 1)
+    guess = max(min_size, min(size - 1, int(size * scale)))
+
+    # Chỉnh ước lượng: lên khi cỡ kế tiếp vẫn vừa, xuống khi chưa vừa
+    if _text_fits(text, font_name, guess, box):
+        while guess + 1 < size and _text_fits(text, font_name, guess + 1, box):
+            guess += 1
+        return text, guess
+    while guess > min_size:
+        guess -= 1
+        if _text_fits(text, font_name, guess, box):
+            return text, guess
+
+    # Vẫn không vừa ở cỡ nhỏ nhất: tìm nhị phân độ dài text cắt bớt (cùng một font, chỉ đo lại)
+    size = min_size
+    lo, hi = 0, len(text) - 1
+    best_text = ELLIPSIS
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        candidate = text[:mid].rstrip() + ELLIPSIS
+        if _text_fits(candidate, font_name, size, box):
+            best_text = candidate
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return best_text, size
+
+class SceneRenderer:
+    """Render scene (ảnh nền + text overlay) bằng PIL - không cần Tk"""
+    
+    def __init__(self):
+        self.background_paths = {}  # {00: path, 01: path, 02: path}
+        
+    def load_background_folder(self, folder_path):
+        """Tải thư mục chứa ảnh nền"""
+        found_files = {}
+        
+        for filename in BACKGROUND_FILES:
+            full_path = os.path.join(folder_path, filename)
+            if os.path.exists(full_path):
+                # Lấy ID từ tên file (00, 01, 02)
+                bg_id = filename.split('.')[0]
+                found_files[bg_id] = full_path
+                
+        if len(found_files) >= 3:
+            self.background_paths = found_files
+            return True
+        return False
+        
+    def render(self, bg_id, overlay_data=None, scale=1):
+        """Render scene ở độ phân giải gốc * scale. Trả về ảnh PIL mới"""
+        background_path = self.background_paths[bg_id]
+        image = load_scaled_background(background_path, scale).copy()
+        
+        # Thêm text overlay nếu có
+        if overlay_data:
+            self.add_text_overlay(image, bg_id, overlay_data, scale)
+        return image
+        
+    def add_text_overlay(self, image, bg_id, overlay_data, scale=1):
+        """Thêm text overlay lên ảnh"""
+        for key, xy, text, font_name, font_size, color in self.text_items(bg_id, overlay_data, scale):
+            # Đoạn text đã shape được cache: mỗi tên chỉ shape / rasterize một lần
+            left, top, mask = shaped_run(text, font_name, font_size)
+            x, y = xy[0] + left, xy[1] + top
+            image.paste(ImageColor.getcolor(color, image.mode), (x, y, x + mask.width, y + mask.height), mask)
+            
+    def text_items(self, bg_id, overlay_data, scale=1):
+        """Danh sách text cần vẽ (key, xy, text, font_name, font_size, color) ở tọa độ ảnh gốc * scale"""
+        if bg_id == "01":  # Background cập nhật thứ hạng
+            items = self.ranking_items(overlay_data)
+        elif bg_id == "02":  # Background kết quả cuối
+            items = self.final_items(overlay_data)
+        else:
+            return []
+        return [self.fit_item(*item, scale=scale) for item in items]
+            
+    def ranking_items(self, data):
+        """Text ranking cho background 01"""
+        # Lấy font settings
+        font_settings = data.get('font_settings', {})
+        font_name = font_settings.get('font_name', 'arial.ttf')
+        rank_font_size = font_settings.get('rank_font_size', 60)
+        round_font_size = font_settings.get('round_font_size', 60)
+        color = font_settings.get('color', 'white')
+        
+        # Lấy vị trí và ô giới hạn (nếu có) từ data
+        positions = data.get('positions', {})
+        boxes = data.get('boxes', {})
+        items = []
+        
+        # Số round
+        if 'round' in data and data['round'] and 'round' in positions:
+            items.append(('round', positions['round'], str(data['round']), font_name,
+                          round_font_size, boxes.get('round'), color))
+            
+        # Tên players cho các rank
+        for rank in ['1st', '2nd', '3rd', '4th', '5th', '6th', '7th', '8th', '9th', '10th']:
+            if rank in data and data[rank] and rank in positions and positions[rank]:
+                items.append((rank, positions[rank], data[rank], font_name,
+                              rank_font_size, boxes.get(rank), color))
+        return items
+                
+    def final_items(self, data):
+        """Text kết quả cuối cho background 02"""
+        # Lấy font settings
+        font_settings = data.get('font_settings', {})
+        font_name = font_settings.get('font_name', 'arial.ttf')
+        font_size = font_settings.get('font_size', 60)
+        color = font_settings.get('color', 'white')
+        
+        # Lấy vị trí và ô giới hạn (nếu có) từ data
+        positions = data.get('positions', {})
+        boxes = data.get('boxes', {})
+        items = []
+        
+        # Kết quả cuối
+        for key in ['winner', 'second', 'third', 'fourth', 'fifth']:
+            if key in data and data[key] and key in positions and positions[key]:
+                items.append((key, positions[key], data[key], font_name, font_size, boxes.get(key), color))
+        return items
+                
+    def fit_item(self, key, xy, text, font_name, font_size, box, color, scale=1):
+        """Tự co cỡ chữ / cắt bớt text cho vừa box (nếu có) rồi quy đổi theo scale"""
+        # Dạng dựng sẵn (NFC): tên dán từ macOS / web thường ở dạng dấu rời (NFD) mà layout
+        # BASIC không ghép được; cũng để cùng một tên luôn trúng cùng một mục cache
+        text = unicodedata.normalize('NFC', str(text))
+        if box:
+            text, font_size = fit_text(text, font_name, font_size, tuple(box))
+        x, y = xy
+        if scale != 1:
+            # Vẽ trực tiếp ở độ phân giải thấp: thu nhỏ tọa độ và cỡ chữ
+            x, y = round(x * scale), round(y * scale)
+            font_size = max(1, round(font_size * scale))
+        return key, (x, y), text, font_name, font_size, color
+                
+
+class NumpyCompositor:
+    """Compositing bằng NumPy ở độ phân giải màn hình.
+
+    Ảnh nền được giữ sẵn dưới dạng mảng uint8 đã thu nhỏ, text là sprite alpha
+    có cache được blend vào một buffer dùng lại. Ảnh trả về dùng chung bộ nhớ
+    với buffer nên chỉ hợp lệ tới lần compose tiếp theo.
+    """
+    
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.buffer = None
+        
+    def display_size(self, background, window_size):
+        """Kích thước vừa cửa sổ, giữ tỷ lệ và không phóng to (như Image.thumbnail)"""
+        scale = min(window_size[0] / background.width, window_size[1] / background.height, 1)
+        return max(1, round(background.width * scale)), max(1, round(background.height * scale))
+        
+    def background_array(self, path, size):
+        """Mảng ảnh nền ở kích thước hiển thị (cache chung cho mọi display / session)"""
+        return _display_background_cached(path, os.path.getmtime(path), size)
+        
+    def compose(self, bg_id, overlay_data, window_size):
+        """Ghép ảnh nền + text vào buffer dùng lại và trả về ảnh PIL trỏ vào buffer (không copy)"""
+        path = self.renderer.background_paths[bg_id]
+        background = load_background(path)
+        size = self.display_size(background, window_size)
+        array = self.background_array(path, size)
+        
+        if self.buffer is None or self.buffer.shape != array.shape:
+            self.buffer = np.empty_like(array)
+        np.copyto(self.buffer, array)
+        
+        if overlay_data:
+            scale = size[0] / background.width
+            for key, xy, text, font_name, font_size, color in self.renderer.text_items(bg_id, overlay_data, scale):
+                self.blend(text_sprite(text, font_name, font_size), xy, ImageColor.getrgb(color)[:3])
+                
+        return Image.frombuffer('RGB', size, self.buffer, 'raw', 'RGB', 0, 1)
+        
+    def blend(self, sprite, xy, rgb):
+        """Alpha-blend một sprite màu rgb vào buffer tại xy (cắt phần nằm ngoài)"""
+        left, top, alpha = sprite
+        height, width = self.buffer.shape[:2]
+        x0, y0 = xy[0] + left, xy[1] + top
+        bx0, by0 = max(x0, 0), max(y0, 0)
+        bx1, by1 = min(x0 + alpha.shape[1], width), min(y0 + alpha.shape[0], height)
+        if bx0 >= bx1 or by0 >= by1:
+            return
+        a = alpha[by0 - y0:by1 - y0, bx0 - x0:bx1 - x0, None].astype(np.uint16)
+        region = self.buffer[by0:by1, bx0:bx1]
+        region[...] = (region * (255 - a) + np.array(rgb, dtype=np.uint16) * a + 127) // 255
+        
+def render_window_frame(renderer, bg_id, overlay_data, window_size, compositor=None):
+    """Render scene vừa window_size thành ảnh PIL: NumpyCompositor nếu có, không thì PIL rồi thu nhỏ"""
+    if compositor:
+        return compositor.compose(bg_id, overlay_data, window_size)
+        
+    # Ảnh nền + text overlay ở độ phân giải gốc
+    image = renderer.render(bg_id, overlay_data)
+    
+    # Resize ảnh để fit màn hình
+    image.thumbnail(window_size, Image.Resampling.LANCZOS)
+    return image
 
 class TournamentDisplayWindow:
     """Cửa sổ hiển thị tournament trên màn hình mở rộng"""
     
-    def __init__(self, monitor_index=1):
+    def __init__(self, monitor_index=1, reuse_buffers=False):
         self.root = tk.Toplevel()
         self.root.title("ScoShow - Tournament Display")
         self.root.configure(bg='black')
@@ -29,12 +555,37 @@ class TournamentDisplayWindow:
         
         # Ảnh nền hiện tại
         self.current_background = None
-        self.background_paths = {}  # {00: path, 01: path, 02: path}
+        self.renderer = SceneRenderer()
+        
+        # Có NumPy thì dùng đường compositing nhanh ở độ phân giải màn hình
+        self.compositor = NumpyCompositor(self.renderer) if HAS_NUMPY else None
         
         # Font cho text overlay
         self.font_size = 60
         self.font_color = "white"
         
+        # Cache LRU các frame đã render: (bg_id, overlay_data, kích thước) -> PhotoImage
+        self.render_cache = OrderedDict()
+        
+        # Chế độ buffer dùng lại: paste vào 2 PhotoImage cố định (trước / sau) thay vì
+        # tạo PhotoImage mới cho mỗi cập nhật - bộ nhớ ổn định, đổi lại không có cache
+        self.reuse_buffers = reuse_buffers
+        self.frame_buffers = []
+        self.front_buffer = 0
+        
+        # Đồng hồ bộ nhớ (RSS / số ảnh Tk) ở góc dưới trái
+        self.gauge_label = None
+        self._gauge_job = None
+        
+        # Ticker bảng xếp hạng trên background 00 (TickerLayer, gắn bởi panel)
+        self.ticker = None
+        
+        # Đồng hồ đếm ngược trên mọi scene (CountdownOverlay, gắn bởi panel)
+        self.countdown = None
+        
+        # Playlist slide tài trợ trên background 00 (PlaylistPlayer, gắn bởi panel)
+        self.playlist = None
+        
     def setup_monitor(self, monitor_index):
         """Thiết lập cửa sổ trên màn hình được chỉ định"""
         monitors = get_monitors()
@@ -49,22 +600,33 @@ class TournamentDisplayWindow:
         self.root.attributes('-fullscreen', True)
         self.root.bind('<Escape>', lambda e: self.root.attributes('-fullscreen', False))
         
+    @property
+    def background_paths(self):
+        return self.renderer.background_paths
+        
     def load_background_folder(self, folder_path):
         """Tải thư mục chứa ảnh nền"""
-        required_files = ["00.jpg", "01.png", "02.png"]
-        found_files = {}
+        return self.renderer.load_background_folder(folder_path)
         
-        for filename in required_files:
-            full_path = os.path.join(folder_path, filename)
-            if os.path.exists(full_path):
-                # Lấy ID từ tên file (00, 01, 02)
-                bg_id = filename.split('.')[0]
-                found_files[bg_id] = full_path
-                
-        if len(found_files) >= 3:
-            self.background_paths = found_files
-            return True
-        return False
+    def window_size(self):
+        """Kích thước cửa sổ hiển thị (mặc định DEFAULT_WINDOW_SIZE khi chưa map)"""
+        window_width = self.root.winfo_width()
+        window_height = self.root.winfo_height()
+        
+        if window_width <= 1 or window_height <= 1:
+            return DEFAULT_WINDOW_SIZE
+        return window_width, window_height
+        
+    def display_image_size(self, bg_id):
+        """Kích thước ảnh nền bg_id khi hiển thị vừa cửa sổ (giữ tỷ lệ, không phóng to)"""
+        window_width, window_height = self.window_size()
+        background = load_background(self.background_paths[bg_id])
+        scale = min(window_width / background.width, window_height / background.height, 1)
+        return max(1, round(background.width * scale)), max(1, round(background.height * scale))
+        
+    def render_frame(self, bg_id, overlay_data, window_size, compositor=None):
+        """Render scene vừa cửa sổ thành ảnh PIL (không tạo PhotoImage, chạy được trong worker)"""
+        return render_window_frame(self.renderer, bg_id, overlay_data, window_size, compositor or self.compositor)
         
     def show_background(self, bg_id, overlay_data=None):
         """Hiển thị ảnh nền với overlay text"""
@@ -72,124 +634,654 @@ class TournamentDisplayWindow:
             return False
             
         try:
-            # Mở ảnh nền
-            background_path = self.background_paths[bg_id]
-            image = Image.open(background_path).copy()
-            
-            # Thêm text overlay nếu có
-            if overlay_data:
-                self.add_text_overlay(image, bg_id, overlay_data)
-            
             # Lấy kích thước cửa sổ
-            window_width = self.root.winfo_width()
-            window_height = self.root.winfo_height()
-            
-            if window_width <= 1 or window_height <= 1:
-                window_width = 1920
-                window_height = 1080
-            
-            # Resize ảnh để fit màn hình
-            image.thumbnail((window_width, window_height), Image.Resampling.LANCZOS)
-            
-            # Chuyển đổi cho Tkinter
-            photo = ImageTk.PhotoImage(image)
-            
-            # Hiển thị ảnh
-            self.image_label.configure(image=photo)
-            self.image_label.image = photo  # Giữ tham chiếu
+            window_width, window_height = self.window_size()
+                
+            if self.reuse_buffers:
+                image = self.render_frame(bg_id, overlay_data, (window_width, window_height))
+                self.show_photo(self.buffer_photo(image), bg_id)
+                return True
+                
+            # Frame đã render trước đó (vd: gọi lại round cũ) thì hiển thị ngay
+            cache_key = (bg_id, json.dumps(overlay_data, sort_keys=True), window_width, window_height)
+            photo = self.render_cache.get(cache_key)
+            if photo is not None:
+                self.render_cache.move_to_end(cache_key)
+            else:
+                image = self.render_frame(bg_id, overlay_data, (window_width, window_height))
+                
+                # Chuyển đổi cho Tkinter
+                photo = ImageTk.PhotoImage(image)
+                self.render_cache[cache_key] = photo
+                if len(self.render_cache) > RENDER_CACHE_SIZE:
+                    self.render_cache.popitem(last=False)
             
-            self.current_background = bg_id
+            self.show_photo(photo, bg_id)
             return True
             
         except Exception as e:
             print(f"Lỗi khi hiển thị ảnh nền {bg_id}: {e}")
             return False
             
-    def add_text_overlay(self, image, bg_id, overlay_data):
-        """Thêm text overlay lên ảnh"""
-        draw = ImageDraw.Draw(image)
-        
-        if bg_id == "01":  # Background cập nhật thứ hạng
-            self.add_ranking_overlay(draw, overlay_data)
-        elif bg_id == "02":  # Background kết quả cuối
-            self.add_final_overlay(draw, overlay_data)
+    def buffer_photo(self, image):
+        """Paste frame vào buffer đang ẩn rồi đổi vai trò trước / sau (không tạo ảnh Tk mới)"""
+        if not self.frame_buffers or (self.frame_buffers[0].width(), self.frame_buffers[0].height()) != image.size:
+            # Lần đầu hoặc đổi kích thước cửa sổ: tạo lại cặp buffer
+            self.frame_buffers = [ImageTk.PhotoImage('RGB', image.size) for _ in range(2)]
+        self.front_buffer = 1 - self.front_buffer
+        photo = self.frame_buffers[self.front_buffer]
+        photo.paste(image)
+        return photo
+        
+    def set_reuse_buffers(self, enabled):
+        """Bật / tắt chế độ buffer dùng lại, giải phóng bộ nhớ của chế độ kia"""
+        self.reuse_buffers = enabled
+        if enabled:
+            self.render_cache.clear()
+        else:
+            self.frame_buffers = []  # Ảnh đang hiện vẫn được image_label giữ
             
-    def add_ranking_overlay(self, draw, data):
-        """Thêm text ranking cho background 01"""
-        # Lấy font settings
-        font_settings = data.get('font_settings', {})
-        font_name = font_settings.get('font_name', 'arial.ttf')
-        rank_font_size = font_settings.get('rank_font_size', 60)
-        round_font_size = font_settings.get('round_font_size', 60)
-        color = font_settings.get('color', 'white')
+    def show_memory_gauge(self, enabled):
+        """Hiện / ẩn đồng hồ bộ nhớ"""
+        if self._gauge_job is not None:
+            self.root.after_cancel(self._gauge_job)
+            self._gauge_job = None
+        if not enabled:
+            if self.gauge_label:
+                self.gauge_label.destroy()
+                self.gauge_label = None
+            return
+        if not self.gauge_label:
+            self.gauge_label = tk.Label(self.root, bg='black', fg='#7CFC00', font=('Consolas', 10),
+                                        justify=tk.LEFT)
+            self.gauge_label.place(x=8, rely=1.0, y=-8, anchor='sw')
+        self.update_memory_gauge()
+        
+    def memory_report(self):
+        """Số liệu bộ nhớ hiện tại của display (dict)"""
+        return {
+            'rss': rss_bytes(),
+            'tk_images': tk_image_count(self.root),
+            'cached_frames': len(self.render_cache),
+            'mode': 'reuse' if self.reuse_buffers else 'cache',
+        }
         
-        # Tạo font cho ranking và round
-        try:
-            rank_font = ImageFont.truetype(font_name, rank_font_size)
-        except:
-            try:
-                rank_font = ImageFont.truetype(f"C:/Windows/Fonts/{font_name}", rank_font_size)
-            except:
-                rank_font = ImageFont.load_default()
-                
+    def update_memory_gauge(self):
+        """Cập nhật đồng hồ bộ nhớ mỗi MEMORY_GAUGE_MS"""
+        report = self.memory_report()
+        self.gauge_label.configure(text=f"RSS {format_mb(report['rss'])}  |  Tk images {report['tk_images']}"
+                                        f"  |  cached frames {report['cached_frames']}  |  {report['mode']}")
+        self.gauge_label.lift()
+        self._gauge_job = self.root.after(MEMORY_GAUGE_MS, self.update_memory_gauge)
+        
+    def show_photo(self, photo, bg_id):
+        """Đổi sang PhotoImage đã render sẵn (không render lại)"""
+        self.image_label.configure(image=photo)
+        self.image_label.image = photo  # Giữ tham chiếu
+        self.current_background = bg_id
+        if self.ticker:
+            if bg_id == "00":
+                self.ticker.show()
+            else:
+                self.ticker.hide()
+        if self.countdown:
+            self.countdown.refresh()
+        if self.playlist and bg_id != "00":
+            # Chuyển sang ranking / final: dừng playlist ngay, bỏ frame đã chuẩn bị
+            self.playlist.stop()
+            
+    def close(self):
+        """Đóng cửa sổ hiển thị"""
+        # Dừng các vòng root.after trước khi widget bị hủy
+        if self.playlist:
+            self.playlist.stop()
+        if self.ticker:
+            self.ticker.close()
+        if self.countdown:
+            self.countdown.stop()
+        if self._gauge_job is not None:
+            self.root.after_cancel(self._gauge_job)
+            self._gauge_job = None
+        self.root.destroy()
+
+class TickerLayer:
+    """Dải ticker cuộn ở đáy background 00.
+
+    Text được render sẵn thành một dải dài (trong worker); mỗi tick chỉ dời
+    item ảnh trên canvas, vị trí tính theo thời gian thực nên không bị trôi.
+    """
+    
+    def __init__(self, display_window, render_pool):
+        self.display = display_window
+        self.render_pool = render_pool
+        self.canvas = tk.Canvas(display_window.root, bg=TICKER_BACKGROUND, highlightthickness=0)
+        self.item = self.canvas.create_image(0, 0, anchor='nw')
+        self.photo = None
+        self.period = 1
+        self.text = None
+        self.style = None
+        self.height = 0
+        self.width = 0
+        self._pending = None  # (text, style) đang chờ render
+        self._future = None
+        self._tick_job = None
+        self._poll_job = None
+        self._t0 = 0
+        self._next_tick = 0
+        
+    def layout(self):
+        """Đặt dải ticker ở đáy ảnh đang hiển thị (ảnh được căn giữa cửa sổ)"""
+        window_width, window_height = self.display.window_size()
+        width, height = self.display.display_image_size("00")
+        self.height = max(1, round(height * TICKER_HEIGHT_RATIO))
+        self.width = width
+        self.canvas.place(x=(window_width - width) // 2, y=(window_height + height) // 2 - self.height,
+                          width=width, height=self.height)
+        
+    def set_text(self, text, font_name, color):
+        """Cập nhật nội dung - chỉ render lại dải khi text / font thực sự đổi"""
+        style = (font_name, color)
+        if (text, style) == (self.text, self.style) or (text, style) == self._pending:
+            return
+        self._pending = (text, style)
+        if self._future is None and self.height:
+            self.rebuild()
+            
+    def rebuild(self):
+        """Gửi việc render dải ticker mới cho worker"""
+        text, (font_name, color) = self._pending
+        self._pending = None
+        self._future = self.render_pool.submit(render_ticker_strip, text, font_name, self.height,
+                                               color, self.width)
+        self._future.request = (text, (font_name, color), self.height)
+        self._poll_job = self.display.root.after(PREVIEW_POLL_MS, self.poll_rebuild)
+        
+    def poll_rebuild(self):
+        """Nhận dải đã render và đổi ảnh của item (giữ nguyên vị trí cuộn)"""
+        future = self._future
+        if not future.done():
+            self._poll_job = self.display.root.after(PREVIEW_POLL_MS, self.poll_rebuild)
+            return
+        self._poll_job = None
+        self._future = None
         try:
-            round_font = ImageFont.truetype(font_name, round_font_size)
-        except:
-            try:
-                round_font = ImageFont.truetype(f"C:/Windows/Fonts/{font_name}", round_font_size)
-            except:
-                round_font = ImageFont.load_default()
-        
-        # Lấy vị trí từ data
-        positions = data.get('positions', {})
+            strip, period = future.result()
+            self.photo = ImageTk.PhotoImage(strip)
+            self.canvas.itemconfigure(self.item, image=self.photo)
+            self.text, self.style, height = future.request
+            self.period = period
+            if height != self.height:
+                self._pending = self._pending or (self.text, self.style)
+        except Exception as e:
+            print(f"Lỗi khi render ticker: {e}")
+        if self._pending and self.height:
+            self.rebuild()
+            
+    def show(self):
+        """Hiện ticker và bắt đầu cuộn"""
+        height = self.height
+        self.layout()
+        if height != self.height and self.text is not None:
+            # Kích thước đổi: render lại dải ở chiều cao mới
+            self._pending = self._pending or (self.text, self.style)
+        if self._pending and self._future is None:
+            self.rebuild()
+        self.canvas.lift()
+        if self._tick_job is None:
+            self._t0 = self._next_tick = time.perf_counter()
+            self.tick()
+            
+    def hide(self):
+        """Ẩn ticker và dừng vòng lặp tick"""
+        if self._tick_job is not None:
+            self.display.root.after_cancel(self._tick_job)
+            self._tick_job = None
+        self.canvas.place_forget()
         
-        # Vẽ số round
-        if 'round' in data and data['round'] and 'round' in positions:
-            x, y = positions['round']
-            draw.text((x, y), str(data['round']), fill=color, font=round_font)
+    def close(self):
+        """Dừng tick và bỏ việc render dải đang chờ (trước khi cửa sổ display bị hủy)"""
+        self.hide()
+        if self._poll_job is not None:
+            self.display.root.after_cancel(self._poll_job)
+            self._poll_job = None
+        
+    def tick(self):
+        """Dời dải theo thời gian đã trôi qua, hẹn tick sau theo mốc lý tưởng (bù drift)"""
+        now = time.perf_counter()
+        offset = ((now - self._t0) * TICKER_SPEED) % self.period
+        self.canvas.coords(self.item, -round(offset), 0)
+        
+        frame = 1 / TICKER_FPS
+        self._next_tick += frame
+        if self._next_tick < now:
+            # Trễ quá một frame (máy bận): bỏ qua frame lỡ thay vì chạy dồn
+            self._next_tick = now + frame
+        self._tick_job = self.display.root.after(max(1, round((self._next_tick - now) * 1000)), self.tick)
+        
+    def destroy(self):
+        """Dừng và gỡ ticker khỏi display"""
+        self.hide()
+        self.canvas.destroy()
+
+class CountdownOverlay:
+    """Đồng hồ đếm ngược / giờ hiện tại đặt trên mọi scene của display.
+
+    Vùng chữ số là một PhotoImage nhỏ: nền được copy từ frame đang hiển thị,
+    mỗi lần đổi giây chỉ các ô chữ số thay đổi được khôi phục nền và ghép
+    sprite dựng sẵn (Tk photo copy), không đi qua show_background. Giá trị
+    và lịch tick tính từ mốc thời gian tuyệt đối nên không bị trôi.
+    """
+    
+    def __init__(self, display_window):
+        self.display = display_window
+        self.label = tk.Label(display_window.root, bd=0, highlightthickness=0, bg='black')
+        self.mode = None  # 'countdown' | 'clock'
+        self.end_time = 0
+        self.pattern = "00:00:00"
+        self.position = (0, 0)
+        self.style = ('arial.ttf', 120, 'white')
+        self.region = None
+        self.backdrop = None
+        self.backdrop_box = None  # (x, y, right, bottom) trên frame đang hiển thị
+        self.glyph_photos = {}
+        self.glyph_key = None
+        self.slots = []  # [(x, width)] theo từng ký tự của pattern
+        self.shown = ''
+        self._job = None
+        
+    def start_countdown(self, end_time, seconds, position, style):
+        """Đếm ngược tới end_time (theo time.perf_counter); seconds là thời lượng ban đầu"""
+        self.mode = 'countdown'
+        self.end_time = end_time
+        self.pattern = countdown_pattern(seconds)
+        self.start(position, style)
+        
+    def start_clock(self, position, style):
+        """Hiện giờ hiện tại HH:MM:SS"""
+        self.mode = 'clock'
+        self.pattern = "00:00:00"
+        self.start(position, style)
+        
+    def start(self, position, style):
+        """Đặt vị trí / font, vẽ lại toàn bộ và bắt đầu vòng tick"""
+        self.position = position
+        self.style = style
+        self.cancel_tick()
+        self.refresh()
+        self.tick()
+        
+    def stop(self):
+        """Dừng và ẩn đồng hồ"""
+        self.mode = None
+        self.cancel_tick()
+        self.label.place_forget()
+        
+    def cancel_tick(self):
+        """Hủy tick đang hẹn"""
+        if self._job is not None:
+            self.display.root.after_cancel(self._job)
+            self._job = None
             
-        # Vẽ tên players cho các rank
-        for rank in ['1st', '2nd', '3rd', '4th', '5th', '6th', '7th', '8th', '9th', '10th']:
-            if rank in data and data[rank] and rank in positions and positions[rank]:
-                x, y = positions[rank]
-                draw.text((x, y), data[rank], fill=color, font=rank_font)
-                
-    def add_final_overlay(self, draw, data):
-        """Thêm text kết quả cuối cho background 02"""
-        # Lấy font settings
-        font_settings = data.get('font_settings', {})
-        font_name = font_settings.get('font_name', 'arial.ttf')
-        font_size = font_settings.get('font_size', 60)
-        color = font_settings.get('color', 'white')
+    def current_text(self):
+        """(text cần hiện, số giây tới lần đổi tiếp theo - None nếu đã hết giờ)"""
+        if self.mode == 'clock':
+            now = time.time()
+            return time.strftime("%H:%M:%S", time.localtime(now)), 1 - now % 1
+        remaining = self.end_time - time.perf_counter()
+        shown = max(0, math.ceil(remaining))
+        return format_clock(shown, self.pattern), (remaining - (shown - 1) if shown else None)
+        
+    def tick(self):
+        """Vẽ các ô đã đổi và hẹn tick đúng thời điểm đổi số tiếp theo"""
+        self._job = None
+        text, delay = self.current_text()
+        self.draw(text)
+        if delay is not None:
+            self._job = self.display.root.after(max(1, math.ceil(delay * 1000)), self.tick)
+            
+    def refresh(self):
+        """Scene / kích thước đổi: chụp lại nền vùng chữ số và vẽ lại toàn bộ"""
+        photo = getattr(self.display.image_label, 'image', None)
+        bg_id = self.display.current_background
+        if self.mode is None or photo is None or bg_id not in self.display.background_paths:
+            return
+        background = load_background(self.display.background_paths[bg_id])
+        scale = photo.width() / background.width
+        font_name, font_size, color = self.style
+        
+        key = (font_name, max(1, round(font_size * scale)), color)
+        if key != self.glyph_key:
+            self.glyph_photos = {char: ImageTk.PhotoImage(glyph) for char, glyph in digit_glyphs(*key).items()}
+            self.glyph_key = key
+            
+        self.slots = []
+        width = 0
+        for char in self.pattern:
+            glyph_width = self.glyph_photos['0' if char.isdigit() else char].width()
+            self.slots.append((width, glyph_width))
+            width += glyph_width
+        height = self.glyph_photos['0'].height()
+        
+        # Nền: copy vùng tương ứng của frame đang hiển thị (trong Tk, không qua PIL)
+        x, y = round(self.position[0] * scale), round(self.position[1] * scale)
+        self.backdrop = tk.PhotoImage(master=self.display.root, width=width, height=height)
+        self.backdrop_box = (x, y, min(x + width, photo.width()), min(y + height, photo.height()))
+        self.capture_backdrop(photo)
+        self.region = tk.PhotoImage(master=self.display.root, width=width, height=height)
+        self.label.configure(image=self.region)
+        
+        window_width, window_height = self.display.window_size()
+        self.label.place(x=(window_width - photo.width()) // 2 + x, y=(window_height - photo.height()) // 2 + y)
+        self.label.lift()
+        self.shown = ''
+        self.draw(self.current_text()[0])
+        
+    def capture_backdrop(self, photo):
+        """Copy vùng backdrop_box của frame đang hiển thị làm nền các ô chữ số"""
+        x, y, right, bottom = self.backdrop_box
+        if right > x and bottom > y:
+            self.backdrop.tk.call(self.backdrop, 'copy', photo, '-from', x, y, right, bottom)
+            
+    def update_backdrop(self):
+        """Nội dung frame đang hiển thị đổi nhưng cùng kích thước (vd frame clip): chụp lại nền, vẽ lại mọi ô"""
+        photo = getattr(self.display.image_label, 'image', None)
+        if self.mode is None or self.region is None or photo is None:
+            return
+        self.capture_backdrop(photo)
+        self.shown = ''
+        self.draw(self.current_text()[0])
         
-        # Tạo font
-        try:
-            font = ImageFont.truetype(font_name, font_size)
-        except:
+    def draw(self, text):
+        """Chỉ cập nhật các ô ký tự khác với lần vẽ trước"""
+        if self.region is None:
+            return
+        if len(text) != len(self.slots):
+            # Số ký tự đổi (vd giờ vượt quá số ô của pattern): dựng lại các ô và nền theo text mới
+            self.pattern = ''.join('0' if char.isdigit() else char for char in text)
+            self.refresh()
+            return
+        height = self.region.height()
+        for index, char in enumerate(text):
+            if index < len(self.shown) and self.shown[index] == char:
+                continue
+            x, width = self.slots[index]
+            self.region.tk.call(self.region, 'copy', self.backdrop, '-from', x, 0, x + width, height,
+                                '-to', x, 0, '-compositingrule', 'set')
+            self.region.tk.call(self.region, 'copy', self.glyph_photos[char], '-to', x, 0)
+        self.shown = text
+
+class PlaylistPlayer:
+    """Xoay vòng ảnh nền 00 và các slide / clip tài trợ trên màn hình chờ.
+
+    Item kế tiếp được giải mã và scale sẵn trong worker ngay khi item hiện tại
+    bắt đầu chiếu, nên bộ nhớ chỉ gồm item đang chiếu + item kế tiếp. Chuyển
+    sang scene 01/02 thì dừng ngay và bỏ mọi frame đã chuẩn bị. Ảnh nền 00
+    được hiện qua callback present (của panel: hiện trên display và phát tới
+    display node), mặc định display_window.show_background.
+    """
+    
+    def __init__(self, display_window, render_pool, items, seconds, key=None, present=None):
+        self.display = display_window
+        self.render_pool = render_pool
+        self.present = present or display_window.show_background
+        self.slots = [None] + list(items)  # None = ảnh nền 00
+        self.seconds = seconds
+        self.key = key
+        self.index = 0
+        self.running = False
+        self.current = None  # PreparedMedia đang chiếu
+        self.photo = None  # PhotoImage của item đang chiếu (clip dùng lại bằng paste)
+        self.frame_index = 0
+        self._next = None  # (index, future) item kế tiếp đang chuẩn bị
+        self._job = None
+        self._frame_job = None
+        
+    def start(self):
+        """Bắt đầu từ ảnh nền 00 (không làm gì nếu đang chạy)"""
+        if self.running:
+            return
+        self.running = True
+        self.index = 0
+        self.show(None)
+        
+    def stop(self):
+        """Dừng, hủy việc chuẩn bị đang chờ và giải phóng frame"""
+        self.running = False
+        for job in (self._job, self._frame_job):
+            if job is not None:
+                self.display.root.after_cancel(job)
+        self._job = self._frame_job = None
+        if self._next is not None:
+            self._next[1].cancel()
+            self._next = None
+        self.current = None
+        self.photo = None
+        
+    def prefetch(self, index):
+        """Gửi việc giải mã + scale slot index cho worker"""
+        size = self.display.display_image_size("00")
+        self._next = (index, self.render_pool.submit(prepare_media, self.slots[index], size))
+        
+    def show(self, media):
+        """Chiếu slot self.index (media None = ảnh nền 00), hẹn slot sau và prefetch item kế tiếp"""
+        if media is None:
+            self.current = self.photo = None
+            self.present("00")
+            seconds = self.seconds
+        else:
+            self.current = media
+            self.photo = ImageTk.PhotoImage(media.frames[0])
+            self.display.show_photo(self.photo, "00")
+            seconds = self.slots[self.index].seconds
+            if seconds is None:
+                seconds = sum(media.durations) / 1000 if media.is_clip else self.seconds
+            if media.is_clip:
+                self.frame_index = 0
+                self._frame_job = self.display.root.after(media.durations[0], self.next_frame)
+        self._job = self.display.root.after(max(1, round(seconds * 1000)), self.advance)
+        
+        following = (self.index + 1) % len(self.slots)
+        if self.slots[following] is not None and self._next is None:
+            self.prefetch(following)
+            
+    def next_frame(self):
+        """Frame tiếp theo của clip: paste vào PhotoImage đang hiện (không tạo ảnh Tk mới)"""
+        media = self.current
+        self.frame_index = (self.frame_index + 1) % len(media.frames)
+        self.photo.paste(media.frames[self.frame_index])
+        if self.display.countdown:
+            # Nền của đồng hồ là frame clip vừa đổi
+            self.display.countdown.update_backdrop()
+        self._frame_job = self.display.root.after(max(1, media.durations[self.frame_index]), self.next_frame)
+        
+    def advance(self):
+        """Hết thời lượng slot: chuyển sang slot kế tiếp (chờ worker nếu item chưa sẵn sàng)"""
+        self._job = None
+        next_index = (self.index + 1) % len(self.slots)
+        media = None
+        if self.slots[next_index] is not None:
+            if self._next is None:
+                self.prefetch(next_index)
+            future = self._next[1]
+            if not future.done():
+                self._job = self.display.root.after(PREVIEW_POLL_MS, self.advance)
+                return
+            self._next = None
             try:
-                font = ImageFont.truetype(f"C:/Windows/Fonts/{font_name}", font_size)
-            except:
-                font = ImageFont.load_default()
-        
-        # Lấy vị trí từ data
-        positions = data.get('positions', {})
+                media = future.result()
+            except Exception as e:
+                # Bỏ qua item lỗi; slot ảnh nền 00 luôn có nên không lặp vô hạn
+                print(f"Lỗi khi tải media {self.slots[next_index].path}: {e}")
+                self.index = next_index
+                self._job = self.display.root.after(0, self.advance)
+                return
+        if self._frame_job is not None:
+            self.display.root.after_cancel(self._frame_job)
+            self._frame_job = None
+        self.index = next_index
+        self.show(media)
+
+class LayoutEditor:
+    """Cửa sổ kéo-thả vị trí text trên ảnh nền thu nhỏ"""
+    
+    def __init__(self, panel):
+        self.panel = panel
+        self.root = tk.Toplevel(panel.root)
+        self.root.title("ScoShow - Layout Editor")
+        self.root.configure(bg='#ECF0F1')
         
-        # Vẽ kết quả cuối
-        for key in ['winner', 'second', 'third', 'fourth', 'fifth']:
-            if key in data and data[key] and key in positions and positions[key]:
-                x, y = positions[key]
-                draw.text((x, y), data[key], fill=color, font=font)
+        self.scene = tk.StringVar(value="01")
+        self.grid_size = tk.StringVar(value=str(LAYOUT_GRID_SIZE))
+        self.snap_guides = tk.BooleanVar(value=True)
+        
+        # Thanh công cụ
+        toolbar = ttk.Frame(self.root, padding="8")
+        toolbar.pack(fill=tk.X)
+        ttk.Radiobutton(toolbar, text="📊 01 Ranking", variable=self.scene, value="01").pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Radiobutton(toolbar, text="🏆 02 Final", variable=self.scene, value="02").pack(side=tk.LEFT, padx=(0, 15))
+        ttk.Label(toolbar, text="Grid:").pack(side=tk.LEFT)
+        ttk.Entry(toolbar, textvariable=self.grid_size, width=4).pack(side=tk.LEFT, padx=(5, 10))
+        ttk.Checkbutton(toolbar, text="Snap to guides", variable=self.snap_guides).pack(side=tk.LEFT, padx=(0, 15))
+        self.coord_label = ttk.Label(toolbar, text="Drag a marker to move it", font=('Arial', 9, 'bold'))
+        self.coord_label.pack(side=tk.LEFT)
+        
+        self.canvas = tk.Canvas(self.root, bg='black', highlightthickness=0)
+        self.canvas.pack(padx=8, pady=(0, 8))
+        self.canvas.tag_bind('anchor', '<ButtonPress-1>', self.on_press)
+        self.canvas.tag_bind('anchor', '<B1-Motion>', self.on_drag)
+        self.canvas.tag_bind('anchor', '<ButtonRelease-1>', self.on_release)
+        
+        self.scale = 1
+        self.positions = {}  # {key: [x, y]} theo pixel ảnh gốc
+        self.drag_key = None
+        
+        self.scene.trace_add('write', lambda *args: self.load_scene())
+        self.load_scene()
+        
+    def anchor_vars(self):
+        """Các biến vị trí của scene đang sửa"""
+        if self.scene.get() == "01":
+            return {'round': self.panel.round_position, **self.panel.rank_positions}
+        return dict(self.panel.final_positions)
+        
+    def anchor_label(self, key):
+        """Nhãn hiển thị cạnh marker: tên vị trí + nội dung đang nhập"""
+        if key == 'round':
+            text = self.panel.round_var.get()
+        elif key in self.panel.rank_vars:
+            text = self.panel.rank_vars[key].get()
+        else:
+            text = self.panel.final_vars[key].get()
+        return f"{key}: {text}" if text else key
+        
+    def load_scene(self):
+        """Vẽ ảnh nền thu nhỏ một lần và tạo marker cho từng vị trí"""
+        self.canvas.delete('all')
+        renderer = SceneRenderer()
+        if not renderer.load_background_folder(self.panel.background_folder):
+            self.canvas.configure(width=480, height=120)
+            self.canvas.create_text(240, 60, text="Select a background folder first", fill='white')
+            return
+            
+        path = renderer.background_paths[self.scene.get()]
+        self.scale = min(1, LAYOUT_EDITOR_WIDTH / load_background(path).width)
+        background = load_scaled_background(path, self.scale)
+        self.photo = ImageTk.PhotoImage(background)
+        self.canvas.configure(width=background.width, height=background.height)
+        self.canvas.create_image(0, 0, anchor='nw', image=self.photo)
+        
+        self.positions = {}
+        for index, key in enumerate(self.anchor_vars()):
+            parsed = self.panel.parsed_positions.get(key)
+            # Vị trí chưa hợp lệ: đặt tạm ở góc trái để có thể kéo vào chỗ
+            x, y, box = parsed or (20, 20 + index * 40, None)
+            self.positions[key] = [x, y]
+            cx, cy = x * self.scale, y * self.scale
+            tags = ('anchor', f"key:{key}")
+            if box:
+                w = (box[0] or 200) * self.scale
+                h = (box[1] or 60) * self.scale
+                self.canvas.create_rectangle(cx, cy, cx + w, cy + h, outline='#F39C12', dash=(3, 3), tags=tags)
+            self.canvas.create_oval(cx - 5, cy - 5, cx + 5, cy + 5, fill='#E74C3C', outline='white', tags=tags)
+            self.canvas.create_text(cx + 8, cy, text=self.anchor_label(key), anchor='nw',
+                                    fill='yellow', font=('Arial', 9, 'bold'), tags=tags)
+            
+    def on_press(self, event):
+        """Bắt đầu kéo marker dưới con trỏ"""
+        for tag in self.canvas.gettags('current'):
+            if tag.startswith("key:"):
+                self.drag_key = tag[4:]
                 
-    def close(self):
-        """Đóng cửa sổ hiển thị"""
-        self.root.destroy()
+    def snap(self, key, x, y):
+        """Snap tọa độ (pixel gốc) vào lưới và đường gióng của các vị trí khác"""
+        grid = int(self.grid_size.get()) if self.grid_size.get().isdigit() else 0
+        if grid > 1:
+            x = round(x / grid) * grid
+            y = round(y / grid) * grid
+            
+        guides = []
+        if self.snap_guides.get():
+            threshold = GUIDE_SNAP_PX / self.scale
+            others = [pos for other, pos in self.positions.items() if other != key]
+            near_x = min(others, key=lambda pos: abs(pos[0] - x), default=None)
+            if near_x and abs(near_x[0] - x) <= threshold:
+                x = near_x[0]
+                guides.append(('x', x))
+            near_y = min(others, key=lambda pos: abs(pos[1] - y), default=None)
+            if near_y and abs(near_y[1] - y) <= threshold:
+                y = near_y[1]
+                guides.append(('y', y))
+        return int(x), int(y), guides
+        
+    def on_drag(self, event):
+        """Di chuyển các item canvas của marker (không render lại ảnh)"""
+        if not self.drag_key:
+            return
+        x, y, guides = self.snap(self.drag_key, event.x / self.scale, event.y / self.scale)
+        old_x, old_y = self.positions[self.drag_key]
+        if (x, y) != (old_x, old_y):
+            self.canvas.move(f"key:{self.drag_key}", (x - old_x) * self.scale, (y - old_y) * self.scale)
+            self.positions[self.drag_key] = [x, y]
+            
+        self.canvas.delete('guide')
+        width, height = int(self.canvas['width']), int(self.canvas['height'])
+        for axis, value in guides:
+            if axis == 'x':
+                self.canvas.create_line(value * self.scale, 0, value * self.scale, height,
+                                        fill='#3498DB', dash=(4, 2), tags='guide')
+            else:
+                self.canvas.create_line(0, value * self.scale, width, value * self.scale,
+                                        fill='#3498DB', dash=(4, 2), tags='guide')
+        self.coord_label.config(text=f"{self.drag_key}: {x},{y}")
+        
+    def on_release(self, event):
+        """Ghi vị trí mới vào ô nhập (giữ nguyên ô giới hạn nếu có)"""
+        if not self.drag_key:
+            return
+        key, self.drag_key = self.drag_key, None
+        self.canvas.delete('guide')
+        x, y = self.positions[key]
+        parsed = self.panel.parsed_positions.get(key)
+        box = parsed[2] if parsed else None
+        text = f"{x},{y},{box[0]},{box[1]}" if box else f"{x},{y}"
+        self.anchor_vars()[key].set(text)
+        
+    def lift(self):
+        self.root.lift()
 
 class TournamentControlPanel:
     """Panel điều khiển tournament trên màn hình chính"""
     
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("ScoShow - Tournament Control")
+    def __init__(self, startup_benchmark=False, session=None, sessions=None):
+        # Chạy một mình: tạo Tk root; trong TournamentSessions: mỗi session một Toplevel
+        self.session = session
+        self.sessions = sessions
+        self.root = tk.Toplevel(sessions.root) if sessions else tk.Tk()
+        self.root.title(f"ScoShow - Tournament Control [{session}]" if session else "ScoShow - Tournament Control")
+        
+        # Chế độ đo thời gian khởi động: in số liệu và thoát sau frame đầu tiên
+        self.startup_benchmark = startup_benchmark
+        self.startup_timings = {'import_ms': round(_IMPORT_DONE_MS, 1)}
         
         # Tính toán kích thước cửa sổ dựa trên độ phân giải màn hình
         screen_width = self.root.winfo_screenwidth()
@@ -217,6 +1309,9 @@ class TournamentControlPanel:
         # Background folder path
         self.background_folder = ""
         
+        # Thư mục slide / clip tài trợ cho màn hình chờ
+        self.playlist_folder = ""
+        
         # Current background mode
         self.current_mode = None
         
@@ -224,15 +1319,72 @@ class TournamentControlPanel:
         self.selected_monitor = tk.IntVar(value=0)  # Default to first monitor (index 0)
         
         # Config file path
-        self.config_file = "scoshow_config.json"
+        self.config_file = session_file("scoshow_config.json", session)
+        
+        # Text config đã ghi gần nhất và lịch autosave đang chờ
+        self._saved_config_text = None
+        self._autosave_job = None
+        self._journal_job = None
+        self._node_count_job = None
+        self._export_poll_job = None
+        
+        # > 0 khi đang điền nhiều ô trong một lần (batch_update) - preview chờ tới cuối
+        self._batch_depth = 0
+        
+        # Phần giao diện dựng sau frame đầu (setup_deferred_ui)
+        self._deferred_ui_built = False
         
         # Text input variables
         self.setup_variables()
+        self.setup_position_parsing()
         
         # Load config if exists
         self.load_config()
         
+        # Autosave khi vị trí / font thay đổi
+        self.setup_autosave()
+        
+        # Journal sự kiện: khôi phục dữ liệu đã hiển thị trước khi crash
+        self.journal = EventJournal(session_file("scoshow_journal.jsonl", session))
+        self.restore_from_journal()
+        
+        # Bảng điểm thô - tự tính thứ hạng khi import điểm
+        self.scoreboard = ScoreBoard()
+        
+        # Lịch sử các round đã apply (gọi lại bằng "show round N")
+        self.history = RoundHistory(session_file("scoshow_history.db", session))
+        self.history_window = None
+        self.layout_editor = None
+        
+        # Worker render nền (preview, ...) để không chặn giao diện - dùng chung khi chạy nhiều session
+        if sessions:
+            self.render_pool = sessions.render_pool
+        else:
+            self.render_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scoshow-render")
+        
+        # Server phát tới display node (display_sync.DisplayPublisher) và scene đã hiển thị gần nhất
+        self.publisher = None
+        self.last_presented = None
+        
+        # Đồng hồ đang chạy: ('countdown', end_time, seconds) / ('clock',) / None - để khôi phục khi mở lại display
+        self.countdown_state = None
+        
+        # Reveal final results từng hạng: các frame đã render sẵn cho từng stage
+        self.reveal_frames = []
+        self.reveal_index = 0
+        self.reveal_payload = None
+        self.reveal_keys = []
+        self.reveal_overlays = []
+        self._reveal_window = None
+        self._reveal_future = None
+        self._reveal_poll_job = None
+        
+        # Sampling profiler cho chẩn đoán tại chỗ (profiler.SamplingProfiler khi đang chạy)
+        self.profiler = None
+        self._profile_job = None
+        
         self.setup_ui()
+        self.setup_preview()
         
     def setup_variables(self):
         """Thiết lập biến cho các ô nhập text và tọa độ"""
@@ -277,7 +1429,7 @@ class TournamentControlPanel:
         # Font options
         self.font_options = [
             "arial.ttf", "times.ttf", "calibri.ttf", "verdana.ttf", 
-            "tahoma.ttf", "georgia.ttf", "trebuc.ttf", "comic.ttf"
+            "tahoma.ttf", "georgia.ttf", "trebuc.ttf", "comic.ttf", "DejaVuSans.ttf"
         ]
         
         # Color options
@@ -305,77 +1457,259 @@ class TournamentControlPanel:
         }
         self.final_font_size = tk.StringVar(value="60")
         
+        # Ticker bảng xếp hạng trên background 00
+        self.ticker_enabled = tk.BooleanVar(value=False)
+        
+        # Phát scene / overlay tới các display node từ xa
+        self.publish_enabled = tk.BooleanVar(value=False)
+        self.publish_port = tk.StringVar(value="5757")  # display_sync.DEFAULT_PORT
+        self.publish_host = tk.StringVar(value="0.0.0.0")  # display_sync.DEFAULT_HOST - mở cho cả LAN
+        
+        # Playlist tài trợ trên background 00
+        self.playlist_enabled = tk.BooleanVar(value=False)
+        self.playlist_seconds = tk.StringVar(value=str(DEFAULT_SLIDE_SECONDS))
+        
+        # Đồng hồ đếm ngược (dùng trên mọi scene)
+        self.countdown_duration = tk.StringVar(value="5:00")
+        self.countdown_position = tk.StringVar(value="3450,40")
+        self.countdown_font_size = tk.StringVar(value="120")
+        
+        # Đồng hồ bộ nhớ và chế độ buffer dùng lại trên display
+        self.memory_gauge = tk.BooleanVar(value=False)
+        self.reuse_buffers = tk.BooleanVar(value=False)
+        
+        # Thời lượng profile (giây)
+        self.profile_seconds = tk.StringVar(value="30")
+        
+    def setup_position_parsing(self):
+        """Parse tọa độ "x,y[,w,h]" một lần khi ô nhập thay đổi, thay vì mỗi lần apply"""
+        self.parsed_positions = {}
+        anchors = {'round': self.round_position, **self.rank_positions, **self.final_positions}
+        for key, var in anchors.items():
+            var.trace_add('write', lambda *args, key=key, var=var: self.parse_anchor(key, var))
+            self.parse_anchor(key, var)
+            
+    def parse_anchor(self, key, var):
+        """Cập nhật tọa độ đã parse (x, y, box) của một vị trí; None nếu không hợp lệ"""
+        try:
+            self.parsed_positions[key] = parse_position(var.get())
+        except ValueError:
+            self.parsed_positions[key] = None
+            
     def load_config(self):
         """Load configuration từ file"""
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    
-                # Load positions
-                if 'round_position' in config:
-                    self.round_position.set(config['round_position'])
-                if 'round_font_size' in config:
-                    self.round_font_size.set(config['round_font_size'])
-                    
-                if 'rank_positions' in config:
-                    for rank, pos in config['rank_positions'].items():
-                        if rank in self.rank_positions:
-                            self.rank_positions[rank].set(pos)
-                            
-                if 'final_positions' in config:
-                    for key, pos in config['final_positions'].items():
-                        if key in self.final_positions:
-                            self.final_positions[key].set(pos)
-                            
-                # Load font settings
-                if 'font_name' in config:
-                    self.font_name.set(config['font_name'])
-                if 'font_color' in config:
-                    self.font_color.set(config['font_color'])
-                if 'rank_font_size' in config:
-                    self.rank_font_size.set(config['rank_font_size'])
-                if 'final_font_size' in config:
-                    self.final_font_size.set(config['final_font_size'])
-                    
-                # Load background folder
-                if 'background_folder' in config:
-                    self.background_folder = config['background_folder']
+            config = read_config(self.config_file)
+        except ConfigError as e:
+            # File hỏng: sao lưu lại để không bị autosave ghi đè, dùng mặc định
+            backup_path = quarantine(self.config_file)
+            print(f"Config hỏng ({e}), đã sao lưu thành {backup_path}")
+            messagebox.showwarning("Cảnh báo",
+                f"File config bị hỏng và đã được sao lưu thành:\n{backup_path}\n\nĐang dùng cấu hình mặc định.",
+                parent=self.root)
+            return
+        except OSError as e:
+            print(f"Lỗi khi load config: {e}")
+            return
+            
+        if config is None:
+            return
+            
+        # Load positions
+        if 'round_position' in config:
+            self.round_position.set(config['round_position'])
+        if 'round_font_size' in config:
+            self.round_font_size.set(config['round_font_size'])
+            
+        if 'rank_positions' in config:
+            for rank, pos in config['rank_positions'].items():
+                if rank in self.rank_positions:
+                    self.rank_positions[rank].set(pos)
                     
-                # Load selected monitor
-                if 'selected_monitor' in config:
-                    monitor_value = config['selected_monitor']
-                    # Validate monitor index against available monitors
-                    monitors = get_monitors()
-                    if monitor_value < len(monitors):
-                        self.selected_monitor.set(monitor_value)
-                    else:
-                        self.selected_monitor.set(0)  # Default to first monitor
+        if 'final_positions' in config:
+            for key, pos in config['final_positions'].items():
+                if key in self.final_positions:
+                    self.final_positions[key].set(pos)
                     
-        except Exception as e:
-            print(f"Lỗi khi load config: {e}")
+        # Load font settings
+        if 'font_name' in config:
+            self.font_name.set(config['font_name'])
+        if 'font_color' in config:
+            self.font_color.set(config['font_color'])
+        if 'rank_font_size' in config:
+            self.rank_font_size.set(config['rank_font_size'])
+        if 'final_font_size' in config:
+            self.final_font_size.set(config['final_font_size'])
+        if 'ticker_enabled' in config:
+            self.ticker_enabled.set(config['ticker_enabled'])
+        if 'publish_enabled' in config:
+            self.publish_enabled.set(config['publish_enabled'])
+        if 'publish_port' in config:
+            self.publish_port.set(config['publish_port'])
+        if 'publish_host' in config:
+            self.publish_host.set(config['publish_host'])
+        if 'playlist_enabled' in config:
+            self.playlist_enabled.set(config['playlist_enabled'])
+        if 'playlist_folder' in config:
+            self.playlist_folder = config['playlist_folder']
+        if 'playlist_seconds' in config:
+            self.playlist_seconds.set(config['playlist_seconds'])
+        if 'countdown_position' in config:
+            self.countdown_position.set(config['countdown_position'])
+        if 'countdown_font_size' in config:
+            self.countdown_font_size.set(config['countdown_font_size'])
+        if 'memory_gauge' in config:
+            self.memory_gauge.set(config['memory_gauge'])
+        if 'reuse_buffers' in config:
+            self.reuse_buffers.set(config['reuse_buffers'])
+            
+        # Load background folder
+        if 'background_folder' in config:
+            self.background_folder = config['background_folder']
+            
+        # Load selected monitor (kiểm tra với danh sách màn hình sau frame đầu - setup_monitors)
+        if 'selected_monitor' in config:
+            self.selected_monitor.set(config['selected_monitor'])
+                
+        # File trên đĩa đã khớp với trạng thái vừa load thì không cần ghi lại
+        current = self.collect_config()
+        if config == current:
+            self._saved_config_text = serialize_config(current)
+            
+    def collect_config(self):
+        """Thu thập configuration hiện tại thành dict"""
+        return {
+            'version': CONFIG_VERSION,
+            'round_position': self.round_position.get(),
+            'round_font_size': self.round_font_size.get(),
+            'rank_positions': {rank: var.get() for rank, var in self.rank_positions.items()},
+            'final_positions': {key: var.get() for key, var in self.final_positions.items()},
+            'font_name': self.font_name.get(),
+            'font_color': self.font_color.get(),
+            'rank_font_size': self.rank_font_size.get(),
+            'final_font_size': self.final_font_size.get(),
+            'ticker_enabled': self.ticker_enabled.get(),
+            'publish_enabled': self.publish_enabled.get(),
+            'publish_port': self.publish_port.get(),
+            'publish_host': self.publish_host.get(),
+            'playlist_enabled': self.playlist_enabled.get(),
+            'playlist_folder': self.playlist_folder,
+            'playlist_seconds': self.playlist_seconds.get(),
+            'countdown_position': self.countdown_position.get(),
+            'countdown_font_size': self.countdown_font_size.get(),
+            'memory_gauge': self.memory_gauge.get(),
+            'reuse_buffers': self.reuse_buffers.get(),
+            'background_folder': self.background_folder,
+            'selected_monitor': self.selected_monitor.get()
+        }
             
     def save_config(self):
-        """Save configuration vào file"""
+        """Save configuration vào file (atomic, chỉ ghi khi có thay đổi)"""
         try:
-            config = {
-                'round_position': self.round_position.get(),
-                'round_font_size': self.round_font_size.get(),
-                'rank_positions': {rank: var.get() for rank, var in self.rank_positions.items()},
-                'final_positions': {key: var.get() for key, var in self.final_positions.items()},
-                'font_name': self.font_name.get(),
-                'font_color': self.font_color.get(),
-                'rank_font_size': self.rank_font_size.get(),
-                'final_font_size': self.final_font_size.get(),
-                'background_folder': self.background_folder,
-                'selected_monitor': self.selected_monitor.get()
-            }
-            
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            text = serialize_config(self.collect_config())
+            if text == self._saved_config_text:
+                return False
+            atomic_write_text(self.config_file, text)
+            self._saved_config_text = text
+            return True
                 
         except Exception as e:
             print(f"Lỗi khi save config: {e}")
+            return False
+            
+    def setup_autosave(self):
+        """Theo dõi các biến vị trí / font để tự động lưu config"""
+        tracked = [self.round_position, self.round_font_size, self.font_name, self.font_color,
+                   self.rank_font_size, self.final_font_size, self.selected_monitor, self.ticker_enabled,
+                   self.playlist_enabled, self.playlist_seconds, self.publish_enabled, self.publish_port,
+                   self.publish_host, self.countdown_position, self.countdown_font_size, self.memory_gauge, self.reuse_buffers]
+        tracked += list(self.rank_positions.values()) + list(self.final_positions.values())
+        for var in tracked:
+            var.trace_add('write', lambda *args: self.schedule_autosave())
+            
+    def schedule_autosave(self):
+        """Debounce: lưu config sau AUTOSAVE_DELAY_MS kể từ thay đổi cuối cùng"""
+        if self._autosave_job is not None:
+            self.root.after_cancel(self._autosave_job)
+        self._autosave_job = self.root.after(AUTOSAVE_DELAY_MS, self.autosave)
+        
+    def autosave(self):
+        """Lưu config đang chờ (nếu có thay đổi)"""
+        self._autosave_job = None
+        self.save_config()
+        
+    def restore_from_journal(self):
+        """Replay journal và đưa dữ liệu đã hiển thị lần cuối trở lại các ô nhập"""
+        try:
+            state = self.journal.load()
+        except OSError as e:
+            print(f"Lỗi khi đọc journal: {e}")
+            return
+        self.set_event_state(state)
+        
+    def set_event_state(self, state):
+        """Gán round / ranks / final results và mode từ state của journal"""
+        ranking = state.get('ranking', {})
+        self.round_var.set(ranking.get('round', ''))
+        for rank, var in self.rank_vars.items():
+            var.set(ranking.get(rank, ''))
+        final = state.get('final', {})
+        for key, var in self.final_vars.items():
+            var.set(final.get(key, ''))
+        self.current_mode = state.get('mode')
+        
+    def ranking_payload(self):
+        """Dữ liệu ranking đang nhập (round + 10 rank)"""
+        payload = {'round': self.round_var.get()}
+        for rank, var in self.rank_vars.items():
+            payload[rank] = var.get()
+        return payload
+        
+    def final_payload(self):
+        """Dữ liệu final results đang nhập"""
+        return {key: var.get() for key, var in self.final_vars.items()}
+        
+    def record_event(self, kind, payload=None):
+        """Ghi sự kiện vào journal (lỗi ghi không được làm gián đoạn hiển thị)"""
+        try:
+            self.journal.record(kind, payload)
+        except OSError as e:
+            print(f"Lỗi khi ghi journal: {e}")
+            
+    def sync_journal(self):
+        """fsync journal theo lô, lặp lại mỗi JOURNAL_SYNC_MS"""
+        try:
+            self.journal.sync()
+        except OSError as e:
+            print(f"Lỗi khi sync journal: {e}")
+        self._journal_job = self.root.after(JOURNAL_SYNC_MS, self.sync_journal)
+        
+    def restore_display(self):
+        """Sau crash: mở lại display trên màn hình đã chọn với frame hiển thị cuối cùng"""
+        if self.current_mode and self.background_folder and os.path.isdir(self.background_folder):
+            self.open_display()
+            
+    def undo_last_update(self):
+        """Hoàn tác lần cập nhật ranking / final / scene gần nhất"""
+        state = self.journal.undo()
+        if state is None:
+            messagebox.showinfo("Thông báo", "Không còn cập nhật nào để hoàn tác", parent=self.root)
+            return
+        with self.batch_update():
+            self.set_event_state(state)
+        if self.has_output():
+            self.show_current_mode()
+        self.status_label.config(text="Undo: restored previous update")
+        
+    def show_current_mode(self):
+        """Vẽ lại display theo current_mode mà không hiện popup"""
+        if self.current_mode == "00":
+            self.present("00")
+            self.update_playlist()
+        elif self.current_mode == "01":
+            self.apply_ranking(show_popup=False)
+        elif self.current_mode == "02":
+            self.apply_final_results(show_popup=False)
         
     def setup_ui(self):
         """Thiết lập giao diện người dùng"""
@@ -441,7 +1775,7 @@ class TournamentControlPanel:
         # Bind mouse wheel để cuộn
         def _on_mousewheel(event):
             main_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        main_canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        self.root.bind("<MouseWheel>", _on_mousewheel)
         
         # Frame chính với padding trong scrollable frame
         main_frame = ttk.Frame(scrollable_frame)
@@ -487,39 +1821,34 @@ class TournamentControlPanel:
                                       padding="10")
         monitor_frame.pack(fill=tk.X, pady=(0, 10))
         
-        # Hiển thị thông tin màn hình với icon
-        monitors = get_monitors()
-        monitor_info = f"📺 Detected {len(monitors)} monitor(s)"
-        info_label = ttk.Label(monitor_frame, text=monitor_info, 
-                              font=('Arial', 9, 'bold'),
-                              foreground='#2980B9')
-        info_label.pack()
-        
-        # Thêm tùy chọn chọn màn hình
-        monitor_selection_frame = ttk.Frame(monitor_frame)
-        monitor_selection_frame.pack(pady=(5, 0))
-        
-        ttk.Label(monitor_selection_frame, text="Display on Monitor:").pack(side=tk.LEFT, padx=(0, 5))
-        
-        for i, monitor in enumerate(monitors):
-            monitor_radio = ttk.Radiobutton(
-                monitor_selection_frame,
-                text=f"Monitor {i+1} ({monitor.width}x{monitor.height})",
-                variable=self.selected_monitor,
-                value=i
-            )
-            monitor_radio.pack(side=tk.LEFT, padx=(0, 10))
+        # Thông tin / lựa chọn màn hình: điền sau frame đầu (setup_monitors) - liệt kê màn hình
+        # qua screeninfo / xrandr tốn thời gian nên không chặn lần hiện cửa sổ đầu tiên
+        self.monitor_info_label = ttk.Label(monitor_frame, text="📺 Detecting monitors...", 
+                                           font=('Arial', 9, 'bold'),
+                                           foreground='#2980B9')
+        self.monitor_info_label.pack()
         
-        if len(monitors) > 1:
-            status_text = "✅ Multiple monitors available - Choose monitor above"
-            color = '#27AE60'
-        else:
-            status_text = "⚠️  Only 1 monitor - will display in window"
-            color = '#F39C12'
-            
-        status_label = ttk.Label(monitor_frame, text=status_text,
-                                foreground=color, font=('Arial', 8))
-        status_label.pack(pady=(3, 0))
+        # Thêm tùy chọn chọn màn hình
+        self.monitor_selection_frame = ttk.Frame(monitor_frame)
+        self.monitor_selection_frame.pack(pady=(5, 0))
+        
+        ttk.Label(self.monitor_selection_frame, text="Display on Monitor:").pack(side=tk.LEFT, padx=(0, 5))
+        
+        self.monitor_status_label = ttk.Label(monitor_frame, text="", font=('Arial', 8))
+        self.monitor_status_label.pack(pady=(3, 0))
+        
+        # Display node từ xa (nhận scene / overlay qua mạng)
+        publish_frame = ttk.Frame(monitor_frame)
+        publish_frame.pack(pady=(5, 0))
+        ttk.Checkbutton(publish_frame, text="📡 Remote display nodes", 
+                       variable=self.publish_enabled,
+                       command=self.toggle_publisher).pack(side=tk.LEFT)
+        ttk.Label(publish_frame, text="Bind:").pack(side=tk.LEFT, padx=(8, 0))
+        ttk.Entry(publish_frame, textvariable=self.publish_host, width=12).pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Label(publish_frame, text="Port:").pack(side=tk.LEFT, padx=(8, 0))
+        ttk.Entry(publish_frame, textvariable=self.publish_port, width=6).pack(side=tk.LEFT, padx=(5, 8))
+        self.nodes_label = ttk.Label(publish_frame, text="", font=('Arial', 8), foreground='#7F8C8D')
+        self.nodes_label.pack(side=tk.LEFT)
         
         # Frame cho việc chọn thư mục background (cột trái)
         bg_frame = ttk.LabelFrame(left_column, text="🖼️  Background Setup", 
@@ -538,6 +1867,10 @@ class TournamentControlPanel:
                                         font=('Arial', 9, 'bold'))
         self.bg_status_label.pack(side=tk.LEFT)
         
+        ttk.Button(bg_button_frame, text="📐 Layout Editor", 
+                  style='Action.TButton',
+                  command=self.open_layout_editor).pack(side=tk.RIGHT)
+        
         # Frame điều khiển hiển thị (cột trái)
         display_frame = ttk.LabelFrame(left_column, text="🎮  Display Control", 
                                       padding="10")
@@ -555,7 +1888,17 @@ class TournamentControlPanel:
                   command=self.switch_monitor).pack(side=tk.LEFT, padx=(0, 8))
         ttk.Button(display_buttons, text="�🔴 Close Display", 
                   style='Warning.TButton',
-                  command=self.close_display).pack(side=tk.LEFT)
+                  command=self.close_display).pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Button(display_buttons, text="↩️ Undo", 
+                  style='Action.TButton',
+                  command=self.undo_last_update).pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Button(display_buttons, text="📜 History", 
+                  style='Action.TButton',
+                  command=self.open_history_browser).pack(side=tk.LEFT)
+        if self.sessions:
+            ttk.Button(display_buttons, text="➕ Session", 
+                      style='Action.TButton',
+                      command=lambda: self.sessions.ask_new_session(self.root)).pack(side=tk.LEFT, padx=(8, 0))
                   
         # Nút chọn background
         bg_buttons = ttk.Frame(display_frame)
@@ -571,6 +1914,25 @@ class TournamentControlPanel:
                   style='Warning.TButton',
                   command=lambda: self.show_background("02")).pack(side=tk.LEFT)
         
+        ttk.Checkbutton(display_frame, text="📜 Standings ticker on 00", 
+                       variable=self.ticker_enabled,
+                       command=self.update_ticker).pack(anchor=tk.W, pady=(6, 0))
+        
+        # Profile hiệu năng để gửi kèm khi báo máy chậm
+        profile_frame = ttk.Frame(display_frame)
+        profile_frame.pack(fill=tk.X, pady=(6, 0))
+        ttk.Button(profile_frame, text="🩺 Profile", 
+                  style='Action.TButton',
+                  command=self.toggle_profile).pack(side=tk.LEFT)
+        ttk.Label(profile_frame, text="Seconds:").pack(side=tk.LEFT, padx=(8, 0))
+        ttk.Entry(profile_frame, textvariable=self.profile_seconds, width=4).pack(side=tk.LEFT, padx=(5, 8))
+        self.profile_label = ttk.Label(profile_frame, text="", font=('Arial', 8), foreground='#7F8C8D')
+        self.profile_label.pack(side=tk.LEFT)
+        
+        # Bộ nhớ / playlist tài trợ / đồng hồ: dựng sau frame đầu (setup_secondary_controls)
+        self.secondary_controls = ttk.Frame(display_frame)
+        self.secondary_controls.pack(fill=tk.X)
+        
         # Frame cho input ranking (cột trái)
         self.ranking_frame = ttk.LabelFrame(left_column, text="📊 Ranking Input (Background 01)", 
                                            padding="10")
@@ -614,7 +1976,7 @@ class TournamentControlPanel:
         ttk.Label(round_frame, text="Round:").pack(side=tk.LEFT)
         ttk.Entry(round_frame, textvariable=self.round_var, width=8).pack(side=tk.LEFT, padx=(5, 10))
         
-        ttk.Label(round_frame, text="Position (x,y):").pack(side=tk.LEFT)
+        ttk.Label(round_frame, text="Position (x,y[,w,h]):").pack(side=tk.LEFT)
         ttk.Entry(round_frame, textvariable=self.round_position, width=12).pack(side=tk.LEFT, padx=(5, 10))
         
         ttk.Label(round_frame, text="Font Size:").pack(side=tk.LEFT)
@@ -660,6 +2022,19 @@ class TournamentControlPanel:
             ttk.Entry(rank_frame, textvariable=self.rank_vars[rank], width=14).pack(side=tk.LEFT, padx=(3, 3))
             ttk.Entry(rank_frame, textvariable=self.rank_positions[rank], width=8).pack(side=tk.LEFT, padx=(3, 0))
             
+        # Tính thứ hạng từ điểm thô
+        scores_frame = ttk.Frame(self.ranking_frame)
+        scores_frame.pack(pady=(0, 0))
+        ttk.Button(scores_frame, text="🧮 Import Scores (CSV)", 
+                  style='Action.TButton',
+                  command=self.import_scores).pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Button(scores_frame, text="🧹 Reset Scores", 
+                  style='Warning.TButton',
+                  command=self.reset_scores).pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Button(scores_frame, text="📋 Bulk Entry", 
+                  style='Action.TButton',
+                  command=self.open_bulk_entry).pack(side=tk.LEFT)
+        
         # Apply button cho ranking với style đẹp
         ttk.Button(self.ranking_frame, text="✅ Apply Ranking", 
                   style='Success.TButton',
@@ -725,6 +2100,25 @@ class TournamentControlPanel:
                   style='Warning.TButton',
                   command=self.apply_final_results).pack(pady=(8, 0))
         
+        # Reveal từng hạng (5th -> 1st), điều khiển bằng phím hoặc remote
+        reveal_frame = ttk.Frame(self.final_frame)
+        reveal_frame.pack(pady=(8, 0))
+        ttk.Button(reveal_frame, text="🎬 Prepare Reveal", 
+                  style='Action.TButton',
+                  command=self.prepare_reveal).pack(side=tk.LEFT, padx=(0, 6))
+        ttk.Button(reveal_frame, text="⏮️", width=3,
+                  command=lambda: self.reveal_step(-1)).pack(side=tk.LEFT, padx=(0, 3))
+        ttk.Button(reveal_frame, text="⏭️ Next", 
+                  style='Success.TButton',
+                  command=lambda: self.reveal_step(1)).pack(side=tk.LEFT)
+        self.reveal_label = ttk.Label(self.final_frame, text="Reveal: not prepared",
+                                      font=('Arial', 8), foreground='#7F8C8D')
+        self.reveal_label.pack(pady=(3, 0))
+        
+        # Remote clicker gửi PageDown / PageUp (bỏ qua khi đang gõ trong ô nhập)
+        self.root.bind('<Next>', lambda e: self.on_reveal_key(e, 1))
+        self.root.bind('<Prior>', lambda e: self.on_reveal_key(e, -1))
+        
         # Status label với style đẹp - compact hơn (cột trái)
         status_container = tk.Frame(left_column, bg='#E8F6F3')
         status_container.pack(fill=tk.X, pady=(10, 5))
@@ -740,22 +2134,199 @@ class TournamentControlPanel:
                                    padx=8, pady=5)
         self.status_label.pack(pady=(0, 5))
         
+        # Live preview scene hiện tại ở kích thước thumbnail (dưới 2 cột)
+        preview_frame = ttk.LabelFrame(main_frame, text="👁️  Live Preview", padding="10")
+        preview_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        self.preview_label = tk.Label(preview_frame, text="Select a background folder to preview",
+                                      bg='#2C3E50', fg='#BDC3C7', font=('Arial', 9))
+        self.preview_label.pack()
+        
+    def setup_deferred_ui(self):
+        """Phần giao diện dựng sau frame đầu: danh sách màn hình và các điều khiển phụ"""
+        if self._deferred_ui_built:
+            return
+        self._deferred_ui_built = True
+        self.setup_monitors()
+        self.setup_secondary_controls(self.secondary_controls)
+        
+    def setup_monitors(self):
+        """Liệt kê màn hình, kiểm tra màn hình đã lưu trong config và tạo nút chọn"""
+        monitors = get_monitors()
+        if self.selected_monitor.get() >= len(monitors):
+            self.selected_monitor.set(0)  # Default to first monitor
+        self.monitor_info_label.config(text=f"📺 Detected {len(monitors)} monitor(s)")
+        
+        for i, monitor in enumerate(monitors):
+            monitor_radio = ttk.Radiobutton(
+                self.monitor_selection_frame,
+                text=f"Monitor {i+1} ({monitor.width}x{monitor.height})",
+                variable=self.selected_monitor,
+                value=i
+            )
+            monitor_radio.pack(side=tk.LEFT, padx=(0, 10))
+        
+        if len(monitors) > 1:
+            status_text = "✅ Multiple monitors available - Choose monitor above"
+            color = '#27AE60'
+        else:
+            status_text = "⚠️  Only 1 monitor - will display in window"
+            color = '#F39C12'
+        self.monitor_status_label.config(text=status_text, foreground=color)
+        
+    def setup_secondary_controls(self, parent):
+        """Điều khiển phụ của display (bộ nhớ, playlist tài trợ, đồng hồ)"""
+        # Theo dõi bộ nhớ cho sự kiện dài
+        memory_frame = ttk.Frame(parent)
+        memory_frame.pack(fill=tk.X, pady=(6, 0))
+        ttk.Checkbutton(memory_frame, text="📈 Memory gauge", 
+                       variable=self.memory_gauge,
+                       command=self.update_memory_options).pack(side=tk.LEFT)
+        ttk.Checkbutton(memory_frame, text="♻️ Reuse frame buffers", 
+                       variable=self.reuse_buffers,
+                       command=self.update_memory_options).pack(side=tk.LEFT, padx=(15, 0))
+        
+        # Slide / clip tài trợ xoay vòng trên màn hình chờ
+        playlist_frame = ttk.Frame(parent)
+        playlist_frame.pack(fill=tk.X, pady=(6, 0))
+        ttk.Checkbutton(playlist_frame, text="🎞️ Sponsor playlist on 00", 
+                       variable=self.playlist_enabled,
+                       command=self.update_playlist).pack(side=tk.LEFT)
+        ttk.Button(playlist_frame, text="📁 Folder", 
+                  style='Action.TButton',
+                  command=self.select_playlist_folder).pack(side=tk.LEFT, padx=(8, 8))
+        ttk.Label(playlist_frame, text="Seconds:").pack(side=tk.LEFT)
+        ttk.Entry(playlist_frame, textvariable=self.playlist_seconds, width=4).pack(side=tk.LEFT, padx=(5, 8))
+        self.playlist_label = ttk.Label(playlist_frame, 
+                                        text=os.path.basename(self.playlist_folder) or "No folder",
+                                        font=('Arial', 8), foreground='#7F8C8D')
+        self.playlist_label.pack(side=tk.LEFT)
+        
+        # Đồng hồ đếm ngược / giờ hiện tại
+        countdown_frame = ttk.Frame(parent)
+        countdown_frame.pack(fill=tk.X, pady=(6, 0))
+        ttk.Label(countdown_frame, text="⏱️ Timer:").pack(side=tk.LEFT)
+        ttk.Entry(countdown_frame, textvariable=self.countdown_duration, width=7).pack(side=tk.LEFT, padx=(5, 8))
+        ttk.Label(countdown_frame, text="Pos:").pack(side=tk.LEFT)
+        ttk.Entry(countdown_frame, textvariable=self.countdown_position, width=10).pack(side=tk.LEFT, padx=(5, 8))
+        ttk.Label(countdown_frame, text="Size:").pack(side=tk.LEFT)
+        ttk.Entry(countdown_frame, textvariable=self.countdown_font_size, width=4).pack(side=tk.LEFT, padx=(5, 8))
+        ttk.Button(countdown_frame, text="▶ Start", 
+                  style='Success.TButton',
+                  command=self.start_countdown).pack(side=tk.LEFT, padx=(0, 4))
+        ttk.Button(countdown_frame, text="🕒 Clock", 
+                  style='Action.TButton',
+                  command=self.start_clock).pack(side=tk.LEFT, padx=(0, 4))
+        ttk.Button(countdown_frame, text="⏹ Stop", 
+                  style='Warning.TButton',
+                  command=self.stop_countdown).pack(side=tk.LEFT)
+        
+    def setup_preview(self):
+        """Theo dõi các ô nhập để cập nhật live preview"""
+        self.preview_renderer = SceneRenderer()
+        self.preview_folder = None
+        self.preview_scene = "01"
+        self._preview_job = None
+        self._preview_poll_job = None
+        self._preview_future = None
+        self._preview_pending = False
+        
+        ranking_vars = [self.round_var, self.round_position, self.round_font_size, self.rank_font_size]
+        ranking_vars += list(self.rank_vars.values()) + list(self.rank_positions.values())
+        final_vars = [self.final_font_size]
+        final_vars += list(self.final_vars.values()) + list(self.final_positions.values())
+        
+        for var in ranking_vars:
+            var.trace_add('write', lambda *args: self.schedule_preview("01"))
+        for var in final_vars:
+            var.trace_add('write', lambda *args: self.schedule_preview("02"))
+        for var in (self.font_name, self.font_color):
+            var.trace_add('write', lambda *args: self.schedule_preview())
+            
+        self.schedule_preview()
+        
+    def schedule_preview(self, scene=None):
+        """Debounce: render preview sau PREVIEW_DELAY_MS kể từ lần gõ cuối"""
+        if scene:
+            self.preview_scene = scene
+        if self._batch_depth:
+            return  # batch_update render preview một lần khi xong
+        if self._preview_job is not None:
+            self.root.after_cancel(self._preview_job)
+        self._preview_job = self.root.after(PREVIEW_DELAY_MS, self.render_preview)
+        
+    def render_preview(self):
+        """Gửi việc render preview cho worker (chỉ một job chạy cùng lúc)"""
+        self._preview_job = None
+        if self._preview_future is not None:
+            # Đang render: render lại một lần nữa khi xong
+            self._preview_pending = True
+            return
+            
+        if self.preview_folder != self.background_folder:
+            if not self.preview_renderer.load_background_folder(self.background_folder):
+                return
+            self.preview_folder = self.background_folder
+            
+        # Đọc biến Tk trên main thread, worker chỉ làm việc với PIL
+        scene = self.preview_scene
+        if scene == "01":
+            overlay_data = self.build_ranking_overlay(self.ranking_payload())
+        else:
+            overlay_data = self.build_final_overlay(self.final_payload())
+        self._preview_future = self.render_pool.submit(self.render_preview_image, scene, overlay_data)
+        self._preview_poll_job = self.root.after(PREVIEW_POLL_MS, self.poll_preview)
+        
+    def render_preview_image(self, scene, overlay_data):
+        """(Worker) render scene ở độ phân giải thumbnail từ ảnh nền đã thu nhỏ sẵn"""
+        background = load_background(self.preview_renderer.background_paths[scene])
+        scale = min(1, PREVIEW_WIDTH / background.width)
+        return self.preview_renderer.render(scene, overlay_data, scale)
+        
+    def poll_preview(self):
+        """Nhận kết quả từ worker và hiển thị preview"""
+        future = self._preview_future
+        if not future.done():
+            self._preview_poll_job = self.root.after(PREVIEW_POLL_MS, self.poll_preview)
+            return
+        self._preview_poll_job = None
+        self._preview_future = None
+        try:
+            photo = ImageTk.PhotoImage(future.result())
+            self.preview_label.configure(image=photo, text="")
+            self.preview_label.image = photo  # Giữ tham chiếu
+        except Exception as e:
+            print(f"Lỗi khi render preview: {e}")
+            
+        if self._preview_pending:
+            self._preview_pending = False
+            self.render_preview()
+            
+    def open_layout_editor(self):
+        """Mở cửa sổ kéo-thả vị trí text"""
+        if self.layout_editor and self.layout_editor.root.winfo_exists():
+            self.layout_editor.lift()
+            return
+        self.layout_editor = LayoutEditor(self)
+        
     def select_background_folder(self):
         """Chọn thư mục chứa ảnh background"""
-        folder = filedialog.askdirectory(title="Chọn thư mục chứa background (00.jpg, 01.png, 02.png)")
+        folder = filedialog.askdirectory(title="Chọn thư mục chứa background (00.jpg, 01.png, 02.png)",
+                                         parent=self.root)
         if folder:
             self.background_folder = folder
+            self.schedule_autosave()
+            self.schedule_preview()
             # Kiểm tra xem có đủ 3 file background không
-            required_files = ["00.jpg", "01.png", "02.png"]
             missing_files = []
             
-            for filename in required_files:
+            for filename in BACKGROUND_FILES:
                 if not os.path.exists(os.path.join(folder, filename)):
                     missing_files.append(filename)
                     
             if missing_files:
                 messagebox.showwarning("Cảnh báo", 
-                    f"Thiếu các file: {', '.join(missing_files)}")
+                    f"Thiếu các file: {', '.join(missing_files)}", parent=self.root)
                 self.bg_status_label.config(text="Thiếu file background")
             else:
                 self.bg_status_label.config(text="✓ Background OK")
@@ -763,10 +2334,10 @@ class TournamentControlPanel:
     def open_display(self):
         """Mở hoặc chuyển đổi cửa sổ hiển thị tournament"""
         if not self.background_folder:
-            messagebox.showwarning("Cảnh báo", "Vui lòng chọn thư mục background trước")
+            messagebox.showwarning("Cảnh báo", "Vui lòng chọn thư mục background trước", parent=self.root)
             return
             
-        monitors = get_monitors()
+        monitors = get_monitors(refresh=True)
         monitor_index = self.selected_monitor.get()
         
         # Ensure monitor_index is valid
@@ -776,28 +2347,38 @@ class TournamentControlPanel:
             
         print(f"Attempting to open/switch display to monitor {monitor_index + 1}")
         
+        # Session khác đang dùng màn hình này
+        owner = self.sessions.monitor_owner(monitor_index, exclude=self) if self.sessions else None
+        if owner and not messagebox.askyesno("Cảnh báo",
+                f"Monitor {monitor_index + 1} đang được session '{owner.session}' sử dụng. Vẫn mở?",
+                parent=self.root):
+            return
+        
         # Close existing display window if it's open
         if self.display_window:
             self.display_window.close()
             self.display_window = None
             
         # Create a new display window on the selected monitor
-        self.display_window = TournamentDisplayWindow(monitor_index)
+        self.display_window = TournamentDisplayWindow(monitor_index, self.reuse_buffers.get())
+        self.cancel_reveal()
+        for sequence in ('<space>', '<Right>', '<Next>'):
+            self.display_window.root.bind(sequence, lambda e: self.reveal_step(1))
+        for sequence in ('<Left>', '<Prior>'):
+            self.display_window.root.bind(sequence, lambda e: self.reveal_step(-1))
         
         # Load background folder and restore state
         if self.display_window.load_background_folder(self.background_folder):
             self.status_label.config(text=f"Display opened on Monitor {monitor_index + 1}")
+            self.update_ticker()
+            self.update_countdown()
+            self.update_memory_options()
             
-            # Restore the last shown background
+            # Restore the last shown background (no popup on switch)
             if self.current_mode:
-                if self.current_mode == "00":
-                    self.display_window.show_background("00")
-                elif self.current_mode == "01":
-                    self.apply_ranking(show_popup=False) # Avoid popup on switch
-                elif self.current_mode == "02":
-                    self.apply_final_results(show_popup=False) # Avoid popup on switch
+                self.show_current_mode()
         else:
-            messagebox.showerror("Lỗi", "Không thể load background")
+            messagebox.showerror("Lỗi", "Không thể load background", parent=self.root)
             self.display_window.close()
             self.display_window = None
             
@@ -806,11 +2387,12 @@ class TournamentControlPanel:
         if self.display_window:
             self.display_window.close()
             self.display_window = None
+            self.cancel_reveal()
             # Don't clear current_mode, so it can be restored
             self.status_label.config(text="Display closed")
             print("Display window closed")
         else:
-            messagebox.showinfo("Thông báo", "Không có display nào đang mở")
+            messagebox.showinfo("Thông báo", "Không có display nào đang mở", parent=self.root)
     
     def switch_monitor(self):
         """Chuyển đổi display sang màn hình khác"""
@@ -818,19 +2400,161 @@ class TournamentControlPanel:
             # Reopen display on selected monitor
             self.open_display()
         else:
-            messagebox.showwarning("Cảnh báo", "Không có display nào đang mở")
+            messagebox.showwarning("Cảnh báo", "Không có display nào đang mở", parent=self.root)
     
+    def has_output(self):
+        """Có nơi hiển thị: display trên máy này hoặc display node từ xa"""
+        return self.display_window is not None or self.publisher is not None
+        
+    def present(self, bg_id, overlay_data=None):
+        """Hiển thị scene trên display của máy này (nếu mở) và phát tới các display node"""
+        success = True
+        if self.display_window:
+            success = self.display_window.show_background(bg_id, overlay_data)
+        if success:
+            self.publish_state(bg_id, overlay_data)
+        return success
+        
+    def publish_state(self, bg_id, overlay_data=None):
+        """Ghi nhớ scene đang hiển thị và gửi delta tới display node (nếu đang phát)"""
+        self.last_presented = (bg_id, overlay_data)
+        if self.publisher:
+            self.publisher.publish(bg_id, overlay_data)
+            
+    def toggle_publisher(self):
+        """Bật / tắt server phát tới display node"""
+        if self.publish_enabled.get():
+            self.start_publisher()
+        else:
+            self.stop_publisher()
+            
+    def start_publisher(self):
+        """Mở cổng cho display node và gửi scene hiện tại"""
+        from display_sync import DEFAULT_HOST, DisplayPublisher
+        try:
+            host = self.publish_host.get().strip() or DEFAULT_HOST
+            self.publisher = DisplayPublisher(host, int(self.publish_port.get())).start()
+        except (ValueError, OSError) as e:
+            self.publisher = None
+            self.publish_enabled.set(False)
+            messagebox.showerror("Lỗi", f"Không thể mở cổng cho display node: {e}", parent=self.root)
+            return
+        if self.last_presented:
+            self.publisher.publish(*self.last_presented)
+        elif self.current_mode:
+            self.show_current_mode()
+        if host in ('0.0.0.0', '::', ''):
+            # Cổng không xác thực: mọi máy trong mạng đều đọc được state đang phát
+            status = f"⚠ Serving display nodes on port {self.publisher.port} to the whole LAN (no auth)"
+        else:
+            status = f"Serving display nodes on {host}:{self.publisher.port}"
+        print(status)
+        self.status_label.config(text=status)
+        self.update_node_count()
+        
+    def stop_publisher(self):
+        """Đóng server, ngắt các display node"""
+        if self._node_count_job is not None:
+            self.root.after_cancel(self._node_count_job)
+            self._node_count_job = None
+        if self.publisher:
+            self.publisher.close()
+            self.publisher = None
+        self.nodes_label.config(text="")
+        
+    def update_node_count(self):
+        """Hiện số display node đang kết nối (cập nhật mỗi giây khi đang phát)"""
+        if not self.publisher:
+            return
+        self.nodes_label.config(text=f"{self.publisher.node_count()} node(s)")
+        self._node_count_job = self.root.after(1000, self.update_node_count)
+        
+    def toggle_profile(self):
+        """Bắt đầu profile, hoặc dừng sớm và ghi file nếu đang chạy"""
+        if self.profiler:
+            self.finish_profile()
+            return
+        try:
+            seconds = float(self.profile_seconds.get())
+        except ValueError:
+            messagebox.showerror("Lỗi", "Số giây profile không hợp lệ", parent=self.root)
+            return
+        self.start_profile(seconds)
+        
+    def start_profile(self, seconds):
+        """Lấy mẫu mọi thread trong seconds giây rồi ghi file cạnh scoshow_config.json"""
+        if self.profiler:
+            return
+        from profiler import SamplingProfiler
+        self.profiler = SamplingProfiler().start()
+        self._profile_job = self.root.after(max(1, int(seconds * 1000)), self.finish_profile)
+        self.profile_label.config(text=f"Profiling {seconds:g}s... (bấm lại để dừng)")
+        print(f"Profiling {seconds:g}s")
+        
+    def finish_profile(self):
+        """Dừng profiler và ghi file .folded + .json"""
+        from profiler import write_profile
+        if self._profile_job is not None:
+            self.root.after_cancel(self._profile_job)
+            self._profile_job = None
+        profiler = self.profiler.stop()
+        self.profiler = None
+        folder = os.path.dirname(os.path.abspath(self.config_file))
+        try:
+            path = write_profile(profiler, folder, self.profile_metadata(), self.session)
+        except OSError as e:
+            print(f"Lỗi khi ghi profile: {e}")
+            self.profile_label.config(text="Không ghi được profile")
+            return
+        self.profile_label.config(text=f"Saved {os.path.basename(path)}")
+        print(f"Profile saved: {path}")
+        
+    def profile_metadata(self):
+        """Màn hình, display và cài đặt đang dùng - ghi kèm profile"""
+        try:
+            monitors = [f"{m.width}x{m.height}+{m.x}+{m.y}" for m in get_monitors(refresh=True)]
+        except Exception as e:
+            monitors = [f"không đọc được: {e}"]
+        display = None
+        if self.display_window:
+            display = {
+                'monitor': self.selected_monitor.get(),
+                'window_size': self.display_window.window_size(),
+                'compositor': 'numpy' if self.display_window.compositor else 'pil',
+                'reuse_buffers': self.display_window.reuse_buffers,
+                'cached_frames': len(self.display_window.render_cache),
+            }
+        return {
+            'session': self.session,
+            'monitors': monitors,
+            'display': display,
+            'current_mode': self.current_mode,
+            'remote_nodes': self.publisher.node_count() if self.publisher else 0,
+            'text_layout': text_layout().name.lower(),
+            'settings': self.collect_config(),
+        }
+        
+    def update_memory_options(self):
+        """Áp dụng đồng hồ bộ nhớ / chế độ buffer dùng lại cho display đang mở"""
+        if not self.display_window:
+            return
+        self.display_window.set_reuse_buffers(self.reuse_buffers.get())
+        self.display_window.show_memory_gauge(self.memory_gauge.get())
+        
     def show_background(self, bg_id):
         """Hiển thị background được chọn"""
-        if not self.display_window:
-            messagebox.showwarning("Cảnh báo", "Vui lòng mở display trước")
+        if not self.has_output():
+            messagebox.showwarning("Cảnh báo", "Vui lòng mở display trước", parent=self.root)
             return
             
         self.current_mode = bg_id
         
         if bg_id == "00":
             # Background chờ - chỉ hiển thị ảnh
-            success = self.display_window.show_background(bg_id)
+            success = self.present(bg_id)
+            if success:
+                self.record_event('scene', {'mode': "00"})
+                self.update_playlist()
         elif bg_id == "01":
             # Background ranking - hiển thị với data hiện tại
             self.apply_ranking()
@@ -842,36 +2566,26 @@ class TournamentControlPanel:
             
         # Không hiển thị popup cho việc chuyển background
             
-    def apply_ranking(self, show_popup=True):
-        """Apply ranking data lên background 01"""
-        if not self.display_window:
-            messagebox.showwarning("Cảnh báo", "Vui lòng mở display trước")
-            return
-            
-        # Thu thập data từ input fields
-        overlay_data = {
-            'round': self.round_var.get()
-        }
+    def build_ranking_overlay(self, payload):
+        """Tạo overlay_data cho background 01 từ payload + vị trí / font hiện tại"""
+        overlay_data = dict(payload)
         
-        for rank, var in self.rank_vars.items():
-            overlay_data[rank] = var.get()
-            
-        # Thu thập tọa độ điểm gốc
+        # Tọa độ điểm gốc (và ô giới hạn "x,y,w,h" nếu có) đã được parse sẵn
         positions = {}
-        try:
-            round_pos = self.round_position.get().split(',')
-            positions['round'] = (int(round_pos[0]), int(round_pos[1]))
-        except (ValueError, IndexError):
-            positions['round'] = (1286, 917)  # default
+        boxes = {}
+        x, y, box = self.parsed_positions['round'] or (1286, 917, None)  # default
+        positions['round'] = (x, y)
+        if box:
+            boxes['round'] = box
             
-        for rank, pos_var in self.rank_positions.items():
-            try:
-                pos = pos_var.get().split(',')
-                positions[rank] = (int(pos[0]), int(pos[1]))
-            except (ValueError, IndexError):
-                positions[rank] = None
+        for rank in self.rank_positions:
+            parsed = self.parsed_positions[rank]
+            positions[rank] = parsed[:2] if parsed else None
+            if parsed and parsed[2]:
+                boxes[rank] = parsed[2]
                 
         overlay_data['positions'] = positions
+        overlay_data['boxes'] = boxes
         
         # Thu thập font settings
         font_settings = {
@@ -881,73 +2595,685 @@ class TournamentControlPanel:
             'color': self.font_color.get()
         }
         overlay_data['font_settings'] = font_settings
+        return overlay_data
+        
+    def build_final_overlay(self, payload):
+        """Tạo overlay_data cho background 02 từ payload + vị trí / font hiện tại"""
+        overlay_data = dict(payload)
+        
+        # Tọa độ điểm gốc cho final results (đã parse sẵn)
+        positions = {}
+        boxes = {}
+        for key in self.final_positions:
+            parsed = self.parsed_positions[key]
+            positions[key] = parsed[:2] if parsed else None
+            if parsed and parsed[2]:
+                boxes[key] = parsed[2]
+                
+        overlay_data['positions'] = positions
+        overlay_data['boxes'] = boxes
+        
+        # Font settings cho final results
+        font_settings = {
+            'font_name': self.font_name.get(),
+            'font_size': int(self.final_font_size.get()) if self.final_font_size.get().isdigit() else 60,
+            'color': self.font_color.get()
+        }
+        overlay_data['font_settings'] = font_settings
+        return overlay_data
+        
+    def apply_ranking(self, show_popup=True):
+        """Apply ranking data lên background 01"""
+        if not self.has_output():
+            messagebox.showwarning("Cảnh báo", "Vui lòng mở display trước", parent=self.root)
+            return
+            
+        # Thu thập data từ input fields
+        payload = self.ranking_payload()
+        overlay_data = self.build_ranking_overlay(payload)
         
         # Hiển thị background với overlay
-        success = self.display_window.show_background("01", overlay_data)
+        success = self.present("01", overlay_data)
         
         if success:
             self.current_mode = "01"
+            self.record_event('ranking', payload)
+            self.save_round_history(overlay_data)
+            self.update_ticker()
             if show_popup:
-                messagebox.showinfo("Thành công", "Đã cập nhật ranking")
+                messagebox.showinfo("Thành công", "Đã cập nhật ranking", parent=self.root)
         else:
             if show_popup:
-                messagebox.showerror("Lỗi", "Không thể cập nhật ranking")
+                messagebox.showerror("Lỗi", "Không thể cập nhật ranking", parent=self.root)
             
     def apply_final_results(self, show_popup=True):
         """Apply final results lên background 02"""
-        if not self.display_window:
-            messagebox.showwarning("Cảnh báo", "Vui lòng mở display trước")
+        if not self.has_output():
+            messagebox.showwarning("Cảnh báo", "Vui lòng mở display trước", parent=self.root)
             return
             
         # Thu thập data từ input fields
-        overlay_data = {}
-        for key, var in self.final_vars.items():
-            overlay_data[key] = var.get()
-            
-        # Thu thập tọa độ điểm gốc cho final results
-        positions = {}
-        for key, pos_var in self.final_positions.items():
-            try:
-                pos = pos_var.get().split(',')
-                positions[key] = (int(pos[0]), int(pos[1]))
-            except (ValueError, IndexError):
-                positions[key] = None
-                
-        overlay_data['positions'] = positions
-        
-        # Font settings cho final results
-        font_settings = {
-            'font_name': self.font_name.get(),
-            'font_size': int(self.final_font_size.get()) if self.final_font_size.get().isdigit() else 60,
-            'color': self.font_color.get()
-        }
-        overlay_data['font_settings'] = font_settings
+        payload = self.final_payload()
+        overlay_data = self.build_final_overlay(payload)
         
         # Hiển thị background với overlay
-        success = self.display_window.show_background("02", overlay_data)
+        success = self.present("02", overlay_data)
         
         if success:
+            self.cancel_reveal()
             self.current_mode = "02"
+            self.record_event('final', payload)
             if show_popup:
-                messagebox.showinfo("Thành công", "Đã cập nhật final results")
+                messagebox.showinfo("Thành công", "Đã cập nhật final results", parent=self.root)
         else:
             if show_popup:
-                messagebox.showerror("Lỗi", "Không thể cập nhật final results")
+                messagebox.showerror("Lỗi", "Không thể cập nhật final results", parent=self.root)
             
-    def run(self):
-        """Chạy ứng dụng"""
+    def prepare_reveal(self):
+        """Render sẵn mọi stage reveal của background 02 trong worker rồi hiện stage đầu (chưa công bố ai).
+
+        Chỉ có display node từ xa (không mở display trên máy này): không render frame, các bước reveal
+        chỉ phát overlay của từng stage tới node.
+        """
+        if not self.has_output():
+            messagebox.showwarning("Cảnh báo", "Vui lòng mở display trước", parent=self.root)
+            return
+        if self._reveal_future is not None:
+            return
+            
+        payload = self.final_payload()
+        stages = reveal_stages(self.build_final_overlay(payload))
+        if len(stages) < 2:
+            messagebox.showwarning("Cảnh báo", "Chưa nhập final results", parent=self.root)
+            return
+            
+        self.cancel_reveal()
+        self.reveal_payload = payload
+        self.reveal_keys = [key for key in REVEAL_ORDER if payload.get(key)]
+        self.reveal_overlays = stages
+        if not self.display_window:
+            self.begin_reveal()
+            return
+        renderer = self.display_window.renderer
+        self._reveal_window = self.display_window
+        self._reveal_future = self.render_pool.submit(self.render_reveal_frames, renderer, stages,
+                                                      self.display_window.window_size())
+        self.reveal_label.config(text=f"Reveal: rendering {len(stages)} stages...")
+        self._reveal_poll_job = self.root.after(PREVIEW_POLL_MS, self.poll_reveal)
+        
+    def render_reveal_frames(self, renderer, stages, window_size):
+        """(Worker) render từng stage thành ảnh PIL riêng - compositor riêng để không đụng buffer của display"""
+        compositor = NumpyCompositor(renderer) if HAS_NUMPY else None
+        return [render_window_frame(renderer, "02", stage, window_size, compositor).copy() for stage in stages]
+        
+    def poll_reveal(self):
+        """Nhận frame từ worker, tạo PhotoImage cho từng stage và hiện stage 0"""
+        future = self._reveal_future
+        if not future.done():
+            self._reveal_poll_job = self.root.after(PREVIEW_POLL_MS, self.poll_reveal)
+            return
+        self._reveal_poll_job = None
+        self._reveal_future = None
+        if self._reveal_window is not self.display_window:
+            # Display đã đóng / mở lại trong lúc render
+            self.cancel_reveal()
+            return
+        try:
+            self.reveal_frames = [ImageTk.PhotoImage(image) for image in future.result()]
+        except Exception as e:
+            print(f"Lỗi khi render reveal: {e}")
+            self.cancel_reveal()
+            return
+        self.begin_reveal()
+        
+    def begin_reveal(self):
+        """Hiện stage 0 (chưa công bố ai) khi các stage đã sẵn sàng"""
+        self.current_mode = "02"
+        self.show_reveal_stage(0)
+        self.update_reveal_label()
+        
+    def show_reveal_stage(self, index):
+        """Hiện frame đã render sẵn (nếu có display trên máy này) và phát overlay của stage tới node"""
+        self.reveal_index = index
+        if self.display_window:
+            self.display_window.show_photo(self.reveal_frames[index], "02")
+        self.publish_state("02", self.reveal_overlays[index])
+        
+    def reveal_step(self, delta):
+        """Công bố hạng tiếp theo (delta=1) hoặc lùi lại (delta=-1) - chỉ đổi ảnh đã render sẵn"""
+        if self.display_window:
+            scene = self.display_window.current_background
+        else:
+            scene = self.last_presented[0] if self.last_presented else None
+        if (not self.reveal_overlays or self._reveal_future is not None
+                or self._reveal_window is not self.display_window or scene != "02"):
+            return
+        index = max(0, min(self.reveal_index + delta, len(self.reveal_overlays) - 1))
+        if index == self.reveal_index:
+            return
+        self.show_reveal_stage(index)
+        if index == len(self.reveal_overlays) - 1:
+            # Đã công bố đủ: lưu như apply final results
+            self.record_event('final', self.reveal_payload)
+        self.update_reveal_label()
+        
+    def on_reveal_key(self, event, delta):
+        """PageDown / PageUp trên cửa sổ điều khiển: bước reveal, trừ khi đang gõ trong ô nhập"""
+        if isinstance(event.widget, (tk.Entry, tk.Text, tk.Spinbox)):
+            return
+        self.reveal_step(delta)
+        
+    def update_reveal_label(self):
+        """Hiển thị tiến độ reveal"""
+        total = len(self.reveal_keys)
+        if self.reveal_index == 0:
+            text = f"Reveal: ready 0/{total} - Space / → / PageDown to reveal"
+        else:
+            text = f"Reveal: {self.reveal_index}/{total} ({self.reveal_keys[self.reveal_index - 1]})"
+        self.reveal_label.config(text=text)
+        
+    def cancel_reveal(self):
+        """Bỏ các frame reveal đã render (display mới / final results đã apply)"""
+        self.reveal_frames = []
+        self.reveal_overlays = []
+        self.reveal_index = 0
+        self._reveal_window = None
+        if hasattr(self, 'reveal_label'):
+            self.reveal_label.config(text="Reveal: not prepared")
+        
+    def import_scores(self):
+        """Import điểm thô (player,round,score) và điền bảng xếp hạng / final results"""
+        path = filedialog.askopenfilename(title="Chọn file điểm (player,round,score)",
+                                          filetypes=[("CSV", "*.csv"), ("All files", "*.*")],
+                                          parent=self.root)
+        if not path:
+            return
+        try:
+            count = self.scoreboard.load_csv(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Lỗi", f"Không thể import điểm: {e}", parent=self.root)
+            return
+        self.fill_from_scoreboard()
+        self.update_ticker()
+        self.status_label.config(text=f"Imported {count} scores ({len(self.scoreboard.players)} players)")
+        
+    @contextmanager
+    def batch_update(self):
+        """Điền nhiều ô nhập như một lần sửa: bỏ các preview trung gian, render preview một lần ở cuối"""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+        if not self._batch_depth:
+            self.schedule_preview()
+            
+    def open_bulk_entry(self):
+        """Cửa sổ dán khối text / bảng tính để điền round, ranks và final results một lần"""
+        window = tk.Toplevel(self.root)
+        window.title("ScoShow - Bulk Entry")
+        window.transient(self.root)
+        frame = ttk.Frame(window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(frame, text="Mỗi dòng: tên, hoặc hạng<tab>tên (copy từ bảng tính). "
+                              "Dòng \"Round 7\" đặt round, dòng \"Final\" chuyển sang kết quả cuối.",
+                  font=('Arial', 8), foreground='#7F8C8D', wraplength=460).pack(anchor=tk.W, pady=(0, 5))
+        text = tk.Text(frame, width=60, height=18, font=('Consolas', 10))
+        text.pack(fill=tk.BOTH, expand=True)
+        
+        def paste_clipboard():
+            try:
+                clipboard = window.clipboard_get()
+            except tk.TclError:
+                return
+            text.delete('1.0', tk.END)
+            text.insert('1.0', clipboard)
+            
+        show_now = tk.BooleanVar(value=self.has_output())
+        
+        def apply():
+            try:
+                entry = parse_bulk_entry(text.get('1.0', tk.END))
+            except ValueError as e:
+                messagebox.showerror("Lỗi", str(e), parent=window)
+                return
+            self.apply_bulk_entry(entry, show=show_now.get())
+            window.destroy()
+            
+        buttons = ttk.Frame(frame)
+        buttons.pack(fill=tk.X, pady=(8, 0))
+        ttk.Button(buttons, text="📋 Paste Clipboard", style='Action.TButton',
+                  command=paste_clipboard).pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Checkbutton(buttons, text="Show on display", variable=show_now).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="✅ Apply", style='Success.TButton',
+                  command=apply).pack(side=tk.RIGHT)
+        
+        paste_clipboard()
+        text.focus_set()
+        
+    def apply_bulk_entry(self, entry, show=True):
+        """Điền round / ranks / final results (kết quả của parse_bulk_entry) trong một lần sửa.
+
+        Chỉ render một lần: preview một lần khi điền xong và (nếu show) một lần present lên
+        display - frame mới thay frame cũ trong một bước nên người xem không thấy bảng cập nhật dở.
+        """
+        # Scene hiển thị: final results nếu chỉ nhập final (hoặc đang ở scene 02), còn lại ranking
+        scene = "02" if entry['final'] is not None and (entry['ranking'] is None or self.current_mode == "02") else "01"
+        with self.batch_update():
+            if entry['round'] is not None:
+                self.round_var.set(entry['round'])
+            if entry['ranking'] is not None:
+                for rank, var in self.rank_vars.items():
+                    var.set(entry['ranking'][rank])
+            if entry['final'] is not None:
+                for key, var in self.final_vars.items():
+                    var.set(entry['final'][key])
+            self.schedule_preview(scene)  # Preview render scene sẽ hiển thị (một lần, khi batch xong)
+            
+        filled = sum(1 for part in (entry['ranking'], entry['final']) if part for name in part.values() if name)
+        self.status_label.config(text=f"Bulk entry: {filled} names filled")
+        if not show or not self.has_output():
+            return
+        if scene == "02":
+            self.apply_final_results(show_popup=False)
+        else:
+            self.apply_ranking(show_popup=False)
+            
+    def reset_scores(self):
+        """Xóa bảng điểm thô"""
+        self.scoreboard = ScoreBoard()
+        self.update_ticker()
+        self.status_label.config(text="Scores reset")
+        
+    def fill_from_scoreboard(self):
+        """Điền round, top 10 và top 5 từ bảng điểm"""
+        ranking = self.scoreboard.ranking_payload()
+        final = self.scoreboard.final_payload()
+        with self.batch_update():
+            self.round_var.set(ranking['round'])
+            for rank, var in self.rank_vars.items():
+                var.set(ranking[rank])
+            for key, var in self.final_vars.items():
+                var.set(final[key])
+            
+    def countdown_style(self):
+        """(vị trí, (font, cỡ chữ, màu)) của đồng hồ theo các ô nhập"""
+        try:
+            x, y, box = parse_position(self.countdown_position.get())
+        except ValueError:
+            x, y = 3450, 40  # default
+        size = self.countdown_font_size.get()
+        return (x, y), (self.font_name.get(), int(size) if size.isdigit() else 120, self.font_color.get())
+        
+    def start_countdown(self):
+        """Bắt đầu đếm ngược theo thời lượng đã nhập"""
+        try:
+            seconds = parse_duration(self.countdown_duration.get())
+        except ValueError as e:
+            messagebox.showerror("Lỗi", str(e), parent=self.root)
+            return
+        self.countdown_state = ('countdown', time.perf_counter() + seconds, seconds)
+        self.update_countdown()
+        self.status_label.config(text=f"Countdown started: {format_clock(seconds, countdown_pattern(seconds))}")
+        
+    def start_clock(self):
+        """Hiện giờ hiện tại trên display"""
+        self.countdown_state = ('clock',)
+        self.update_countdown()
+        
+    def stop_countdown(self):
+        """Dừng và ẩn đồng hồ"""
+        self.countdown_state = None
+        self.update_countdown()
+        
+    def update_countdown(self):
+        """Áp dụng countdown_state lên display hiện tại (tạo overlay khi cần)"""
+        display = self.display_window
+        if not display:
+            return
+        if self.countdown_state is None:
+            if display.countdown:
+                display.countdown.stop()
+            return
+        if display.countdown is None:
+            display.countdown = CountdownOverlay(display)
+        position, style = self.countdown_style()
+        if self.countdown_state[0] == 'clock':
+            display.countdown.start_clock(position, style)
+        else:
+            kind, end_time, seconds = self.countdown_state
+            display.countdown.start_countdown(end_time, seconds, position, style)
+            
+    def select_playlist_folder(self):
+        """Chọn thư mục slide / clip tài trợ (thứ tự theo playlist.txt hoặc theo tên file)"""
+        folder = filedialog.askdirectory(title="Chọn thư mục slide tài trợ", parent=self.root)
+        if folder:
+            self.playlist_folder = folder
+            self.playlist_label.config(text=os.path.basename(folder))
+            self.schedule_autosave()
+            self.update_playlist()
+            
+    def update_playlist(self):
+        """Tạo / thay / gỡ playlist trên display; chạy khi đang ở background 00"""
+        display = self.display_window
+        if not display:
+            return
+        items = []
+        if self.playlist_enabled.get() and self.playlist_folder:
+            try:
+                items = load_playlist(self.playlist_folder)
+            except (OSError, ValueError) as e:
+                print(f"Lỗi khi đọc playlist: {e}")
+                self.status_label.config(text=f"Playlist error: {e}")
+        try:
+            seconds = max(1.0, float(self.playlist_seconds.get()))
+        except ValueError:
+            seconds = DEFAULT_SLIDE_SECONDS
+            
+        key = (self.playlist_folder, seconds, tuple((item.path, item.seconds) for item in items))
+        if display.playlist and (not items or display.playlist.key != key):
+            display.playlist.stop()
+            display.playlist = None
+        if not items:
+            return
+        if display.playlist is None:
+            display.playlist = PlaylistPlayer(display, self.render_pool, items, seconds, key,
+                                              present=self.present)
+        if display.current_background == "00":
+            display.playlist.start()
+            
+    def ticker_standings(self):
+        """Bảng xếp hạng cho ticker (tối đa TICKER_MAX_ENTRIES người đầu): từ bảng điểm, không có thì từ ô rank"""
+        if self.scoreboard.players:
+            return self.scoreboard.standings(TICKER_MAX_ENTRIES)
+        names = [var.get().strip() for var in self.rank_vars.values()]
+        return [(index + 1, name, None) for index, name in enumerate(names) if name]
+        
+    def update_ticker(self):
+        """Tạo / cập nhật / gỡ ticker trên display (dải chỉ render lại khi text đổi)"""
+        display = self.display_window
+        if not display:
+            return
+        text = ticker_text(self.ticker_standings()) if self.ticker_enabled.get() else ''
+        if not text:
+            if display.ticker:
+                display.ticker.destroy()
+                display.ticker = None
+            return
+        if display.ticker is None:
+            display.ticker = TickerLayer(display, self.render_pool)
+        display.ticker.set_text(text, self.font_name.get(), self.font_color.get())
+        if display.current_background == "00":
+            display.ticker.show()
+            
+    def save_round_history(self, overlay_data):
+        """Lưu snapshot ranking vào lịch sử round"""
+        try:
+            if self.history.add(overlay_data) and self.history_window:
+                self.refresh_history_browser()
+        except Exception as e:
+            print(f"Lỗi khi lưu lịch sử round: {e}")
+            
+    def open_history_browser(self):
+        """Mở cửa sổ duyệt lịch sử round"""
+        if self.history_window:
+            self.history_window.lift()
+            return
+            
+        self.history_window = tk.Toplevel(self.root)
+        self.history_window.title("ScoShow - Round History")
+        self.history_window.geometry("420x360")
+        
+        frame = ttk.Frame(self.history_window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        list_frame = ttk.Frame(frame)
+        list_frame.pack(fill=tk.BOTH, expand=True)
+        self.history_listbox = tk.Listbox(list_frame, font=('Arial', 9), activestyle='dotbox')
+        history_scroll = ttk.Scrollbar(list_frame, orient="vertical", command=self.history_listbox.yview)
+        self.history_listbox.configure(yscrollcommand=history_scroll.set)
+        self.history_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        history_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.history_listbox.bind('<Double-Button-1>', lambda e: self.show_history_round())
+        
+        buttons = ttk.Frame(frame)
+        buttons.pack(fill=tk.X, pady=(8, 0))
+        ttk.Button(buttons, text="📊 Show Round", style='Success.TButton',
+                  command=self.show_history_round).pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Button(buttons, text="📝 Load Into Inputs", style='Action.TButton',
+                  command=lambda: self.show_history_round(show=False)).pack(side=tk.LEFT)
+        
+        # Export toàn bộ lịch sử ra ảnh (render song song nhiều process)
+        from batch_export import OUTPUT_SIZES
+        export_frame = ttk.Frame(frame)
+        export_frame.pack(fill=tk.X, pady=(8, 0))
+        self.export_size = tk.StringVar(value='1080p')
+        ttk.Label(export_frame, text="Size:").pack(side=tk.LEFT)
+        ttk.Combobox(export_frame, textvariable=self.export_size, values=sorted(OUTPUT_SIZES),
+                     width=8, state="readonly").pack(side=tk.LEFT, padx=(5, 8))
+        ttk.Button(export_frame, text="📤 Export All Rounds", style='Warning.TButton',
+                  command=self.export_history).pack(side=tk.LEFT)
+        
+        def on_close():
+            self.history_window.destroy()
+            self.history_window = None
+        self.history_window.protocol("WM_DELETE_WINDOW", on_close)
+        
+        self.refresh_history_browser()
+        
+    def refresh_history_browser(self):
+        """Nạp lại danh sách round trong cửa sổ lịch sử"""
+        self.history_entries = self.history.rounds()
+        self.history_listbox.delete(0, tk.END)
+        for round_value, applied_at, data in self.history_entries:
+            applied = time.strftime('%H:%M:%S', time.localtime(applied_at))
+            leader = data.get('1st') or '-'
+            self.history_listbox.insert(tk.END, f"Round {round_value}  ({applied})  🥇 {leader}")
+            
+    def show_history_round(self, show=True):
+        """Gọi lại round đã chọn: nạp vào ô nhập và (tùy chọn) hiển thị ngay"""
+        selection = self.history_listbox.curselection()
+        if not selection:
+            messagebox.showinfo("Thông báo", "Vui lòng chọn một round", parent=self.history_window)
+            return
+        round_value, applied_at, data = self.history_entries[selection[0]]
+        
+        with self.batch_update():
+            self.round_var.set(data.get('round', ''))
+            for rank, var in self.rank_vars.items():
+                var.set(data.get(rank, ''))
+        if not show:
+            return
+            
+        if not self.has_output():
+            messagebox.showwarning("Cảnh báo", "Vui lòng mở display trước", parent=self.history_window)
+            return
+        # Hiển thị đúng snapshot đã lưu (frame đã render sẽ lấy từ cache)
+        if self.present("01", data):
+            self.current_mode = "01"
+            self.record_event('ranking', self.ranking_payload())
+            self.update_ticker()
+            self.status_label.config(text=f"Showing round {round_value} from history")
+            
+    def export_history(self):
+        """Export mọi snapshot trong lịch sử ra ảnh ở thư mục được chọn (chạy nền)"""
+        from batch_export import OUTPUT_SIZES, export_batch
+        
+        payloads = [("01", data) for round_value, applied_at, data in self.history.all_snapshots()]
+        if not payloads:
+            messagebox.showinfo("Thông báo", "Chưa có round nào trong lịch sử", parent=self.history_window)
+            return
+        out_dir = filedialog.askdirectory(title="Chọn thư mục export", parent=self.history_window)
+        if not out_dir:
+            return
+            
+        size = OUTPUT_SIZES[self.export_size.get()]
+        result = {}
+        
+        def worker():
+            try:
+                result['written'] = export_batch(payloads, self.background_folder, out_dir, size)
+            except Exception as e:
+                result['error'] = e
+                
+        def poll():
+            self._export_poll_job = None
+            if thread.is_alive():
+                self._export_poll_job = self.root.after(200, poll)
+            elif 'error' in result:
+                messagebox.showerror("Lỗi", f"Export thất bại: {result['error']}", parent=self.root)
+            else:
+                self.status_label.config(text=f"Exported {len(result['written'])} images to {out_dir}")
+                
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        self.status_label.config(text=f"Exporting {len(payloads)} rounds...")
+        poll()
+        
+    def warm_up(self):
+        """Load trước ảnh nền và font trong thread nền, sau khi cửa sổ đã hiện"""
+        folder = self.background_folder
+        font_name = self.font_name.get()
+        sizes = {self.rank_font_size.get(), self.round_font_size.get(), self.final_font_size.get()}
+        
+        def worker():
+            t0 = time.perf_counter()
+            try:
+                if folder and os.path.isdir(folder):
+                    for filename in BACKGROUND_FILES:
+                        path = os.path.join(folder, filename)
+                        if os.path.exists(path):
+                            load_background(path)
+                for size in sizes:
+                    if size.isdigit():
+                        load_font(font_name, int(size))
+            except Exception as e:
+                print(f"Lỗi khi warm-up: {e}")
+            self.startup_timings['warmup_ms'] = round((time.perf_counter() - t0) * 1000, 1)
+            
+        threading.Thread(target=worker, daemon=True).start()
+        
+    def on_first_frame(self):
+        """Gọi khi cửa sổ điều khiển đã vẽ xong lần đầu"""
+        self.startup_timings['first_frame_ms'] = round((time.perf_counter() - _IMPORT_T0) * 1000, 1)
+        if self.startup_benchmark:
+            print("STARTUP " + json.dumps(self.startup_timings))
+            self.root.destroy()
+            return
+        self.setup_deferred_ui()
+        self.warm_up()
+        
+    def start(self):
+        """Khôi phục trạng thái và bắt đầu các vòng lặp nền (chưa chạy mainloop)"""
         # Update background folder status nếu có config
         if self.background_folder and os.path.exists(self.background_folder):
             self.bg_status_label.config(text="✓ Background OK")
             
-        # Xử lý sự kiện đóng ứng dụng
-        def on_closing():
-            self.save_config()  # Save config khi đóng
-            if self.display_window:
-                self.display_window.close()
+        # Warm-up / đo thời gian sau khi cửa sổ đã hiện lên
+        self.root.after_idle(lambda: self.root.after(0, self.on_first_frame))
+        
+        # Khôi phục display sau crash và fsync journal định kỳ
+        if not self.startup_benchmark:
+            self.root.after_idle(self.restore_display)
+            if self.publish_enabled.get():
+                self.root.after_idle(self.start_publisher)
+        self._journal_job = self.root.after(JOURNAL_SYNC_MS, self.sync_journal)
+        
+        # Xử lý sự kiện đóng cửa sổ
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        
+    def close(self):
+        """Lưu config, đóng journal / lịch sử / display và hủy cửa sổ điều khiển"""
+        # Hủy mọi vòng root.after: với Tk root dùng chung, callback còn hẹn sẽ chạy trên widget đã hủy
+        for job in (self._autosave_job, self._journal_job, self._preview_job, self._preview_poll_job,
+                    self._reveal_poll_job, self._export_poll_job, self._node_count_job):
+            if job is not None:
+                self.root.after_cancel(job)
+        self._autosave_job = self._journal_job = self._preview_job = self._preview_poll_job = None
+        self._reveal_poll_job = self._export_poll_job = self._node_count_job = None
+        if self.profiler:
+            # Đóng app giữa chừng vẫn ghi phần profile đã lấy được
+            self.finish_profile()
+        self.save_config()  # Save config khi đóng
+        self.journal.close()
+        self.history.close()
+        self.stop_publisher()
+        if self.display_window:
+            self.display_window.close()
+            self.display_window = None
+        if self.sessions:
+            # Worker render dùng chung - TournamentSessions tắt khi session cuối đóng
+            self.root.destroy()
+            self.sessions.session_closed(self)
+        else:
+            self.render_pool.shutdown(wait=False, cancel_futures=True)
+            self.root.destroy()
+            
+    def run(self):
+        """Chạy ứng dụng"""
+        self.start()
+        self.root.mainloop()
+
+class TournamentSessions:
+    """Nhiều tournament chạy song song trong một process.
+
+    Mỗi session là một cửa sổ điều khiển riêng (ranking, scene, màn hình, config,
+    journal, lịch sử riêng). Cache ảnh nền / font / sprite là cache cấp module nên
+    dùng chung; worker render cũng dùng chung một pool.
+    """
+    
+    def __init__(self, names):
+        self.root = tk.Tk()
+        self.root.withdraw()
+        self.render_pool = ThreadPoolExecutor(max_workers=SESSION_RENDER_WORKERS,
+                                              thread_name_prefix="scoshow-render")
+        self.panels = []
+        for name in names:
+            self.open_session(name)
+            
+    def open_session(self, name):
+        """Mở cửa sổ điều khiển cho session name (tên dùng trong tên file config)"""
+        if not valid_session_name(name):
+            raise ValueError(f"Tên session không hợp lệ: {name!r}")
+        for panel in self.panels:
+            if panel.session == name:
+                panel.root.lift()
+                return panel
+        panel = TournamentControlPanel(session=name, sessions=self)
+        self.panels.append(panel)
+        panel.start()
+        return panel
+        
+    def ask_new_session(self, parent):
+        """Hỏi tên và mở session mới"""
+        from tkinter import simpledialog
+        name = simpledialog.askstring("New Session", "Tên session (chữ, số, - hoặc _):", parent=parent)
+        if name is None:
+            return
+        try:
+            self.open_session(name.strip())
+        except ValueError as e:
+            messagebox.showerror("Lỗi", str(e), parent=parent)
+            
+    def monitor_owner(self, monitor_index, exclude=None):
+        """Session khác đang mở display trên màn hình monitor_index (hoặc None)"""
+        for panel in self.panels:
+            if (panel is not exclude and panel.display_window
+                    and panel.selected_monitor.get() == monitor_index):
+                return panel
+        return None
+        
+    def session_closed(self, panel):
+        """Session đóng cửa sổ; đóng hết thì tắt pool và thoát"""
+        if panel in self.panels:
+            self.panels.remove(panel)
+        if not self.panels:
+            self.render_pool.shutdown(wait=False, cancel_futures=True)
             self.root.destroy()
             
-        self.root.protocol("WM_DELETE_WINDOW", on_closing)
+    def run(self):
+        """Chạy mainloop chung cho mọi session"""
         self.root.mainloop()
 
 def main():
@@ -958,5 +3284,7 @@ def main():
     except Exception as e:
         messagebox.showerror("Lỗi", f"Đã xảy ra lỗi: {e}")
 
+_IMPORT_DONE_MS = (time.perf_counter() - _IMPORT_T0) * 1000
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Soak test bộ nhớ cho vòng hiển thị của ScoShow
+Chạy hàng nghìn chu kỳ apply_ranking / đổi scene, ghi RSS, số ảnh Tk và peak tracemalloc theo thời gian
+
+Có DISPLAY: điều khiển panel + display thật (session "soak" trong thư mục tạm).
+Không có DISPLAY: chỉ chạy đường render (SceneRenderer / NumpyCompositor) như display làm.
+"""
+
+import os
+import sys
+import csv
+import time
+import argparse
+import tempfile
+import tracemalloc
+from collections import OrderedDict
+
+import scoshow
+from bench_compositing import sample_payload
+from memory_stats import format_mb, rss_bytes, tk_image_count
+
+RANKS = ['1st', '2nd', '3rd', '4th', '5th', '6th', '7th', '8th', '9th', '10th']
+FINALS = ['winner', 'second', 'third', 'fourth', 'fifth']
+
+# Tên xoay vòng: số overlay khác nhau có giới hạn nên các cache đều đạt trạng thái ổn định
+NAMES = [f"{family} {given}" for family in ("Nguyễn", "Trần", "Lê", "Phạm", "Hoàng")
+         for given in ("An", "Bình", "Châu", "Dũng", "Giang", "Hùng", "Khoa", "Linh")]
+
+# Mẫu trước chu kỳ này (và trước 20% đầu của lần chạy) là warm-up: cache font / sprite / frame còn đang đầy lên
+WARMUP_CYCLES = 200
+# Số mẫu tối thiểu sau warm-up để kết luận có rò bộ nhớ hay không
+MIN_SAMPLES_AFTER_WARMUP = 4
+
+def cycle_scene(cycle):
+    """Scene của chu kỳ: ('00', None), ('01', {rank: tên}) hoặc ('02', {key: tên})"""
+    if cycle % 20 == 19:
+        return "00", None
+    names = NAMES[cycle % len(NAMES):] + NAMES[:cycle % len(NAMES)]
+    if cycle % 10 == 9:
+        return "02", dict(zip(FINALS, names))
+    return "01", dict(zip(RANKS, names), round=str(cycle // 10 + 1))
+
+class MemorySampler:
+    """Ghi số liệu bộ nhớ theo chu kỳ; peak tracemalloc được reset sau mỗi lần lấy mẫu"""
+
+    FIELDS = ['cycle', 'seconds', 'rss', 'tk_images', 'traced', 'traced_peak']
+
+    def __init__(self, trace=True):
+        self.trace = trace
+        self.samples = []
+        self.t0 = time.perf_counter()
+        if trace:
+            tracemalloc.start()
+
+    def sample(self, cycle, tk_images=None):
+        traced, peak = tracemalloc.get_traced_memory() if self.trace else (None, None)
+        if self.trace:
+            tracemalloc.reset_peak()
+        row = {'cycle': cycle, 'seconds': round(time.perf_counter() - self.t0, 1), 'rss': rss_bytes(),
+               'tk_images': tk_images, 'traced': traced, 'traced_peak': peak}
+        self.samples.append(row)
+        print(f"{cycle:7d}  {row['seconds']:7.1f}s  RSS {format_mb(row['rss']):>10s}  "
+              f"Tk images {'-' if tk_images is None else tk_images:>4}  "
+              f"traced {format_mb(traced):>10s}  peak {format_mb(peak):>10s}")
+
+    def write_csv(self, path):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+            writer.writeheader()
+            writer.writerows(self.samples)
+
+    def baseline(self, warmup=0.2):
+        """Chỉ số mẫu đầu tiên sau warm-up, None nếu sau đó chưa có đủ MIN_SAMPLES_AFTER_WARMUP mẫu"""
+        if not self.samples:
+            return None
+        threshold = max(WARMUP_CYCLES, self.samples[-1]['cycle'] * warmup)
+        for index, row in enumerate(self.samples):
+            if row['cycle'] >= threshold:
+                return index if len(self.samples) - 1 - index >= MIN_SAMPLES_AFTER_WARMUP else None
+        return None
+
+    def growth(self, field, warmup=0.2):
+        """Tăng trưởng của field từ cuối giai đoạn warm-up tới mẫu cuối (None nếu không đo được)"""
+        index = self.baseline(warmup)
+        if index is None:
+            return None
+        base = self.samples[index][field]
+        last = self.samples[-1][field]
+        if base is None or last is None:
+            return None
+        return last - base
+
+def tk_available():
+    """Có thể tạo cửa sổ Tk (có màn hình) hay không"""
+    try:
+        root = scoshow.tk.Tk()
+    except scoshow.tk.TclError:
+        return False
+    root.destroy()
+    return True
+
+def run_tk(args, sampler):
+    """Soak qua panel thật: apply_ranking / apply_final_results / show 00 trên display mở sẵn"""
+    folder = os.path.abspath(args.folder)
+    workdir = tempfile.mkdtemp(prefix="scoshow-soak-")
+    os.chdir(workdir)  # config / journal / lịch sử của session soak nằm trong thư mục tạm
+
+    panel = scoshow.TournamentControlPanel(session="soak")
+    panel.start()
+    panel.background_folder = folder
+    panel.reuse_buffers.set(args.reuse_buffers)
+    panel.memory_gauge.set(True)
+    panel.open_display()
+    if not panel.display_window:
+        print("Không mở được display")
+        return False
+
+    for cycle in range(args.cycles):
+        bg_id, names = cycle_scene(cycle)
+        if bg_id == "00":
+            panel.show_background("00")
+        elif bg_id == "01":
+            panel.round_var.set(names.pop('round'))
+            for rank, name in names.items():
+                panel.rank_vars[rank].set(name)
+            panel.apply_ranking(show_popup=False)
+        else:
+            for key, name in names.items():
+                panel.final_vars[key].set(name)
+            panel.apply_final_results(show_popup=False)
+        panel.root.update()
+        if cycle % args.sample_every == 0 or cycle == args.cycles - 1:
+            sampler.sample(cycle, tk_image_count(panel.root))
+
+    panel.close()
+    return True
+
+def run_render(args, sampler):
+    """Soak đường render không cần Tk: frame giữ lại như display (cache LRU hoặc buffer dùng lại)"""
+    renderer = scoshow.SceneRenderer()
+    if not renderer.load_background_folder(args.folder):
+        print(f"Không tìm thấy ảnh nền trong {args.folder}")
+        return False
+    compositor = scoshow.NumpyCompositor(renderer) if scoshow.HAS_NUMPY else None
+    window_size = tuple(int(v) for v in args.size.split('x'))
+    ranking = sample_payload(args.font)
+    final_settings = {'font_name': args.font, 'font_size': 60, 'color': 'white'}
+    final_positions = {key: (1920, 300 + index * 150) for index, key in enumerate(FINALS)}
+
+    cache = OrderedDict()
+    buffers = [None, None]
+    front = 0
+    for cycle in range(args.cycles):
+        bg_id, names = cycle_scene(cycle)
+        if bg_id == "01":
+            overlay_data = dict(ranking, **names)
+        elif bg_id == "02":
+            overlay_data = dict(names, positions=final_positions, boxes={}, font_settings=final_settings)
+        else:
+            overlay_data = None
+
+        image = scoshow.render_window_frame(renderer, bg_id, overlay_data, window_size, compositor)
+
+        if args.reuse_buffers:
+            front = 1 - front
+            if buffers[front] is None or buffers[front].size != image.size:
+                buffers[front] = scoshow.Image.new('RGB', image.size)
+            buffers[front].paste(image)
+        else:
+            # Như PhotoImage mới cho mỗi cập nhật, giữ RENDER_CACHE_SIZE frame gần nhất
+            cache[(bg_id, repr(overlay_data))] = image.copy()
+            if len(cache) > scoshow.RENDER_CACHE_SIZE:
+                cache.popitem(last=False)
+
+        if cycle % args.sample_every == 0 or cycle == args.cycles - 1:
+            sampler.sample(cycle)
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test bộ nhớ của vòng hiển thị")
+    parser.add_argument("--cycles", type=int, default=5000)
+    parser.add_argument("--sample-every", type=int, default=250, help="số chu kỳ giữa hai lần lấy mẫu")
+    parser.add_argument("--mode", choices=['auto', 'tk', 'render'], default='auto',
+                        help="tk: panel + display thật, render: chỉ đường render (không cần màn hình)")
+    parser.add_argument("--reuse-buffers", action="store_true", help="bật chế độ buffer dùng lại của display")
+    parser.add_argument("--folder", default="background", help="thư mục ảnh nền")
+    parser.add_argument("--font", default="arial.ttf", help="font cho chế độ render")
+    parser.add_argument("--size", default="1920x1080", help="kích thước display cho chế độ render")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="tắt tracemalloc (chạy nhanh hơn)")
+    parser.add_argument("--csv", help="ghi các mẫu ra file CSV")
+    parser.add_argument("--max-growth-mb", type=float, default=20.0,
+                        help="RSS được phép tăng sau warm-up (MB)")
+    args = parser.parse_args()
+
+    mode = args.mode
+    if mode == 'auto':
+        mode = 'tk' if tk_available() else 'render'
+    print(f"Soak {args.cycles} chu kỳ, chế độ {mode}, "
+          f"{'buffer dùng lại' if args.reuse_buffers else 'cache frame'}")
+
+    csv_path = os.path.abspath(args.csv) if args.csv else None
+    sampler = MemorySampler(trace=not args.no_tracemalloc)
+    ok = run_tk(args, sampler) if mode == 'tk' else run_render(args, sampler)
+    if not ok:
+        return 1
+    if csv_path:
+        sampler.write_csv(csv_path)
+
+    if sampler.baseline() is None:
+        print(f"⚠ Inconclusive: cần ít nhất {MIN_SAMPLES_AFTER_WARMUP} mẫu sau warm-up "
+              f"(chu kỳ {WARMUP_CYCLES} / 20% đầu) - tăng --cycles hoặc giảm --sample-every")
+        return 2
+
+    rss_growth = sampler.growth('rss')
+    tk_growth = sampler.growth('tk_images')
+    traced_growth = sampler.growth('traced')
+    print(f"Sau warm-up: RSS {'+' if (rss_growth or 0) >= 0 else ''}{format_mb(rss_growth)}, "
+          f"Tk images {'n/a' if tk_growth is None else f'{tk_growth:+d}'}, "
+          f"traced {format_mb(traced_growth)}")
+
+    failed = False
+    if rss_growth is not None and rss_growth > args.max_growth_mb * 1024 * 1024:
+        print(f"❌ RSS tăng quá {args.max_growth_mb} MB")
+        failed = True
+    if tk_growth is not None and tk_growth > 0:
+        print("❌ Số ảnh Tk tăng liên tục (PhotoImage bị rò)")
+        failed = True
+    if failed:
+        return 1
+    print("✓ Bộ nhớ ổn định")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
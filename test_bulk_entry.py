@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test parser nhập hàng loạt (bulk_entry.parse_bulk_entry) - không cần Tk
+    python test_bulk_entry.py
+"""
+
+import sys
+
+from bulk_entry import parse_bulk_entry
+
+def test_spreadsheet_with_header():
+    """Copy bảng tính kèm dòng tiêu đề: dòng tiêu đề bị bỏ qua, cột điểm không thành tên"""
+    result = parse_bulk_entry("Rank\tName\tScore\n1\tAlice\t10\n2\tBob\t9")
+    assert result['ranking']['1st'] == "Alice", result
+    assert result['ranking']['2nd'] == "Bob", result
+    assert result['ranking']['3rd'] == "", result
+    result = parse_bulk_entry("Hạng\tTên\tĐiểm\n1\tNguyễn Văn A\t30\n2\tTrần Thị B\t28")
+    assert result['ranking']['1st'] == "Nguyễn Văn A", result
+
+def test_numeric_name_not_label():
+    """Số đầu tên cách bằng dấu cách không phải nhãn hạng; dạng hạng rõ ràng thì vẫn là nhãn"""
+    result = parse_bulk_entry("10 Downing")
+    assert result['ranking']['1st'] == "10 Downing", result
+    assert result['ranking']['10th'] == "", result
+    result = parse_bulk_entry("#3 Carol\n1st Alice\n2. Bob\n10\tDave")
+    assert [result['ranking'][rank] for rank in ('1st', '2nd', '3rd', '10th')] == ["Alice", "Bob", "Carol", "Dave"]
+
+def test_header_only_on_first_line():
+    """Tên trùng từ tiêu đề ở giữa danh sách vẫn là tên"""
+    result = parse_bulk_entry("Alice\nTeam")
+    assert result['ranking']['2nd'] == "Team", result
+
+def test_duplicate_rank_rejected():
+    try:
+        parse_bulk_entry("1\tAlice\n1\tBob")
+    except ValueError as e:
+        assert "1st" in str(e)
+    else:
+        raise AssertionError("Hạng nhập hai lần phải raise ValueError")
+
+def main():
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print("Tất cả test nhập hàng loạt đều pass")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test đồng bộ display từ xa qua loopback: một publisher + nhiều display node headless (process riêng)
+Kiểm tra delta theo seq, node mới vào / khởi động lại và resync khi panel khởi động lại
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import socket
+import tempfile
+import threading
+import subprocess
+
+from display_sync import DisplayNodeClient, DisplayPublisher, encode_message, overlay_delta, normalize_overlay
+from bench_compositing import sample_payload
+
+def start_node(port, folder, state_file):
+    """Chạy một display node headless trong process riêng"""
+    return subprocess.Popen([sys.executable, "display_sync.py", "--connect", f"127.0.0.1:{port}",
+                             "--folder", folder, "--headless", "--size", "960x270",
+                             "--state-file", state_file], stdout=subprocess.DEVNULL)
+
+def read_state(path):
+    """State node đã ghi ra (None nếu chưa có)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def wait_synced(publisher, state_files, timeout=15.0):
+    """Chờ mọi node báo đúng seq / scene / overlay của publisher"""
+    expected = (publisher.session, publisher.seq, publisher.scene, publisher.overlay)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        states = [read_state(path) for path in state_files]
+        if all(state and (state['session'], state['seq'], state['scene'], state['overlay']) == expected
+               for state in states):
+            return states
+        time.sleep(0.05)
+    raise AssertionError(f"Node chưa đồng bộ sau {timeout}s (mong đợi seq {publisher.seq}): "
+                         f"{[(s or {}).get('seq') for s in states]}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Test display node qua loopback")
+    parser.add_argument("--folder", default="background", help="thư mục ảnh nền")
+    parser.add_argument("--nodes", type=int, default=3)
+    parser.add_argument("--font", default="DejaVuSans.ttf")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="scoshow-sync-")
+    state_files = [os.path.join(workdir, f"node{i}.json") for i in range(args.nodes)]
+    publisher = DisplayPublisher('127.0.0.1', 0).start()
+    port = publisher.port
+    nodes = [start_node(port, args.folder, path) for path in state_files]
+    try:
+        # 1. Chuỗi cập nhật bình thường: scene chờ, các round ranking, final
+        publisher.publish("00")
+        ranking = sample_payload(args.font)
+        for round_no in range(1, 6):
+            ranking = dict(ranking, round=str(round_no), **{'1st': f"Leader R{round_no}"})
+            publisher.publish("01", ranking)
+        wait_synced(publisher, state_files)
+        full_size = len(encode_message({'overlay': normalize_overlay(ranking)}))
+        changed, removed = overlay_delta(normalize_overlay(ranking),
+                                         normalize_overlay(dict(ranking, **{'2nd': "Someone"})))
+        delta_size = len(encode_message({'set': changed, 'unset': removed}))
+        print(f"✓ {args.nodes} node đồng bộ tới seq {publisher.seq} "
+              f"(full state {full_size} B, delta một tên {delta_size} B)")
+
+        # 1b. Node đã kết nối: các cập nhật tiếp theo chỉ đi bằng delta, không cần resync
+        for index in range(20):
+            ranking = dict(ranking, **{'2nd': f"Runner-up {index}"})
+            publisher.publish("01", ranking)
+        states = wait_synced(publisher, state_files)
+        assert all(state['resyncs'] == 0 for state in states), "Node không được resync khi chỉ nhận delta"
+        print(f"✓ 20 delta liên tiếp, không node nào phải resync (seq {publisher.seq})")
+
+        # 1c. Hello / message đúng JSON nhưng không phải object: server ngắt kết nối, node bỏ qua, không chết thread
+        thread_errors = []
+        threading.excepthook = thread_errors.append
+        for bogus in (b"[]\n", b"1\n"):
+            with socket.create_connection(('127.0.0.1', port), timeout=5) as sock:
+                sock.sendall(bogus)
+                assert sock.recv(1024) == b"", "Server phải ngắt kết nối khi hello không phải object"
+        time.sleep(0.1)
+        threading.excepthook = threading.__excepthook__
+        assert not thread_errors, f"Thread subscriber chết vì hello sai dạng: {thread_errors[0].exc_value!r}"
+        try:
+            DisplayNodeClient('127.0.0.1', port, lambda *state: None).handle([])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Node phải coi message không phải object là lỗi")
+        publisher.publish("01", dict(ranking, round="5b"))
+        wait_synced(publisher, state_files)
+        print("✓ Hello / message không phải object bị từ chối, các node vẫn đồng bộ")
+
+        # 2. Node khởi động lại giữa chừng: nhận full state khi vào lại
+        nodes[0].terminate()
+        nodes[0].wait()
+        os.remove(state_files[0])
+        publisher.publish("02", {'winner': "Champion", 'font_settings': {'font_name': args.font}})
+        nodes[0] = start_node(port, args.folder, state_files[0])
+        wait_synced(publisher, state_files)
+        print(f"✓ Node khởi động lại đã resync (seq {publisher.seq})")
+
+        # 3. Panel khởi động lại (session mới, seq về 0): node tự kết nối lại và nhận full state
+        publisher.close()
+        publisher = DisplayPublisher('127.0.0.1', port)
+        for _ in range(50):
+            try:
+                publisher.start()
+                break
+            except OSError:
+                time.sleep(0.1)
+        publisher.publish("01", dict(ranking, round="6"))
+        states = wait_synced(publisher, state_files)
+        print(f"✓ Resync sau khi panel khởi động lại (session mới, seq {publisher.seq}); "
+              f"render node {max(state['render_ms'] for state in states)} ms")
+        print("Tất cả test đồng bộ display đều pass")
+        return 0
+    except AssertionError as e:
+        print(f"✗ {e}")
+        return 1
+    finally:
+        for node in nodes:
+            node.terminate()
+        for node in nodes:
+            node.wait()
+        publisher.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
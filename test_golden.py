@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test hồi quy hình ảnh (golden image) và ngân sách thời gian render của ScoShow
+Render scene ranking / final từ payload cố định trên ảnh nền thật trong background/,
+so với ảnh golden trong golden/ (có dung sai cảm nhận) và so thời gian render với golden/budgets.json
+
+Chạy headless, font lấy từ fonts/ trong repo nên kết quả giống nhau trên mọi máy.
+    python test_golden.py              # kiểm tra
+    python test_golden.py --update     # ghi lại ảnh golden sau khi đã xem thay đổi là cố ý
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+import scoshow
+from scoshow import Image
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_DIR = os.path.join(HERE, "golden")
+BUDGETS_FILE = os.path.join(GOLDEN_DIR, "budgets.json")
+BACKGROUND_DIR = os.path.join(HERE, "background")
+FONT = os.path.join(HERE, "fonts", "DejaVuSans.ttf")
+
+# Kích thước cửa sổ display khi render (ảnh nền 3840x1080 -> 1920x540)
+WINDOW_SIZE = (1920, 1080)
+
+# Dung sai cảm nhận: so độ sáng sau khi làm mờ nhẹ, nên lệch khử răng cưa / lệch 1px không tính
+BLUR_RADIUS = 1.5
+# Mất một dấu thanh / dấu móc (ơ -> o) làm khác khoảng 25 pixel nên giới hạn phải nhỏ hơn thế
+PIXEL_THRESHOLD = 24   # chênh lệch độ sáng (0..255) sau blur để một pixel bị coi là khác
+MAX_DIFF_PIXELS = 10   # số pixel khác tối đa
+MAX_MEAN_DIFF = 0.5    # chênh lệch độ sáng trung bình tối đa (bắt lệch toàn ảnh, vd đổi cách resize nền)
+
+RANKS = ['1st', '2nd', '3rd', '4th', '5th', '6th', '7th', '8th', '9th', '10th']
+
+def ranking_payload():
+    """Ranking round 7, tên có dấu tiếng Việt"""
+    data = {'round': '7'}
+    positions = {'round': (1286, 917)}
+    for index, rank in enumerate(RANKS):
+        data[rank] = f"Người chơi {index + 1} Nguyễn Văn Đức"
+        positions[rank] = (2930, 140 + index * 90)
+    data['positions'] = positions
+    data['boxes'] = {}
+    data['font_settings'] = {'font_name': FONT, 'rank_font_size': 60,
+                             'round_font_size': 100, 'color': 'orange'}
+    return data
+
+def ranking_fit_payload():
+    """Ranking với ô giới hạn: tên dài bị co chữ hoặc cắt bớt bằng "…" """
+    data = ranking_payload()
+    data['boxes'] = {rank: (640, 80) for rank in RANKS}
+    data['2nd'] = "Trần Thị Phương Thảo (Saigon Phantom Esports)"
+    data['5th'] = "Hoàng Quốc Việt - Đội Tuyển Quốc Gia Việt Nam Mùa Giải Mùa Xuân 2025"
+    return data
+
+def final_payload():
+    """Kết quả cuối winner -> fifth"""
+    names = ["Lê Minh Hiếu", "Phạm Thu Hằng", "Võ Thành Ý", "Đặng Ngọc Ánh", "Bùi Quang Khải"]
+    keys = ['winner', 'second', 'third', 'fourth', 'fifth']
+    data = dict(zip(keys, names))
+    data['positions'] = {key: (1920, 300 + index * 150) for index, key in enumerate(keys)}
+    data['boxes'] = {}
+    data['font_settings'] = {'font_name': FONT, 'font_size': 60, 'color': 'white'}
+    return data
+
+# Tên scene -> (background, payload); ảnh golden golden/<scene>_<đường render>.png
+SCENES = {
+    'ranking': ("01", ranking_payload),
+    'ranking_fit': ("01", ranking_fit_payload),
+    'final': ("02", final_payload),
+}
+
+def render_paths(renderer):
+    """Các đường render của display: PIL (vẽ ở độ phân giải gốc rồi thu nhỏ) và NumPy (nếu có).
+
+    Đường NumPy vẽ chữ ở độ phân giải màn hình nên lệch vài pixel so với PIL -
+    mỗi đường có ảnh golden riêng để so sát.
+    """
+    def pil(bg_id, overlay_data):
+        return scoshow.render_window_frame(renderer, bg_id, overlay_data, WINDOW_SIZE).convert('RGB')
+
+    paths = {'pil': pil}
+    if scoshow.HAS_NUMPY:
+        compositor = scoshow.NumpyCompositor(renderer)
+        paths['numpy'] = lambda bg_id, overlay_data: scoshow.render_window_frame(
+            renderer, bg_id, overlay_data, WINDOW_SIZE, compositor).copy()
+    return paths
+
+def perceptual_diff(image, golden):
+    """(số pixel khác, chênh lệch trung bình, ảnh khác biệt) giữa hai ảnh sau khi làm mờ"""
+    from PIL import ImageChops, ImageFilter, ImageStat
+    if image.size != golden.size:
+        return image.width * image.height, 255.0, None
+    blurred = [im.convert('L').filter(ImageFilter.GaussianBlur(BLUR_RADIUS)) for im in (image, golden)]
+    diff = ImageChops.difference(*blurred)
+    histogram = diff.histogram()
+    changed = sum(histogram[PIXEL_THRESHOLD + 1:])
+    return changed, ImageStat.Stat(diff).mean[0], diff
+
+def render_time(render, bg_id, payload, runs):
+    """Median thời gian render (ms) của một cập nhật mới: ảnh nền đã cache, text chưa cache"""
+    render(bg_id, payload)
+    times = []
+    for _ in range(runs):
+        for cache in (scoshow.shaped_run, scoshow.text_sprite, scoshow.measure_text, scoshow.fit_text):
+            cache.cache_clear()
+        t0 = time.perf_counter()
+        render(bg_id, payload)
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times)
+
+def main():
+    parser = argparse.ArgumentParser(description="Test golden image + ngân sách thời gian render")
+    parser.add_argument("--update", action="store_true", help="ghi lại ảnh golden của mọi đường render")
+    parser.add_argument("--runs", type=int, default=5, help="số lần đo thời gian mỗi scene")
+    parser.add_argument("--no-timing", action="store_true", help="chỉ so ảnh, bỏ qua ngân sách thời gian")
+    parser.add_argument("--diff-dir", default=os.path.join(GOLDEN_DIR, "diff"),
+                        help="nơi ghi ảnh khác biệt khi test fail")
+    args = parser.parse_args()
+
+    renderer = scoshow.SceneRenderer()
+    if not renderer.load_background_folder(BACKGROUND_DIR):
+        print(f"Không tìm thấy ảnh nền trong {BACKGROUND_DIR}")
+        return 1
+    paths = render_paths(renderer)
+
+    if args.update:
+        for name, (bg_id, payload) in SCENES.items():
+            for path_name, render in paths.items():
+                path = os.path.join(GOLDEN_DIR, f"{name}_{path_name}.png")
+                render(bg_id, payload()).save(path, optimize=True)
+                print(f"Đã ghi {os.path.relpath(path, HERE)}")
+        return 0
+
+    with open(BUDGETS_FILE, 'r', encoding='utf-8') as f:
+        budgets = json.load(f)
+
+    failures = []
+    for name, (bg_id, payload) in SCENES.items():
+        for path_name, render in paths.items():
+            case = f"{name}_{path_name}"
+            golden_path = os.path.join(GOLDEN_DIR, f"{case}.png")
+            if not os.path.exists(golden_path):
+                failures.append(f"{case}: chưa có ảnh golden (chạy --update)")
+                continue
+            with Image.open(golden_path) as golden:
+                golden = golden.convert('RGB')
+            changed, mean, diff = perceptual_diff(render(bg_id, payload()), golden)
+            line = f"{case:20s} khác {changed:6d} px  trung bình {mean:5.2f}"
+            if changed > MAX_DIFF_PIXELS or mean > MAX_MEAN_DIFF:
+                failures.append(f"{case}: ảnh khác golden ({changed} pixel, trung bình {mean:.2f})")
+                if diff is not None:
+                    os.makedirs(args.diff_dir, exist_ok=True)
+                    diff.point(lambda v: min(255, v * 8)).save(os.path.join(args.diff_dir, f"{case}.png"))
+
+            if not args.no_timing:
+                budget = budgets.get(case)
+                elapsed = render_time(render, bg_id, payload(), args.runs)
+                line += f"  {elapsed:7.1f} ms" + (f" (budget {budget} ms)" if budget else " (chưa có budget)")
+                if budget and elapsed > budget:
+                    failures.append(f"{case}: {elapsed:.1f} ms vượt budget {budget} ms")
+            print(line)
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        return 1
+    print("✓ Mọi scene khớp golden và trong ngân sách thời gian")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
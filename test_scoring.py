@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test bảng xếp hạng (scoring.ScoreBoard) - không cần Tk
+    python test_scoring.py
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+from scoring import ScoreBoard
+
+def names(board):
+    return [name for position, name, total in board.standings()]
+
+def test_tie_breaks():
+    """Cùng tổng điểm: round cao nhất, rồi điểm round gần nhất, cuối cùng là tên"""
+    board = ScoreBoard()
+    board.add_score("Carol", 1, 5)
+    board.add_score("Carol", 2, 5)
+    board.add_score("Bob", 1, 8)
+    board.add_score("Bob", 2, 2)
+    board.add_score("Alice", 1, 2)
+    board.add_score("Alice", 2, 8)
+    board.add_score("dave", 1, 10)
+    board.add_score("Eve", 1, 10)
+    # Cả năm cùng 10 điểm. dave / Eve best 10, xếp theo tên không phân biệt hoa thường;
+    # Alice và Bob cùng best 8, Alice có điểm round gần nhất cao hơn
+    assert names(board) == ["dave", "Eve", "Alice", "Bob", "Carol"], names(board)
+
+def test_custom_tie_breaks():
+    """Luật tie-break tùy chọn luôn kết thúc bằng tên; luật lạ raise ValueError"""
+    board = ScoreBoard(tie_breaks=('total', 'rounds_played'))
+    assert board.tie_breaks == ('total', 'rounds_played', 'name')
+    board.add_score("Bob", 1, 10)
+    board.add_score("Alice", 1, 4)
+    board.add_score("Alice", 2, 6)
+    assert names(board) == ["Alice", "Bob"], names(board)
+    try:
+        ScoreBoard(tie_breaks=('total', 'luck'))
+    except ValueError as e:
+        assert "luck" in str(e)
+    else:
+        raise AssertionError("Luật tie-break lạ phải raise ValueError")
+
+def test_correction_moves_across_ranks():
+    """Sửa điểm nhập sai: player đổi hạng cả lên lẫn xuống, tổng và best được tính lại"""
+    board = ScoreBoard()
+    for name, points in (("Alice", 30), ("Bob", 20), ("Carol", 10)):
+        board.add_score(name, 1, points)
+    board.add_score("Carol", 1, 40)
+    assert board.standings() == [(1, "Carol", 40), (2, "Alice", 30), (3, "Bob", 20)], board.standings()
+    board.add_score("Carol", 1, 5)
+    assert board.standings() == [(1, "Alice", 30), (2, "Bob", 20), (3, "Carol", 5)], board.standings()
+    assert board.players["Carol"].best == 5
+
+    # Best round bị sửa thấp xuống thì tie-break dùng best mới
+    board.add_score("Bob", 2, 10)
+    board.add_score("Alice", 1, 25)
+    board.add_score("Alice", 2, 5)
+    assert board.players["Alice"].best == 25
+    assert names(board)[:2] == ["Alice", "Bob"], names(board)
+    board.add_score("Alice", 1, 15)
+    board.add_score("Alice", 2, 15)
+    # Cả hai 30 điểm; best của Alice giờ là 15 < 20 của Bob
+    assert board.players["Alice"].best == 15
+    assert names(board)[:2] == ["Bob", "Alice"], names(board)
+
+def test_incremental_matches_full_sort():
+    """Thứ hạng cập nhật dần (bisect) khớp với sắp xếp lại từ đầu sau nhiều lần sửa điểm"""
+    rng = random.Random(31)
+    board = ScoreBoard()
+    players = [f"P{index:02d}" for index in range(30)]
+    for _ in range(500):
+        board.add_score(rng.choice(players), rng.randint(1, 5), rng.randint(0, 20))
+    expected = sorted(board.players, key=lambda name: board._sort_key(board.players[name]))
+    assert names(board) == expected
+    for name, player in board.players.items():
+        assert player.total == sum(player.rounds.values()), name
+        assert player.best == max(player.rounds.values()), name
+
+def test_load_csv():
+    """Dòng tiêu đề đầu file được bỏ qua; dòng sai ở giữa raise ValueError và không nhập gì"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scores.csv")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("player,round,score\nAlice,1,10\n\nBob,1,12.5\n")
+        board = ScoreBoard()
+        assert board.load_csv(path) == 2
+        assert board.standings() == [(1, "Bob", 12.5), (2, "Alice", 10)], board.standings()
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("Alice,1,10\nBob,one,12\n")
+        board = ScoreBoard()
+        try:
+            board.load_csv(path)
+        except ValueError as e:
+            assert "Dòng 2" in str(e), e
+        else:
+            raise AssertionError("Dòng sai phải raise ValueError")
+        assert not board.players
+
+def main():
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print("Tất cả test bảng xếp hạng đều pass")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test dải ticker bảng xếp hạng: bảng điểm lớn không tạo ra dải vượt giới hạn PhotoImage - không cần Tk
+    python test_ticker.py
+"""
+
+import sys
+
+import scoshow
+from scoring import ScoreBoard
+
+FONT = "DejaVuSans.ttf"
+HEIGHT = 76          # dải ticker trên display 1920x1080
+SCREEN_WIDTH = 1920
+X11_MAX_WIDTH = 32767
+
+def scoreboard(players):
+    board = ScoreBoard()
+    for index in range(players):
+        board.add_score(f"Nguyễn Văn Người Chơi Số {index + 1}", 1, players - index)
+    return board
+
+def strip_for(players):
+    board = scoreboard(players)
+    text = scoshow.ticker_text(board.standings())  # toàn bộ bảng: giới hạn nằm ở render_ticker_strip
+    return scoshow.render_ticker_strip(text, FONT, HEIGHT, 'white', SCREEN_WIDTH)
+
+def test_small_scoreboard_unchanged():
+    """Bảng nhỏ: đủ mọi người, chu kỳ đúng bằng text + separator"""
+    board = scoreboard(5)
+    text = scoshow.ticker_text(board.standings())
+    strip, period = scoshow.render_ticker_strip(text, FONT, HEIGHT, 'white', SCREEN_WIDTH)
+    font = scoshow.load_font(FONT, round(HEIGHT * 0.6))
+    assert period == round(font.getlength(text + scoshow.TICKER_SEPARATOR)), period
+    assert strip.width >= SCREEN_WIDTH + period
+
+def test_large_scoreboard_bounded():
+    """40 / 3000 người: dải không rộng quá TICKER_MAX_STRIP_WIDTH (dưới giới hạn X11)"""
+    for players in (40, 3000):
+        strip, period = strip_for(players)
+        assert strip.width <= scoshow.TICKER_MAX_STRIP_WIDTH < X11_MAX_WIDTH, (players, strip.width)
+        assert strip.width >= SCREEN_WIDTH + period, (players, strip.width, period)
+
+def test_single_long_entry_bounded():
+    """Một tên cực dài vẫn bị cắt bằng "…" cho vừa ngân sách"""
+    strip, period = scoshow.render_ticker_strip("1. " + "W" * 5000, FONT, HEIGHT, 'white', SCREEN_WIDTH)
+    assert strip.width <= scoshow.TICKER_MAX_STRIP_WIDTH, strip.width
+
+def main():
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print("Tất cả test ticker đều pass")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())